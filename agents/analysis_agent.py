@@ -2,10 +2,13 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from typing import List, Dict
-from tools.analysis.code_analyzer import extract_code_blocks, analyze_code_complexity
+from typing import List, Dict, Optional
+from tools.analysis.code_analyzer import CodeBlock, extract_code_blocks, extract_code_blocks_batch, summarize_code_metrics
+from tools.analysis.extractive_summarizer import summarize_key_findings
 from tools.analysis.hypothesis_extractor import extract_hypotheses
-from utils.llm_client import get_llm
+from tools.search.near_duplicates import get_near_duplicate_index
+from utils.config import Config
+from utils.llm_client import get_llm, invoke_with_timeout
 from langchain_core.prompts import ChatPromptTemplate
 
 
@@ -32,21 +35,55 @@ class AnalysisAgent:
         print(f"Analyzing {len(papers)} papers\n")
         
         analyses = []
+        # Code blocks of all papers in one batch (a process pool for large batches)
+        code_blocks = extract_code_blocks_batch(paper.get('full_text', '') for paper in papers)
         
         for i, paper in enumerate(papers, 1):
             print(f"\n[{i}/{len(papers)}] Analyzing: {paper['title'][:60]}...")
             
-            analysis = self.analyze_single_paper(paper)
+            analysis = self._reuse_duplicate_analysis(paper)
+            if analysis is None:
+                analysis = self.analyze_single_paper(paper, code_blocks[i - 1])
+                # Fallback results would be copied to every later near-duplicate
+                if Config.NEAR_DUP_ENABLED and not analysis['degraded']:
+                    get_near_duplicate_index().store_analysis(paper, analysis)
             analyses.append(analysis)
         
+        reused = sum(1 for a in analyses if a.get('duplicate_of'))
         print("\n" + "="*60)
         print(f"✅ ANALYSIS COMPLETE: {len(analyses)} papers analyzed")
+        if reused:
+            print(f"   Reused: {reused} near-duplicate analyses")
         print("="*60 + "\n")
         
         return analyses
     
-    def analyze_single_paper(self, paper: Dict) -> Dict:
-        """Analyze a single paper"""
+    def _reuse_duplicate_analysis(self, paper: Dict) -> Optional[Dict]:
+        """Existing analysis of a near-identical paper, flagged as reused"""
+        if not Config.NEAR_DUP_ENABLED:
+            return None
+        
+        match = get_near_duplicate_index().find_duplicate(paper)
+        if match is None:
+            return None
+        
+        similarity, title, analysis = match
+        print(f"   ♻️ Near-duplicate of '{title[:50]}' ({similarity:.0%} similar), reusing its analysis")
+        
+        return dict(
+            analysis,
+            title=paper['title'],
+            duplicate_of={'title': title, 'similarity': round(similarity, 3)}
+        )
+    
+    def analyze_single_paper(self, paper: Dict, code_blocks: Optional[List[CodeBlock]] = None) -> Dict:
+        """
+        Analyze a single paper
+        
+        Stages whose LLM call failed get a fallback value and are listed
+        in 'degraded' (such analyses are not reused for near-duplicates).
+        code_blocks, if given, were already extracted from the full text.
+        """
         
         result = {
             'title': paper['title'],
@@ -54,45 +91,67 @@ class AnalysisAgent:
             'code_blocks': [],
             'key_findings': "",
             'methodology': "",
-            'statistics': {}
+            'statistics': {},
+            'degraded': []
         }
         
         # Extract hypotheses
         print("   🔬 Extracting hypotheses...")
-        result['hypotheses'] = extract_hypotheses(
-            paper.get('abstract', ''),
-            paper.get('full_text', '')[:5000]
-        )
+        try:
+            result['hypotheses'] = extract_hypotheses(
+                paper.get('abstract', ''),
+                paper.get('full_text', ''),
+                strict=True
+            )
+        except Exception:
+            result['degraded'].append('hypotheses')
         
         # Extract code
         print("   💻 Extracting code blocks...")
-        result['code_blocks'] = extract_code_blocks(paper.get('full_text', ''))
+        if code_blocks is None:
+            code_blocks = extract_code_blocks(paper.get('full_text', ''))
+        result['code_blocks'] = code_blocks
         
         # Analyze code complexity
         if result['code_blocks']:
             total_lines = sum(block.line_count for block in result['code_blocks'])
             result['statistics']['total_code_lines'] = total_lines
             result['statistics']['code_blocks_count'] = len(result['code_blocks'])
+            result['statistics']['code_metrics'] = summarize_code_metrics(result['code_blocks'])
         
         # Extract key findings using LLM
         print("   📊 Extracting key findings...")
         result['key_findings'] = self._extract_key_findings(
             paper.get('abstract', ''),
-            paper.get('full_text', '')[:3000]
+            paper.get('full_text', '')
         )
+        if result['key_findings'] is None:
+            result['degraded'].append('key_findings')
+            result['key_findings'] = summarize_key_findings(paper.get('abstract', ''), paper.get('full_text', ''))
         
         # Extract methodology
         print("   🔧 Extracting methodology...")
         result['methodology'] = self._extract_methodology(
             paper.get('full_text', '')[:3000]
         )
+        if result['methodology'] is None:
+            result['degraded'].append('methodology')
+            result['methodology'] = "Unable to extract methodology"
         
         print(f"   ✅ Analysis complete!")
         
         return result
     
-    def _extract_key_findings(self, abstract: str, text: str) -> str:
-        """Extract key findings using LLM"""
+    def _extract_key_findings(self, abstract: str, full_text: str) -> Optional[str]:
+        """
+        Extract key findings using LLM
+        
+        In "fast" KEY_FINDINGS_MODE the findings are summarized extractively
+        instead. Returns None when the LLM call fails, times out (LLM_TIMEOUT)
+        or the run's token budget is spent.
+        """
+        if Config.KEY_FINDINGS_MODE == "fast":
+            return summarize_key_findings(abstract, full_text)
         
         prompt = ChatPromptTemplate.from_template(
             """Summarize the key findings from this research paper in 3-4 bullet points.
@@ -105,13 +164,14 @@ Key Findings:"""
         )
         
         try:
-            response = self.llm.invoke(prompt.format(abstract=abstract, text=text))
+            response = invoke_with_timeout(self.llm, prompt.format(abstract=abstract, text=full_text[:3000]))
             return response.content
-        except:
-            return "Unable to extract key findings"
+        except Exception as e:
+            print(f"   ⚠️ Key findings LLM unavailable ({e}), using extractive summary")
+            return None
     
-    def _extract_methodology(self, text: str) -> str:
-        """Extract methodology using LLM"""
+    def _extract_methodology(self, text: str) -> Optional[str]:
+        """Extract methodology using LLM (None if the call fails)"""
         
         prompt = ChatPromptTemplate.from_template(
             """Describe the research methodology used in this paper (2-3 sentences).
@@ -122,10 +182,11 @@ Methodology:"""
         )
         
         try:
-            response = self.llm.invoke(prompt.format(text=text))
+            response = invoke_with_timeout(self.llm, prompt.format(text=text))
             return response.content
-        except:
-            return "Unable to extract methodology"
+        except Exception as e:
+            print(f"   ⚠️ Methodology LLM unavailable ({e})")
+            return None
 
 
 if __name__ == "__main__":
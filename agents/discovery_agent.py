@@ -2,10 +2,16 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from typing import List, Dict
-from tools.search.arxiv_tool import arxiv_search, Paper
+from typing import List, Dict, Iterable
+from tools.search.arxiv_tool import arxiv_search_iter, PaperStream, Paper
 from tools.search.google_scholar_tool import google_scholar_search
 from tools.search.duckduckgo_tool import duckduckgo_search
+from tools.search.local_index import local_search
+from tools.search.arxiv_registry import registry_search
+from tools.search.reranker import rerank_papers, rerank_stream
+from tools.search.dedup import deduplicate_papers, attach_mentions
+from tools.search.vector_index import get_vector_index, meta_to_paper
+from utils.config import Config
 
 
 class PaperDiscoveryAgent:
@@ -14,16 +20,20 @@ class PaperDiscoveryAgent:
     def __init__(self):
         self.name = "Paper Discovery Agent"
     
-    def discover_papers(self, query: str, max_papers: int = 50) -> Dict[str, List]:
+    def discover_papers(self, query: str, max_papers: int = 50, stream: bool = False) -> Dict[str, List]:
         """
         Discover papers from multiple sources
         
         Args:
             query: Research query
             max_papers: Maximum papers to find
+            stream: Return ArXiv papers as a PaperStream that keeps loading
+                result pages in the background, so scraping can start early
             
         Returns:
-            Dictionary with papers from different sources
+            Dictionary with papers from different sources; 'arxiv_papers'
+            holds the deduplicated papers to scrape, with provenance in
+            each paper's `sources`
         """
         print("\n" + "="*60)
         print(f"🔍 {self.name} ACTIVATED")
@@ -33,12 +43,32 @@ class PaperDiscoveryAgent:
         
         results = {
             'arxiv_papers': [],
+            'local_papers': [],
+            'registry_papers': [],
             'scholar_papers': [],
             'web_results': []
         }
         
-        print("1️⃣ Searching ArXiv...")
-        results['arxiv_papers'] = arxiv_search(query, max_results=max_papers)
+        if Config.LOCAL_INDEX_ENABLED:
+            print("📚 Searching local corpus...")
+            results['local_papers'] = local_search(query, max_results=max_papers)
+        
+        results['registry_papers'] = registry_search(query, max_results=max_papers)
+        
+        # ArXiv results are merged with local/registry hits (duplicates and
+        # older arXiv versions collapsed) before anything is scraped
+        extra = {'local': results['local_papers'], 'registry': results['registry_papers']}
+        
+        # Over-fetch so the reranker can drop off-topic papers before scraping
+        candidates = max_papers * Config.RERANK_CANDIDATE_FACTOR if Config.RERANK_ENABLED else max_papers
+        
+        print("\n1️⃣ Searching ArXiv...")
+        papers = deduplicate_papers(arxiv_search_iter(query, max_results=candidates), extra)
+        if stream:
+            results['arxiv_papers'] = PaperStream(papers)
+        else:
+            results['arxiv_papers'] = list(papers)
+            self.index_abstracts(results['arxiv_papers'])
         
         print("\n2️⃣ Searching Google Scholar...")
         results['scholar_papers'] = google_scholar_search(query, max_results=10)
@@ -46,16 +76,105 @@ class PaperDiscoveryAgent:
         print("\n3️⃣ Searching DuckDuckGo...")
         results['web_results'] = duckduckgo_search(f"{query} research paper", max_results=10)
         
-        total = len(results['arxiv_papers']) + len(results['scholar_papers']) + len(results['web_results'])
+        if stream:
+            print("\n" + "="*60)
+            print(f"✅ DISCOVERY STARTED: ArXiv results streaming")
+            print(f"   Local: {len(results['local_papers'])} papers")
+            print(f"   Registry: {len(results['registry_papers'])} papers")
+            print(f"   Scholar: {len(results['scholar_papers'])} papers")
+            print(f"   Web: {len(results['web_results'])} results")
+            print("="*60 + "\n")
+            return results
+        
+        self.attach_mentions(results)
+        # Local and registry hits are already merged into arxiv_papers
+        total = sum(len(results[source]) for source in ('arxiv_papers', 'scholar_papers', 'web_results'))
         
         print("\n" + "="*60)
         print(f"✅ DISCOVERY COMPLETE: {total} sources found")
-        print(f"   ArXiv: {len(results['arxiv_papers'])} papers")
+        print(f"   Papers: {len(results['arxiv_papers'])} unique (ArXiv + local + registry)")
+        print(f"   Local: {len(results['local_papers'])} papers")
+        print(f"   Registry: {len(results['registry_papers'])} papers")
         print(f"   Scholar: {len(results['scholar_papers'])} papers")
         print(f"   Web: {len(results['web_results'])} results")
         print("="*60 + "\n")
         
         return results
+    
+    def rank_candidates(self, query: str, papers: Iterable[Paper]) -> Iterable[Paper]:
+        """
+        Rerank discovered papers by local relevance to the query
+        
+        Args:
+            query: Research query
+            papers: Discovered papers; a PaperStream is reranked page by
+                page as it arrives, so scraping need not wait for the search
+            
+        Returns:
+            Relevant papers, best first, for scraping in that order
+            (an iterator for a PaperStream)
+        """
+        if isinstance(papers, PaperStream):
+            return rerank_stream(query, papers)
+        return rerank_papers(query, papers)
+    
+    def attach_mentions(self, results: Dict[str, List]) -> Dict[str, List]:
+        """
+        Fold Scholar and web results that refer to discovered papers into
+        those papers' provenance, keeping only the other results
+        
+        Args:
+            results: Discovery results with materialized 'arxiv_papers'
+            
+        Returns:
+            The updated results
+        """
+        papers = results['arxiv_papers']
+        for key, source in (('scholar_papers', 'scholar'), ('web_results', 'web')):
+            before = len(results[key])
+            results[key] = attach_mentions(papers, results[key], source)
+            if len(results[key]) < before:
+                print(f"🧹 {before - len(results[key])} {source} results matched discovered papers")
+        return results
+    
+    def index_abstracts(self, papers: List[Paper]) -> int:
+        """
+        Add discovered papers to the abstract vector index
+        
+        Args:
+            papers: Discovered papers
+            
+        Returns:
+            Number of newly indexed papers
+        """
+        if not Config.VECTOR_INDEX_ENABLED or not papers:
+            return 0
+        
+        try:
+            added = get_vector_index().add_papers(papers)
+        except Exception as e:
+            print(f"⚠️ Could not update vector index: {e}")
+            return 0
+        
+        if added:
+            print(f"🧭 Indexed {added} new abstracts")
+        return added
+    
+    def find_related(self, paper: Paper, k: int = 5) -> List[Paper]:
+        """
+        Find previously discovered papers with similar abstracts
+        
+        Args:
+            paper: Paper to find neighbours for
+            k: Number of related papers
+            
+        Returns:
+            List of related Paper objects, most similar first
+        """
+        if not Config.VECTOR_INDEX_ENABLED:
+            return []
+        
+        return [meta_to_paper(meta) for _, meta in get_vector_index().related(paper, k=k)]
 
 
 if __name__ == "__main__":
@@ -67,4 +186,8 @@ if __name__ == "__main__":
         paper = results['arxiv_papers'][0]
         print(f"Title: {paper.title}")
         print(f"Authors: {', '.join(paper.authors[:3])}")
-        print(f"PDF: {paper.pdf_url}")
\ No newline at end of file
+        print(f"PDF: {paper.pdf_url}")
+        
+        print("\n🧭 Related papers:")
+        for related in agent.find_related(paper, k=3):
+            print(f"  - {related.title}")
\ No newline at end of file
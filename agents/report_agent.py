@@ -2,9 +2,18 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from typing import List, Dict
+import contextvars
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Callable, Iterator, Tuple, Any
 from datetime import datetime
-from utils.llm_client import get_llm
+from utils.llm_client import get_llm, invoke_with_timeout
+from tools.analysis.code_analyzer import summarize_code_metrics
+from tools.analysis.term_stats import get_term_statistics, extract_terms
+from tools.analysis.report_synthesis import synthesize_analyses
+from tools.search.dedup import title_key
+from utils.config import Config
 from langchain_core.prompts import ChatPromptTemplate
 import json
 
@@ -12,6 +21,9 @@ import json
 class ReportAgent:
     """Agent that compiles comprehensive research reports"""
     
+    # Sections written by the LLM, reported token by token while streaming
+    STREAMED_SECTIONS = ('executive_summary', 'conclusions', 'recommendations')
+    
     def __init__(self):
         self.name = "Report Compiler Agent"
         self.llm = get_llm(temperature=0.5)
@@ -20,7 +32,8 @@ class ReportAgent:
         self,
         query: str,
         discovery_results: Dict,
-        analyses: List[Dict]
+        analyses: List[Dict],
+        on_event: Callable[[str, Any], None] = None
     ) -> Dict:
         """
         Compile final research report
@@ -29,6 +42,9 @@ class ReportAgent:
             query: Original research query
             discovery_results: Results from discovery agent
             analyses: Results from analysis agent
+            on_event: Optional callback(section, chunk), called from worker
+                threads with each text chunk of the LLM sections as it is
+                generated and with the value of every other section once done
             
         Returns:
             Complete report dictionary
@@ -43,6 +59,7 @@ class ReportAgent:
             'generated_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'query': query,
             'executive_summary': "",
+            'synthesis': "",
             'papers_analyzed': len(analyses),
             'total_papers_found': len(discovery_results.get('arxiv_papers', [])),
             'key_findings': [],
@@ -51,54 +68,180 @@ class ReportAgent:
             'methodology_overview': "",
             'conclusions': "",
             'recommendations': [],
+            'near_duplicates': [],
+            'trending_topics': {},
             'paper_details': []
         }
         
-        # Generate executive summary
-        print("📋 Generating executive summary...")
-        report['executive_summary'] = self._generate_executive_summary(query, analyses)
+        # Independent sections run concurrently, each once its dependencies are done
+        graph = self._section_graph(query, discovery_results, analyses, on_event)
+        report.update(self._run_sections(graph, on_event))
+        
+        report['paper_details'] = self._paper_details(analyses)
+        report['near_duplicates'] = self._near_duplicates(analyses)
+        
+        print("\n" + "="*60)
+        print(f"✅ REPORT COMPLETE")
+        print(f"   Papers analyzed: {report['papers_analyzed']}")
+        print(f"   Total findings: {len(report['key_findings'])}")
+        print(f"   Total hypotheses: {len(report['hypotheses_summary'])}")
+        print("="*60 + "\n")
+        
+        return report
+    
+    def stream_report(
+        self,
+        query: str,
+        discovery_results: Dict,
+        analyses: List[Dict]
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Compile the report, yielding sections as they are produced
+        
+        Yields (section, chunk) events: text chunks of the LLM sections
+        (executive_summary, conclusions, recommendations) as the tokens
+        arrive, the value of each other section when it is ready, and
+        finally ('report', report) with the complete report.
+        """
+        events = queue.Queue()
+        outcome = {}
         
-        # Aggregate key findings
-        print("🔍 Aggregating key findings...")
-        report['key_findings'] = self._aggregate_findings(analyses)
+        def compile_in_background():
+            try:
+                outcome['report'] = self.compile_report(
+                    query, discovery_results, analyses, lambda section, chunk: events.put((section, chunk))
+                )
+            except Exception as e:
+                outcome['error'] = e
+            finally:
+                events.put(None)
         
-        # Summarize hypotheses
-        print("🔬 Summarizing hypotheses...")
-        report['hypotheses_summary'] = self._summarize_hypotheses(analyses)
+        # The caller's context goes along (the run's token budget)
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(compile_in_background,), daemon=True).start()
+        for event in iter(events.get, None):
+            yield event
         
-        # Analyze code across papers
-        print("💻 Analyzing code patterns...")
-        report['code_analysis'] = self._analyze_code_patterns(analyses)
+        if 'error' in outcome:
+            raise outcome['error']
+        yield 'report', outcome['report']
+    
+    def _section_graph(self, query: str, discovery_results: Dict, analyses: List[Dict],
+                       on_event: Callable[[str, Any], None] = None) -> Dict:
+        """
+        Report sections as name -> (label, function, dependencies)
         
-        # Generate conclusions
-        print("📊 Generating conclusions...")
-        report['conclusions'] = self._generate_conclusions(query, analyses)
+        Each function receives the results of finished sections, so a
+        section can build on the sections it depends on.
+        """
+        return {
+            'synthesis': (
+                "🧩 Synthesizing findings across all papers",
+                lambda done: synthesize_analyses(query, analyses, self.llm), ()
+            ),
+            'executive_summary': (
+                "📋 Generating executive summary",
+                lambda done: self._generate_executive_summary(query, analyses, done['synthesis'], on_event),
+                ('synthesis',)
+            ),
+            'conclusions': (
+                "📊 Generating conclusions",
+                lambda done: self._generate_conclusions(query, analyses, done['synthesis'], on_event),
+                ('synthesis',)
+            ),
+            'recommendations': (
+                "✅ Generating recommendations",
+                lambda done: self._generate_recommendations(query, analyses, on_event), ()
+            ),
+            'key_findings': (
+                "🔍 Aggregating key findings",
+                lambda done: self._aggregate_findings(analyses), ()
+            ),
+            'hypotheses_summary': (
+                "🔬 Summarizing hypotheses",
+                lambda done: self._summarize_hypotheses(analyses), ()
+            ),
+            'code_analysis': (
+                "💻 Analyzing code patterns",
+                lambda done: self._analyze_code_patterns(analyses), ()
+            ),
+            'trending_topics': (
+                "📈 Computing trending topics",
+                lambda done: self._trending_topics(analyses, discovery_results), ()
+            ),
+        }
+    
+    def _run_sections(self, graph: Dict, on_event: Callable[[str, Any], None] = None) -> Dict:
+        """
+        Run report sections on a thread pool in dependency order
+        
+        Every section whose dependencies are finished is started at once,
+        so independent LLM calls overlap instead of running back to back.
+        
+        Args:
+            graph: Sections from _section_graph
+            on_event: Optional callback(section, value) for finished non-LLM sections
+            
+        Returns:
+            Dictionary of section name -> result
+        """
+        done = {}
+        pending = dict(graph)
+        running = {}
         
-        # Generate recommendations
-        print("✅ Generating recommendations...")
-        report['recommendations'] = self._generate_recommendations(query, analyses)
+        with ThreadPoolExecutor(max_workers=max(1, Config.REPORT_WORKERS)) as executor:
+            while pending or running:
+                for name, (label, func, deps) in list(pending.items()):
+                    if all(dep in done for dep in deps):
+                        print(f"{label}...")
+                        # Each section runs in a copy of the caller's context (e.g. a LangGraph stream writer)
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, func, dict(done))] = name
+                        del pending[name]
+                
+                if not running:
+                    raise ValueError(f"Report sections with unresolvable dependencies: {sorted(pending)}")
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    done[name] = future.result()
+                    if on_event and name not in self.STREAMED_SECTIONS:
+                        on_event(name, done[name])
         
-        # Add paper details
-        report['paper_details'] = [
+        return done
+    
+    def _paper_details(self, analyses: List[Dict]) -> List[Dict]:
+        """Per-paper summary rows"""
+        return [
             {
                 'title': a['title'],
                 'hypotheses_count': len(a.get('hypotheses', [])),
                 'code_blocks': len(a.get('code_blocks', [])),
-                'key_findings': a.get('key_findings', '')[:200]
+                'key_findings': a.get('key_findings', '')[:200],
+                'duplicate_of': a.get('duplicate_of')
             }
             for a in analyses
         ]
-        
-        print("\n" + "="*60)
-        print(f"✅ REPORT COMPLETE")
-        print(f"   Papers analyzed: {report['papers_analyzed']}")
-        print(f"   Total findings: {len(report['key_findings'])}")
-        print(f"   Total hypotheses: {len(report['hypotheses_summary'])}")
-        print("="*60 + "\n")
-        
-        return report
     
-    def _generate_executive_summary(self, query: str, analyses: List[Dict]) -> str:
+    def _near_duplicates(self, analyses: List[Dict]) -> List[Dict]:
+        """Papers whose analysis was reused from a near-identical paper"""
+        return [
+            {
+                'title': a['title'],
+                'duplicate_of': a['duplicate_of']['title'],
+                'similarity': a['duplicate_of']['similarity']
+            }
+            for a in analyses if a.get('duplicate_of')
+        ]
+    
+    def _complete(self, prompt: str, section: str, on_event: Callable[[str, Any], None] = None) -> str:
+        """LLM response text, streamed to on_event chunk by chunk if given"""
+        on_chunk = (lambda text: on_event(section, text)) if on_event else None
+        return invoke_with_timeout(self.llm, prompt, on_chunk=on_chunk).content
+    
+    def _generate_executive_summary(self, query: str, analyses: List[Dict], synthesis: str,
+                                    on_event: Callable[[str, Any], None] = None) -> str:
         """Generate executive summary"""
         
         # Gather key info
@@ -111,8 +254,8 @@ class ReportAgent:
         Total hypotheses identified: {total_hypotheses}
         Total code blocks found: {total_code}
         
-        Sample findings from papers:
-        {chr(10).join([a.get('key_findings', '')[:200] for a in analyses[:3]])}
+        Synthesis of findings across all papers:
+        {synthesis}
         """
         
         prompt = ChatPromptTemplate.from_template(
@@ -124,8 +267,7 @@ Executive Summary:"""
         )
         
         try:
-            response = self.llm.invoke(prompt.format(context=context))
-            return response.content
+            return self._complete(prompt.format(context=context), 'executive_summary', on_event)
         except:
             return f"Analysis of {len(analyses)} research papers on {query}."
     
@@ -168,39 +310,71 @@ Executive Summary:"""
                 lang = block.language
                 languages[lang] = languages.get(lang, 0) + 1
         
+        # Memoized per block, so recompiling a report is cheap
+        metrics = summarize_code_metrics(
+            block for analysis in analyses for block in analysis.get('code_blocks', [])
+        )
+        
         return {
             'total_code_blocks': total_code,
             'total_lines': total_lines,
             'languages_used': languages,
-            'average_lines_per_block': total_lines / total_code if total_code > 0 else 0
+            'average_lines_per_block': total_lines / total_code if total_code > 0 else 0,
+            'metrics': metrics
         }
     
-    def _generate_conclusions(self, query: str, analyses: List[Dict]) -> str:
-        """Generate conclusions"""
+    def _trending_topics(self, analyses: List[Dict], discovery_results: Dict) -> Dict:
+        """Top, emerging and co-occurring terms of the analyzed papers, then add them to the corpus"""
+        if not Config.TERM_STATS_ENABLED or not analyses:
+            return {}
         
-        findings_summary = "\n".join([
-            f"- {a.get('key_findings', '')[:150]}"
-            for a in analyses[:5]
-        ])
+        # Optional section: a bad input or store error must not fail the report
+        try:
+            abstracts = {p.title: p.abstract for p in discovery_results.get('arxiv_papers', [])}
+            documents = [(title_key(a['title']) or a['title'], self._term_text(a, abstracts)) for a in analyses]
+            store = get_term_statistics()
+            trending = store.analyze(documents)
+            for key, text in documents:
+                store.add_document(key, extract_terms(text))
+            store.save()
+        except Exception as e:
+            print(f"⚠️ Trending topics unavailable ({e})")
+            return {}
+        return trending
+    
+    @staticmethod
+    def _term_text(analysis: Dict, abstracts: Dict[str, str]) -> str:
+        """Title, abstract and the LLM fields that did not fall back to a placeholder"""
+        degraded = analysis.get('degraded', [])
+        parts = [analysis['title'], abstracts.get(analysis['title'], "")]
+        for field in ('key_findings', 'methodology'):
+            if field not in degraded:
+                parts.append(analysis.get(field, ""))
+        parts.extend(h.statement for h in analysis.get('hypotheses', []))
+        return " ".join(parts)
+    
+    def _generate_conclusions(self, query: str, analyses: List[Dict], synthesis: str,
+                              on_event: Callable[[str, Any], None] = None) -> str:
+        """Generate conclusions"""
         
         prompt = ChatPromptTemplate.from_template(
             """Based on this research analysis, provide 3-4 key conclusions:
 
 Query: {query}
 
-Key findings from papers:
+Synthesis of findings across all papers:
 {findings}
 
 Conclusions:"""
         )
         
         try:
-            response = self.llm.invoke(prompt.format(query=query, findings=findings_summary))
-            return response.content
+            return self._complete(prompt.format(query=query, findings=synthesis), 'conclusions', on_event)
         except:
             return f"Analysis suggests significant research activity in {query}."
     
-    def _generate_recommendations(self, query: str, analyses: List[Dict]) -> List[str]:
+    def _generate_recommendations(self, query: str, analyses: List[Dict],
+                                  on_event: Callable[[str, Any], None] = None) -> List[str]:
         """Generate recommendations"""
         
         prompt = ChatPromptTemplate.from_template(
@@ -213,8 +387,8 @@ Recommendations:"""
         )
         
         try:
-            response = self.llm.invoke(prompt.format(query=query, count=len(analyses)))
-            recs = [line.strip() for line in response.content.split('\n') if line.strip()]
+            text = self._complete(prompt.format(query=query, count=len(analyses)), 'recommendations', on_event)
+            recs = [line.strip() for line in text.split('\n') if line.strip()]
             return recs[:5]
         except:
             return ["Continue monitoring research in this area"]
@@ -222,6 +396,36 @@ Recommendations:"""
     def save_report_markdown(self, report: Dict, filename: str = "research_report.md"):
         """Save report as markdown file"""
         
+        hypotheses_md = chr(10).join([
+            f"**{h['paper']}**\n- {h['hypothesis']}\n- Evidence: {h['evidence']}\n"
+            for h in report['hypotheses_summary']
+        ])
+        papers_md = chr(10).join([
+            f"### {p['title']}\n- Hypotheses: {p['hypotheses_count']}\n- Code Blocks: {p['code_blocks']}\n- Key Finding: {p['key_findings']}\n"
+            + (f"- Near-duplicate of: {p['duplicate_of']['title']} (analysis reused)\n" if p.get('duplicate_of') else "")
+            for p in report['paper_details']
+        ])
+        duplicates_md = ""
+        trending = report.get('trending_topics') or {}
+        trending_md = ""
+        if trending.get('top_terms'):
+            trending_md = "## Trending Topics\n\n" + chr(10).join([
+                "- **Top terms:** " + ", ".join(f"{t['term']} ({t['papers']})" for t in trending['top_terms'][:10]),
+                f"- **Emerging vs. {trending['corpus_papers']} earlier papers:** " + (
+                    ", ".join(f"{t['term']} (×{t['lift']})" for t in trending['emerging_terms'][:10])
+                    or "not enough earlier papers yet"
+                ),
+                "- **Frequently together:** " + (
+                    ", ".join(f"{c['terms'][0]} + {c['terms'][1]} ({c['papers']})" for c in trending['co_occurrence'][:5])
+                    or "none"
+                )
+            ]) + "\n\n---\n\n"
+        if report.get('near_duplicates'):
+            duplicates_md = "## Near-Duplicate Papers\n\n" + chr(10).join([
+                f"- **{d['title']}** ≈ {d['duplicate_of']} ({d['similarity']:.0%} similar)"
+                for d in report['near_duplicates']
+            ]) + "\n\n---\n\n"
+        
         md_content = f"""# {report['title']}
 
 **Generated:** {report['generated_date']}  
@@ -244,7 +448,7 @@ Recommendations:"""
 
 ## Research Hypotheses
 
-{chr(10).join([f"**{h['paper']}**\n- {h['hypothesis']}\n- Evidence: {h['evidence']}\n" for h in report['hypotheses_summary']])}
+{hypotheses_md}
 
 ---
 
@@ -253,10 +457,12 @@ Recommendations:"""
 - **Total Code Blocks:** {report['code_analysis'].get('total_code_blocks', 0)}
 - **Total Lines of Code:** {report['code_analysis'].get('total_lines', 0)}
 - **Languages Used:** {', '.join([f"{k} ({v})" for k, v in report['code_analysis'].get('languages_used', {}).items()])}
+- **Functions / Classes:** {report['code_analysis'].get('metrics', {}).get('functions', 0)} / {report['code_analysis'].get('metrics', {}).get('classes', 0)}
+- **Loops / Conditionals:** {report['code_analysis'].get('metrics', {}).get('loops', 0)} / {report['code_analysis'].get('metrics', {}).get('conditionals', 0)}
 
 ---
 
-## Conclusions
+{trending_md}## Conclusions
 
 {report['conclusions']}
 
@@ -268,9 +474,9 @@ Recommendations:"""
 
 ---
 
-## Paper Details
+{duplicates_md}## Paper Details
 
-{chr(10).join([f"### {p['title']}\n- Hypotheses: {p['hypotheses_count']}\n- Code Blocks: {p['code_blocks']}\n- Key Finding: {p['key_findings']}\n" for p in report['paper_details']])}
+{papers_md}
 """
         
         with open(filename, 'w', encoding='utf-8') as f:
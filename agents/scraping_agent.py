@@ -2,11 +2,21 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from typing import List, Dict, Optional
-from tools.scraping.pdf_tool import process_pdf_url
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Optional, Iterable, Callable
+from tools.scraping.pdf_tool import (
+    process_pdf_url_result, load_stored_text, fetch_pdf_bytes, extract_and_store
+)
+from tools.scraping.extraction_pool import ExtractionResult
 from tools.scraping.web_scraper_tool import scrape_webpage
 from tools.search.arxiv_tool import Paper
-import time
+from tools.search.local_index import get_local_index
+from tools.search.near_duplicates import get_near_duplicate_index
+from utils.config import Config
+from utils.storage_manager import get_storage_manager
 
 
 class ScrapingAgent:
@@ -14,82 +24,210 @@ class ScrapingAgent:
     
     def __init__(self):
         self.name = "Scraping Agent"
+        self.failures = []
     
-    def scrape_papers(self, papers: List[Paper], max_papers: int = 20) -> List[Dict]:
+    def scrape_papers(
+        self,
+        papers: Iterable[Paper],
+        max_papers: int = 20,
+        progress_callback: Optional[Callable] = None
+    ) -> List[Dict]:
         """
-        Scrape and extract text from papers
+        Scrape and extract text from papers concurrently
+        
+        Downloads run on SCRAPE_IO_WORKERS threads and extraction on
+        SCRAPE_CPU_WORKERS, so one slow paper no longer blocks the rest.
+        SCRAPE_SPARE_PAPERS extra candidates are kept in flight; a failed
+        paper is backfilled from the next candidate, and remaining work
+        is cancelled once max_papers papers succeeded.
         
         Args:
-            papers: List of Paper objects
-            max_papers: Maximum papers to process
+            papers: Candidate Paper objects in priority order, or an
+                iterator/PaperStream that yields papers while the search
+                is still running
+            max_papers: Number of successfully scraped papers to aim for
+            progress_callback: Called as (completed, total, paper, error)
+                after each paper; error is None on success
             
         Returns:
-            List of dictionaries with paper content
+            List of dictionaries with paper content, in candidate order
         """
+        target = min(len(papers), max_papers) if hasattr(papers, '__len__') else max_papers
+        spares = Config.SCRAPE_SPARE_PAPERS
+        
         print("\n" + "="*60)
         print(f"📥 {self.name} ACTIVATED")
         print("="*60)
-        print(f"Processing {min(len(papers), max_papers)} papers\n")
+        print(f"Target: {target} papers, {spares} spare "
+              f"({Config.SCRAPE_IO_WORKERS} download / {Config.SCRAPE_CPU_WORKERS} extraction workers)\n")
         
-        processed_papers = []
+        self.failures = []
+        results = {}
+        finished = queue.Queue()
+        abort = threading.Event()
+        candidates = iter(papers)
+        io_pool = ThreadPoolExecutor(max_workers=Config.SCRAPE_IO_WORKERS)
+        cpu_pool = ThreadPoolExecutor(max_workers=Config.SCRAPE_CPU_WORKERS)
         
-        for i, paper in enumerate(papers[:max_papers], 1):
-            print(f"\n[{i}/{min(len(papers), max_papers)}] Processing: {paper.title[:60]}...")
-            
+        def on_extracted(index, paper, future):
             try:
-                # Extract PDF text
-                text = process_pdf_url(paper.pdf_url)
-                
-                if text:
-                    processed_papers.append({
-                        'title': paper.title,
-                        'authors': paper.authors,
-                        'abstract': paper.abstract,
-                        'full_text': text,
-                        'pdf_url': paper.pdf_url,
-                        'published': paper.published,
-                        'categories': paper.categories
-                    })
-                    print(f"   ✅ Extracted {len(text)} characters")
-                else:
-                    print(f"   ⚠️ Skipped (extraction failed)")
-                
-                # Rate limiting
-                if i % 5 == 0:
-                    print(f"\n   ⏸️ Pausing (rate limit)...\n")
-                    time.sleep(2)
+                finished.put((index, paper, future.result()))
+            except Exception as e:
+                finished.put((index, paper, ExtractionResult(error=str(e))))
+        
+        def on_fetched(index, paper, future):
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcome = ExtractionResult(error=str(e))
+            
+            if isinstance(outcome, ExtractionResult) or abort.is_set():
+                finished.put((index, paper, outcome if isinstance(outcome, ExtractionResult)
+                              else ExtractionResult(error="cancelled")))
+            else:
+                extraction = cpu_pool.submit(extract_and_store, paper.pdf_url, outcome)
+                extraction.add_done_callback(partial(on_extracted, index, paper))
+        
+        submitted = 0
+        in_flight = 0
+        succeeded = 0
+        
+        def collect():
+            nonlocal in_flight, succeeded
+            index, paper, result = finished.get()
+            in_flight -= 1
+            
+            if not result.ok:
+                self._record_failure(paper, result.error)
+                print(f"   ⚠️ Skipped {paper.title[:50]}... ({result.error})")
+            else:
+                succeeded += 1
+                results[index] = self._paper_record(paper, result.text)
+                self._index_paper(results[index])
+                print(f"   ✅ [{succeeded}/{target}] {paper.title[:50]}... ({len(result.text)} characters)")
+            
+            if progress_callback:
+                progress_callback(succeeded, target, paper, None if result.ok else result.error)
+        
+        try:
+            while succeeded < target:
+                # Keep enough candidates in flight to cover the remaining target plus spares
+                while in_flight < target - succeeded + spares:
+                    paper = next(candidates, None)
+                    if paper is None:
+                        break
                     
+                    label = "Queued" if submitted < target else "Backfill" if self.failures else "Spare"
+                    print(f"\n[{submitted + 1}] {label}: {paper.title[:60]}...")
+                    fetch = io_pool.submit(self._fetch, paper, abort)
+                    fetch.add_done_callback(partial(on_fetched, submitted, paper))
+                    submitted += 1
+                    in_flight += 1
+                
+                if not in_flight:
+                    break
+                collect()
+        
+        finally:
+            # Target reached (or no candidates left): drop the surplus work
+            abort.set()
+            io_pool.shutdown(wait=False, cancel_futures=True)
+            cpu_pool.shutdown(wait=False, cancel_futures=True)
+        
+        processed_papers = [results[i] for i in sorted(results)]
+        
+        self._collect_garbage()
+        if Config.LOCAL_INDEX_ENABLED:
+            try:
+                get_local_index().save()
             except Exception as e:
-                print(f"   ❌ Error: {e}")
-                continue
+                print(f"   ⚠️ Could not save local index: {e}")
         
         print("\n" + "="*60)
-        print(f"✅ SCRAPING COMPLETE: {len(processed_papers)} papers processed")
+        print(f"✅ SCRAPING COMPLETE: {len(processed_papers)}/{target} papers processed")
+        if in_flight:
+            print(f"   Cancelled: {in_flight} surplus papers")
+        if self.failures:
+            print(f"   Failed: {len(self.failures)} papers")
+            for failure in self.failures:
+                print(f"   - {failure['title'][:50]}... ({failure['reason']})")
         print("="*60 + "\n")
         
         return processed_papers
     
+    def _fetch(self, paper: Paper, abort: Optional[threading.Event] = None):
+        """I/O stage: stored text as a finished result, else the PDF bytes"""
+        if abort is not None and abort.is_set():
+            return ExtractionResult(error="cancelled")
+        
+        text = load_stored_text(paper.pdf_url)
+        if text:
+            return ExtractionResult(text=text)
+        
+        pdf_bytes = fetch_pdf_bytes(paper.pdf_url, abort=abort)
+        if not pdf_bytes:
+            return ExtractionResult(error="download failed")
+        return pdf_bytes
+    
+    def _paper_record(self, paper: Paper, text: str) -> Dict:
+        return {
+            'title': paper.title,
+            'authors': paper.authors,
+            'abstract': paper.abstract,
+            'full_text': text,
+            'pdf_url': paper.pdf_url,
+            'published': paper.published,
+            'categories': paper.categories,
+            'entry_id': paper.entry_id,
+            'sources': paper.sources
+        }
+    
+    def _index_paper(self, record: Dict):
+        """Add a scraped paper to the local indexes; index errors do not fail the scrape"""
+        if Config.LOCAL_INDEX_ENABLED:
+            try:
+                get_local_index().add_paper(record)
+            except Exception as e:
+                print(f"   ⚠️ Could not add to local index: {e}")
+        if Config.NEAR_DUP_ENABLED:
+            try:
+                get_near_duplicate_index().add_paper(record)
+            except Exception as e:
+                print(f"   ⚠️ Could not add to near-duplicate index: {e}")
+    
     def scrape_single_paper(self, paper: Paper) -> Optional[Dict]:
         """Scrape a single paper"""
         
         print(f"📄 Scraping: {paper.title[:50]}...")
         
         try:
-            text = process_pdf_url(paper.pdf_url)
+            result = process_pdf_url_result(paper.pdf_url)
+            text = result.text
             
             if text:
-                return {
-                    'title': paper.title,
-                    'authors': paper.authors,
-                    'abstract': paper.abstract,
-                    'full_text': text,
-                    'pdf_url': paper.pdf_url,
-                    'published': paper.published
-                }
+                return self._paper_record(paper, text)
+            print(f"⚠️ Skipped ({result.error})")
         except Exception as e:
             print(f"❌ Error: {e}")
         
         return None
+    
+    def _collect_garbage(self):
+        """Keep local paper storage within its quota"""
+        if not Config.STORAGE_ENABLED:
+            return
+        
+        evicted = get_storage_manager().gc()
+        if evicted:
+            print(f"   🧹 Evicted {len(evicted)} stored files (storage quota)")
+    
+    def _record_failure(self, paper: Paper, reason: str):
+        """Remember why a paper could not be scraped"""
+        self.failures.append({
+            'title': paper.title,
+            'pdf_url': paper.pdf_url,
+            'reason': reason or "unknown error"
+        })
 
 
 if __name__ == "__main__":
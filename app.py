@@ -4,6 +4,7 @@ sys.path.append(str(Path(__file__).parent))
 
 import streamlit as st
 from workflows.research_workflow import ResearchPaperWorkflow
+from utils.schemas import export_data
 import json
 from datetime import datetime
 
@@ -153,9 +154,41 @@ if run_button and query:
             status_text.markdown("### 📥 Step 2/4: Preparing to Scrape Papers...")
             progress_bar.progress(30)
             
-            # Run workflow
+            # Run workflow, showing the report sections while they are written
+            live_sections = {
+                'executive_summary': "📊 Executive Summary",
+                'conclusions': "📊 Conclusions",
+                'recommendations': "✅ Recommendations"
+            }
+            live_report = st.empty()
+            live_slots = {}
+            live_text = {}
+            ready_sections = set()
+            result = None
+            
             with st.spinner("🤖 Multi-Agent System Processing..."):
-                result = workflow.run(query=query, max_papers=max_papers)
+                for section, chunk in workflow.stream(query=query, max_papers=max_papers):
+                    if section == 'state':
+                        result = chunk
+                        continue
+                    
+                    if not live_slots:
+                        status_text.markdown("### 📝 Step 4/4: Writing Report...")
+                        progress_bar.progress(80)
+                        with live_report.container():
+                            for name, label in live_sections.items():
+                                st.markdown(f"#### {label}")
+                                live_slots[name] = st.empty()
+                    
+                    if section in live_slots:
+                        live_text[section] = live_text.get(section, "") + chunk
+                        live_slots[section].markdown(live_text[section] + " ▌")
+                    else:
+                        ready_sections.add(section)
+                        status_text.markdown(f"### 📝 Step 4/4: Writing Report... ({len(ready_sections)} sections ready)")
+            
+            # The complete report below replaces the live view
+            live_report.empty()
             
             # Update metrics
             papers_found = len(result['discovery_results'].get('arxiv_papers', []))
@@ -177,6 +210,11 @@ if run_button and query:
             
             st.success(f"🎉 Successfully analyzed {papers_analyzed} research papers!")
             
+            if result.get('scrape_failures'):
+                with st.expander(f"⚠️ {len(result['scrape_failures'])} papers could not be scraped"):
+                    for failure in result['scrape_failures']:
+                        st.markdown(f"- **{failure['title']}**: {failure['reason']}")
+            
             # Display report
             if result['final_report']:
                 report = result['final_report']
@@ -213,11 +251,34 @@ if run_button and query:
                         col2.metric("Total Lines", code_data.get('total_lines', 0))
                         col3.metric("Languages", len(code_data.get('languages_used', {})))
                         
+                        if code_data.get('metrics'):
+                            col1, col2, col3, col4 = st.columns(4)
+                            col1.metric("Functions", code_data['metrics']['functions'])
+                            col2.metric("Classes", code_data['metrics']['classes'])
+                            col3.metric("Loops", code_data['metrics']['loops'])
+                            col4.metric("Conditionals", code_data['metrics']['conditionals'])
+                        
                         if code_data.get('languages_used'):
                             st.markdown("**Languages Distribution:**")
                             for lang, count in code_data['languages_used'].items():
                                 st.markdown(f"- **{lang}**: {count} blocks")
                 
+                # Trending topics (computed locally from term statistics)
+                trending = report.get('trending_topics') or {}
+                if trending.get('top_terms'):
+                    with st.expander("📈 Trending Topics"):
+                        st.markdown("**Top terms:** " + ", ".join(
+                            f"{t['term']} ({t['papers']} papers)" for t in trending['top_terms'][:10]
+                        ))
+                        if trending.get('emerging_terms'):
+                            st.markdown(f"**Emerging** (vs. {trending['corpus_papers']} earlier papers): " + ", ".join(
+                                f"{t['term']} (×{t['lift']})" for t in trending['emerging_terms'][:10]
+                            ))
+                        if trending.get('co_occurrence'):
+                            st.markdown("**Frequently together:** " + ", ".join(
+                                f"{c['terms'][0]} + {c['terms'][1]} ({c['papers']})" for c in trending['co_occurrence'][:5]
+                            ))
+                
                 # Conclusions
                 with st.expander("📊 Conclusions"):
                     st.markdown(report.get('conclusions', 'No conclusions available'))
@@ -237,6 +298,9 @@ if run_button and query:
                             col1.write(f"**Hypotheses:** {paper['hypotheses_count']}")
                             col2.write(f"**Code Blocks:** {paper['code_blocks']}")
                             st.write(f"**Key Finding:** {paper['key_findings']}")
+                            if paper.get('duplicate_of'):
+                                st.caption(f"♻️ Near-duplicate of \"{paper['duplicate_of']['title']}\" "
+                                           f"({paper['duplicate_of']['similarity']:.0%} similar), analysis reused")
                             st.markdown("---")
                 
                 # Download buttons
@@ -245,7 +309,7 @@ if run_button and query:
                 
                 with col1:
                     # Download as JSON
-                    json_str = json.dumps(report, indent=2)
+                    json_str = json.dumps(export_data(report), indent=2)
                     st.download_button(
                         label="📥 Download Report (JSON)",
                         data=json_str,
@@ -0,0 +1,118 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import os
+import random
+import re
+import time
+from typing import List
+from tools.analysis.code_analyzer import CodeBlock, CodeScanner, extract_code_blocks_batch, scan_code_blocks
+from utils.config import Config
+from utils.storage_manager import _decompress
+
+
+def legacy_extract_code_blocks(text: str) -> List[CodeBlock]:
+    """The previous two-regex implementation, kept for comparison"""
+    blocks = []
+    for lang, code in re.findall(r'```(\w+)?\n(.*?)```', text, re.DOTALL):
+        if len(code.strip()) > 20:
+            blocks.append(CodeBlock(language=lang or "python", code=code.strip(),
+                                    line_count=len(code.strip().split('\n')), location="markdown"))
+    for code in re.findall(r'\n((?:    |\t)[^\n]+(?:\n(?:    |\t)[^\n]+)*)', text):
+        if len(code.strip()) > 50 and ('def ' in code or 'class ' in code):
+            blocks.append(CodeBlock(language="python", code=code.strip(),
+                                    line_count=len(code.strip().split('\n')), location="indented"))
+    return blocks
+
+
+def load_texts():
+    """Extracted paper texts from storage/extracted_text (plain or compressed)"""
+    texts = []
+    for path in sorted((Path(Config.STORAGE_DIR) / "extracted_text").iterdir()):
+        if path.name.endswith(('.txt', '.txt.gz', '.txt.zst')):
+            texts.append(_decompress(path.read_bytes(), path.suffix).decode('utf-8', errors='replace'))
+    return texts
+
+
+def pathological_text(lines: int = 20000) -> str:
+    """Long indented region without code, as produced by some PDF layouts"""
+    return "\n" + "\n".join(f"    {i} indented table cell value {i * 7}" for i in range(lines))
+
+
+def synthetic_paper(seed: int) -> str:
+    """Paper-like text with fenced and indented code between paragraphs"""
+    rng = random.Random(seed)
+    parts = ["Introduction"]
+    for _ in range(200):
+        r = rng.random()
+        if r < 0.2:
+            parts.append("```python\n" + "\n".join(
+                f"x{i} = compute_value({i}) + offset" for i in range(rng.randint(1, 5))
+            ) + "\n```")
+        elif r < 0.5:
+            parts.append("\n".join(
+                f"    def f{i}(a):\n        return a * {i}  # scale the input" for i in range(rng.randint(1, 3))
+            ))
+        else:
+            parts.append("Plain paragraph text. " * rng.randint(1, 5))
+    return "\n".join(parts)
+
+
+def timed(func, repeat: int = 5):
+    """Result and best wall time (ms) of func()"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+if __name__ == "__main__":
+    texts = load_texts()
+    if not texts:
+        print(f"No extracted text found in {Config.STORAGE_DIR}/extracted_text")
+        sys.exit(1)
+
+    size = sum(len(t) for t in texts)
+    print(f"Corpus: {len(texts)} papers, {size / 1e6:.1f}M characters\n")
+
+    legacy, legacy_ms = timed(lambda: [legacy_extract_code_blocks(t) for t in texts])
+    scanned, scan_ms = timed(lambda: [CodeScanner().close(t) for t in texts])
+    print(f"{'regex (legacy)':24s} {legacy_ms:8.1f} ms  {sum(map(len, legacy))} blocks")
+    print(f"{'line scanner':24s} {scan_ms:8.1f} ms  {sum(map(len, scanned))} blocks  "
+          f"({legacy_ms / scan_ms:.1f}x)")
+
+    # Same blocks as the regexes, also when fed page by page
+    synthetic = [synthetic_paper(seed) for seed in range(50)]
+    for text in synthetic + texts:
+        blocks = [b.code for b in CodeScanner().close(text)]
+        paged = scan_code_blocks(text[i:i + 3000] for i in range(0, len(text), 3000))
+        assert sorted(blocks) == sorted(b.code for b in legacy_extract_code_blocks(text))
+        assert blocks == [b.code for b in paged]
+
+    legacy, legacy_ms = timed(lambda: [legacy_extract_code_blocks(t) for t in synthetic])
+    scanned, scan_ms = timed(lambda: [CodeScanner().close(t) for t in synthetic])
+    print(f"{'synthetic (regex)':24s} {legacy_ms:8.1f} ms  {sum(map(len, legacy))} blocks")
+    print(f"{'synthetic (scanner)':24s} {scan_ms:8.1f} ms  {sum(map(len, scanned))} blocks  "
+          f"({legacy_ms / scan_ms:.1f}x)")
+
+    # Larger corpus for the process pool
+    corpus = texts * 40
+    _, serial_ms = timed(lambda: extract_code_blocks_batch(corpus, workers=1))
+    _, pool_ms = timed(lambda: extract_code_blocks_batch(corpus))
+    print(f"\n{len(corpus)} papers on {os.cpu_count()} CPUs: serial {serial_ms:.0f} ms, process pool {pool_ms:.0f} ms "
+          f"({serial_ms / pool_ms:.1f}x)")
+
+    text = pathological_text()
+    _, legacy_ms = timed(lambda: legacy_extract_code_blocks(text))
+    _, scan_ms = timed(lambda: CodeScanner().close(text))
+    print(f"\nLong indented region: regex {legacy_ms:.1f} ms, scanner {scan_ms:.1f} ms "
+          f"({legacy_ms / scan_ms:.1f}x)")
+
+    # Fed page by page, time grows with the text, not its square
+    for lines in (20000, 80000):
+        text = pathological_text(lines)
+        _, paged_ms = timed(lambda: scan_code_blocks(text[i:i + 3000] for i in range(0, len(text), 3000)), repeat=3)
+        print(f"Long indented region fed in pages, {len(text) / 1e3:.0f}K chars: {paged_ms:.1f} ms")
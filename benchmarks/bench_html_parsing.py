@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import tracemalloc
+from tools.scraping import html_parser
+from tools.scraping.html_parser import (
+    parse_page, parse_search_results, _parse_page_soup, _parse_results_soup, TEXT_LIMIT
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def measure(func, repeat: int = 20):
+    """Best wall time (ms) and peak traced memory (KB) of func()"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1024
+
+
+def chunked(data: bytes, size: int = 16 * 1024):
+    """Simulate a streamed response"""
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+def report(name: str, baseline, fast):
+    (base_ms, base_kb), (fast_ms, fast_kb) = baseline, fast
+    print(f"{name:32s} soup {base_ms:8.2f} ms {base_kb:8.0f} KB | "
+          f"lxml {fast_ms:7.2f} ms {fast_kb:7.0f} KB | {base_ms / fast_ms:5.1f}x")
+
+
+if __name__ == "__main__":
+    if html_parser.etree is None:
+        print("lxml is not installed; only the BeautifulSoup path is available")
+        sys.exit(1)
+
+    results_html = (FIXTURES / "duckduckgo_results.html").read_bytes()
+    article_html = (FIXTURES / "article.html").read_bytes()
+
+    # Both paths must agree before timing them
+    assert parse_search_results(results_html, 10) == _parse_results_soup(results_html, 10)
+    soup_page = _parse_page_soup(article_html, 20)
+    fast_page = parse_page(chunked(article_html))
+    assert fast_page['title'] == soup_page['title'] and fast_page['links'] == soup_page['links']
+    assert fast_page['text'] == soup_page['text'][:TEXT_LIMIT]
+
+    print(f"Fixtures: results {len(results_html) / 1024:.0f} KB, article {len(article_html) / 1024:.0f} KB\n")
+
+    report(
+        "duckduckgo results (10)",
+        measure(lambda: _parse_results_soup(results_html, 10)),
+        measure(lambda: parse_search_results(chunked(results_html), 10))
+    )
+    report(
+        "duckduckgo results (30)",
+        measure(lambda: _parse_results_soup(results_html, 30)),
+        measure(lambda: parse_search_results(chunked(results_html), 30))
+    )
+    report(
+        "article page",
+        measure(lambda: _parse_page_soup(article_html, 20)),
+        measure(lambda: parse_page(chunked(article_html)))
+    )
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+from benchmarks.bench_code_scanner import load_texts
+from tools.analysis.hypothesis_extractor import (
+    EXTRACTION_PROMPT, MAP_PROMPT, chunk_paper, select_chunks, estimate_tokens, prefilter_chunks,
+    score_hypothesis_signal
+)
+from utils.config import Config
+
+
+def full_tokens(text: str) -> int:
+    """Input tokens of the hypothesis stage without the pre-filter (map calls, no reduce)"""
+    if estimate_tokens(text) <= Config.HYPOTHESIS_CHUNK_TOKENS:
+        return estimate_tokens(EXTRACTION_PROMPT + text)
+    return sum(estimate_tokens(MAP_PROMPT + chunk) for chunk in select_chunks(chunk_paper(text)))
+
+
+def filtered_tokens(text: str, decisions: dict) -> int:
+    """Input tokens of the hypothesis stage with the pre-filter, counting its decisions"""
+    if estimate_tokens(text) <= Config.HYPOTHESIS_CHUNK_TOKENS:
+        signal = score_hypothesis_signal("", text)
+        if signal.score < Config.HYPOTHESIS_SKIP_SCORE:
+            decisions['skip'] += 1
+            return 0
+        if signal.score < Config.HYPOTHESIS_FULL_SCORE:
+            decisions['sentences'] += 1
+            return estimate_tokens(EXTRACTION_PROMPT + "\n".join(signal.sentences))
+        decisions['full'] += 1
+        return estimate_tokens(EXTRACTION_PROMPT + text)
+
+    # Long papers: the pre-filter decides chunk by chunk inside the map step
+    chunks = chunk_paper(text)
+    excerpts = prefilter_chunks("", chunks)
+    whole = sum(1 for excerpt in excerpts if excerpt in chunks)
+    decisions['full'] += whole
+    decisions['sentences'] += len(excerpts) - whole
+    decisions['skip'] += len(chunks) - len(excerpts)
+    return sum(estimate_tokens(MAP_PROMPT + excerpt) for excerpt in select_chunks(excerpts)) if excerpts else 0
+
+
+if __name__ == "__main__":
+    texts = load_texts()
+    if not texts:
+        print(f"No extracted text found in {Config.STORAGE_DIR}/extracted_text")
+        sys.exit(1)
+
+    baseline = filtered = 0
+    decisions = {'skip': 0, 'sentences': 0, 'full': 0}
+    start = time.perf_counter()
+    sent = [filtered_tokens(text, decisions) for text in texts]
+    scoring_ms = (time.perf_counter() - start) * 1000
+
+    for text, tokens_sent in zip(texts, sent):
+        tokens = full_tokens(text)
+        baseline += tokens
+        filtered += tokens_sent
+        print(f"  {tokens:6d} -> {tokens_sent:6d} tokens  {text[:60]!r}")
+
+    print(f"\n{len(texts)} papers (decisions per chunk for long papers): {decisions['skip']} skipped, "
+          f"{decisions['sentences']} sentences only, {decisions['full']} whole")
+    print(f"Hypothesis-stage input: {baseline} -> {filtered} tokens "
+          f"({1 - filtered / baseline:.0%} fewer), pre-filtering took {scoring_ms:.1f} ms")
@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import gc
+import time
+import tracemalloc
+from tools.analysis.code_analyzer import CodeBlock
+from tools.analysis.hypothesis_extractor import Hypothesis
+from tools.search.arxiv_tool import Paper
+from tools.search.duckduckgo_tool import SearchResult
+from tools.search.google_scholar_tool import ScholarPaper
+from utils.config import Config
+from utils.schemas import (
+    PaperSchema, CodeBlockSchema, HypothesisSchema, SearchResultSchema, ScholarPaperSchema,
+    export_data
+)
+
+PAPERS = 50
+CODE_BLOCKS_PER_PAPER = 40
+HYPOTHESES_PER_PAPER = 5
+WEB_RESULTS = 10
+SCHOLAR_RESULTS = 5
+
+
+def run_inputs():
+    """Field values for the objects of a 50-paper run (candidates over-fetched for reranking)"""
+    candidates = PAPERS * Config.RERANK_CANDIDATE_FACTOR
+    papers = [
+        dict(title=f"Paper {i} on deep learning", authors=[f"Author {j}" for j in range(4)],
+             abstract="We study representation learning. " * 30, pdf_url=f"http://arxiv.org/pdf/2401.{i:05d}v1",
+             published="2024-01-01", categories=["cs.LG", "cs.AI"], entry_id=f"http://arxiv.org/abs/2401.{i:05d}v1")
+        for i in range(candidates)
+    ]
+    blocks = [
+        dict(language="python", code=f"def f{i}(x):\n    return x * {i}", line_count=2, location="indented")
+        for i in range(PAPERS * CODE_BLOCKS_PER_PAPER)
+    ]
+    hypotheses = [
+        dict(statement=f"Claim {i}", supporting_evidence="Table 2", methodology="Ablation", results="+3.1 F1")
+        for i in range(PAPERS * HYPOTHESES_PER_PAPER)
+    ]
+    results = [dict(title=f"Result {i}", url=f"https://example.org/{i}", snippet="Snippet text")
+               for i in range(WEB_RESULTS)]
+    scholar = [dict(title=f"Scholar {i}", authors="Various Authors", snippet="Snippet", url="u", citations="5")
+               for i in range(SCHOLAR_RESULTS)]
+    return [(papers, Paper, PaperSchema), (blocks, CodeBlock, CodeBlockSchema),
+            (hypotheses, Hypothesis, HypothesisSchema), (results, SearchResult, SearchResultSchema),
+            (scholar, ScholarPaper, ScholarPaperSchema)]
+
+
+def build(inputs, use_schemas: bool):
+    return [
+        [(schema if use_schemas else record)(**values) for values in rows]
+        for rows, record, schema in inputs
+    ]
+
+
+def best_time(func, repeat: int = 7) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def object_bytes(cls, values) -> float:
+    """Average traced bytes per instance, excluding the shared field values"""
+    count = 2000
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [cls(**values) for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+if __name__ == "__main__":
+    inputs = run_inputs()
+    total = sum(len(rows) for rows, _, _ in inputs)
+    print(f"{PAPERS}-paper run: {total} objects\n")
+
+    print(f"{'type':14s} {'pydantic':>12s} {'slotted':>12s}")
+    for rows, record, schema in inputs:
+        print(f"{record.__name__:14s} {object_bytes(schema, rows[0]):9.0f} B  "
+              f"{object_bytes(record, rows[0]):9.0f} B")
+
+    schema_ms = best_time(lambda: build(inputs, use_schemas=True))
+    record_ms = best_time(lambda: build(inputs, use_schemas=False))
+    print(f"\nConstruction: pydantic {schema_ms:.2f} ms, slotted {record_ms:.2f} ms "
+          f"({schema_ms / record_ms:.1f}x)")
+
+    records = build(inputs, use_schemas=False)
+    export_ms = best_time(lambda: export_data(records))
+    print(f"Boundary validation of all {total} records (export_data): {export_ms:.2f} ms")
+
+    for (rows, record, schema), built in zip(inputs, records):
+        assert export_data(built) == [schema(**values).model_dump() for values in rows]
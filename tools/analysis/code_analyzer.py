@@ -2,19 +2,174 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+import ast
+import hashlib
+import multiprocessing
+import os
 import re
-from typing import List, Dict
-from pydantic import BaseModel
+import textwrap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Iterable, Optional, Tuple
 
 
-class CodeBlock(BaseModel):
-    """Extracted code block"""
+@dataclass(slots=True)
+class CodeBlock:
+    """Extracted code block (validated as CodeBlockSchema on export)"""
     language: str
     code: str
     line_count: int
     location: str
 
 
+# Fence language: the rest of an opener line after ```
+FENCE_LANGUAGE = re.compile(r'\w*')
+# Indented code lines start with one of these and have more after it
+INDENTS = ('    ', '\t')
+
+
+class CodeScanner:
+    """
+    Single-pass, line-by-line scanner for code blocks in paper text
+    
+    A small state machine over lines: outside a fence, a line ending in
+    ```lang opens one and a line indented by 4 spaces or a tab extends
+    the current indented run; inside a fence, lines are collected until
+    the next ```. Each line is looked at once and nothing is rescanned,
+    so time is linear in the text however long an indented region gets.
+    Text can be fed in chunks, e.g. page by page; only the current
+    unfinished line is carried from chunk to chunk. Indented lines inside
+    a fence belong to the fence only.
+    """
+    
+    def __init__(self):
+        self.blocks: List[CodeBlock] = []
+        self._reset()
+    
+    def _reset(self):
+        self._partial: List[str] = []  # pieces of the unfinished line
+        self._first = True  # the first line has no newline before it, so it cannot be indented code
+        self._fence: Optional[Tuple[str, List[str]]] = None  # language and lines of the open fence
+        self._run: List[str] = []  # lines of the current indented run
+    
+    def feed(self, text: str) -> "CodeScanner":
+        """Scan the next chunk of text"""
+        lines = text.split('\n')
+        if len(lines) > 1:
+            self._partial.append(lines[0])
+            lines[0] = "".join(self._partial)
+            self._partial = []
+            self._lines(lines[:-1])
+        if lines[-1]:
+            self._partial.append(lines[-1])
+        return self
+    
+    def close(self, text: str = "") -> List[CodeBlock]:
+        """Scan the last chunk of text (if any) and return all blocks found"""
+        self.feed(text)
+        # No newline follows the last line, so it cannot open a fence
+        self._line("".join(self._partial), last=True)
+        
+        if self._fence is not None:
+            # An unterminated fence is not a code block; its lines (which
+            # hold no ```) are scanned again as plain text, once
+            _, lines = self._fence
+            self._fence = None
+            for line in lines:
+                self._line(line, last=True)
+        
+        self._end_run()
+        self._reset()
+        return self.blocks
+    
+    def _lines(self, lines: List[str]):
+        """Complete lines; plain and indented lines outside fences take the fast path"""
+        run = self._run
+        for line in lines:
+            if self._fence is not None or '```' in line or self._first:
+                self._line(line)
+                run = self._run
+            elif line.startswith(INDENTS) and line not in INDENTS:
+                run.append(line)
+            elif run:
+                self._end_run()
+                run = self._run
+    
+    def _line(self, line: str, last: bool = False):
+        start = 0
+        if self._fence is not None:
+            close = line.find('```')
+            if close < 0:
+                self._fence[1].append(line)
+                return
+            language, lines = self._fence
+            lines.append(line[:close])
+            self._fence = None
+            self._add_fenced(language, "\n".join(lines))
+            start = close + 3
+        
+        opener = -1 if last else line.rfind('```', start)
+        if opener >= 0 and not FENCE_LANGUAGE.fullmatch(line, opener + 3):
+            opener = -1
+        
+        # Indented code starts at a line start; text before an opener still counts
+        if start == 0 and not self._first:
+            head = line if opener < 0 else line[:opener]
+            if head.startswith(INDENTS) and head not in INDENTS:
+                self._run.append(head)
+                if opener >= 0:
+                    self._end_run()
+            else:
+                self._end_run()
+        self._first = False
+        
+        if opener >= 0:
+            self._fence = (line[opener + 3:], [])
+    
+    def _end_run(self):
+        if self._run:
+            self._add_indented("\n".join(self._run))
+            self._run = []
+    
+    def _add_fenced(self, language: str, code: str):
+        code = code.strip()
+        if len(code) > 20:
+            self.blocks.append(CodeBlock(
+                language=language or "python",
+                code=code,
+                line_count=len(code.split('\n')),
+                location="markdown"
+            ))
+    
+    def _add_indented(self, code: str):
+        code = code.strip()
+        if len(code) > 50 and ('def ' in code or 'class ' in code):
+            self.blocks.append(CodeBlock(
+                language="python",
+                code=code,
+                line_count=len(code.split('\n')),
+                location="indented"
+            ))
+
+
+def scan_code_blocks(pages: Iterable[str]) -> List[CodeBlock]:
+    """
+    Extract code blocks from a stream of text chunks (e.g. PDF pages)
+    
+    Args:
+        pages: Text chunks in document order
+        
+    Returns:
+        List of CodeBlock objects
+    """
+    scanner = CodeScanner()
+    for page in pages:
+        scanner.feed(page)
+    return scanner.close()
+
+
 def extract_code_blocks(text: str) -> List[CodeBlock]:
     """
     Extract code blocks from paper text
@@ -27,58 +182,184 @@ def extract_code_blocks(text: str) -> List[CodeBlock]:
     """
     print("💻 Extracting code blocks...")
     
-    blocks = []
-    
-    # Pattern 1: Markdown code blocks
-    markdown_pattern = r'```(\w+)?\n(.*?)```'
-    matches = re.findall(markdown_pattern, text, re.DOTALL)
+    blocks = CodeScanner().close(text)
     
-    for lang, code in matches:
-        if len(code.strip()) > 20:
-            blocks.append(CodeBlock(
-                language=lang or "python",
-                code=code.strip(),
-                line_count=len(code.strip().split('\n')),
-                location="markdown"
-            ))
+    print(f"✅ Found {len(blocks)} code blocks")
+    return blocks
+
+
+def _scan_quietly(text: str) -> List[CodeBlock]:
+    return CodeScanner().close(text)
+
+
+# Below this much text a process pool costs more than it saves
+BATCH_POOL_MIN_CHARS = 2_000_000
+
+
+def extract_code_blocks_batch(texts: Iterable[str], workers: Optional[int] = None) -> List[List[CodeBlock]]:
+    """
+    Extract code blocks from many papers, using a process pool for
+    large batches
     
-    # Pattern 2: Python-style indented code
-    python_pattern = r'\n((?:    |\t)[^\n]+(?:\n(?:    |\t)[^\n]+)*)'
-    py_matches = re.findall(python_pattern, text)
+    Args:
+        texts: Full texts of the papers
+        workers: Worker processes (defaults to the CPU count)
+        
+    Returns:
+        One list of CodeBlock objects per paper, in input order
+    """
+    texts = list(texts)
+    workers = workers or os.cpu_count() or 1
     
-    for code in py_matches:
-        if len(code.strip()) > 50 and ('def ' in code or 'class ' in code):
-            blocks.append(CodeBlock(
-                language="python",
-                code=code.strip(),
-                line_count=len(code.strip().split('\n')),
-                location="indented"
-            ))
+    if workers < 2 or len(texts) < 2 or sum(len(t) for t in texts) < BATCH_POOL_MIN_CHARS:
+        return [_scan_quietly(text) for text in texts]
     
-    print(f"✅ Found {len(blocks)} code blocks")
-    return blocks
+    # spawn, like the extraction pool: safe next to threads in the app
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(texts)), mp_context=context) as pool:
+        return list(pool.map(_scan_quietly, texts, chunksize=max(1, len(texts) // (workers * 4))))
+
 
+METRIC_KEYS = ('lines', 'functions', 'classes', 'imports', 'loops', 'conditionals')
+
+# One AST node type -> metric it counts
+_AST_METRICS = {
+    ast.FunctionDef: 'functions',
+    ast.AsyncFunctionDef: 'functions',
+    ast.ClassDef: 'classes',
+    ast.Import: 'imports',
+    ast.ImportFrom: 'imports',
+    ast.For: 'loops',
+    ast.AsyncFor: 'loops',
+    ast.While: 'loops',
+    ast.comprehension: 'loops',
+    ast.If: 'conditionals',
+    ast.IfExp: 'conditionals',
+}
+
+# Keyword -> metric for the tokenizer fallback (non-Python or unparseable code)
+_KEYWORD_METRICS = {
+    'def': 'functions', 'function': 'functions', 'func': 'functions', 'fn': 'functions',
+    'class': 'classes', 'struct': 'classes', 'interface': 'classes',
+    'import': 'imports', 'include': 'imports', 'require': 'imports', 'using': 'imports', 'library': 'imports',
+    'for': 'loops', 'while': 'loops', 'foreach': 'loops',
+    'if': 'conditionals', 'elif': 'conditionals', 'elsif': 'conditionals', 'switch': 'conditionals',
+}
+
+_HASH_COMMENT_LANGUAGES = {'python', 'py', 'r', 'ruby', 'bash', 'sh', 'shell', 'julia', 'perl', 'yaml'}
+
+# Strings and comments are skipped, so keywords inside them are not counted
+_TOKENS = {
+    'hash': re.compile(
+        r'"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+        r'|#[^\n]*|([A-Za-z_]\w*)'
+    ),
+    'c': re.compile(
+        r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`[^`]*`'
+        r'|//[^\n]*|/\*[\s\S]*?\*/|([A-Za-z_]\w*)'
+    ),
+}
+
+
+def _empty_metrics(code: str) -> Dict[str, int]:
+    metrics = dict.fromkeys(METRIC_KEYS, 0)
+    metrics['lines'] = len(code.split('\n'))
+    return metrics
+
+
+def _ast_metrics(code: str) -> Optional[Dict[str, int]]:
+    try:
+        tree = ast.parse(textwrap.dedent(code))
+    except (SyntaxError, ValueError):
+        return None
+
+    metrics = _empty_metrics(code)
+    for node in ast.walk(tree):
+        key = _AST_METRICS.get(type(node))
+        if key:
+            metrics[key] += 1
+            if key == 'loops' and isinstance(node, ast.comprehension):
+                metrics['conditionals'] += len(node.ifs)
+    return metrics
 
-def analyze_code_complexity(code: str) -> Dict[str, int]:
+
+def _token_metrics(code: str, language: str) -> Dict[str, int]:
+    metrics = _empty_metrics(code)
+    pattern = _TOKENS['hash' if language in _HASH_COMMENT_LANGUAGES else 'c']
+    for match in pattern.finditer(code):
+        key = _KEYWORD_METRICS.get(match.group(1)) if match.group(1) else None
+        if key:
+            metrics[key] += 1
+    return metrics
+
+
+def _compute_metrics(code: str, language: str) -> Dict[str, int]:
+    if language in ('python', 'py', ''):
+        metrics = _ast_metrics(code)
+        if metrics is not None:
+            return metrics
+    return _token_metrics(code, language)
+
+
+# Metrics by sha1 of (language, code), least recently used evicted first
+METRICS_CACHE_SIZE = 4096
+_metrics_cache: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+_metrics_lock = threading.Lock()
+
+
+def analyze_code_complexity(code: str, language: str = "python") -> Dict[str, int]:
     """
     Analyze code complexity metrics
     
+    Python is parsed with ast in one traversal; other languages, and
+    Python that does not parse, are counted from a tokenizer that skips
+    strings and comments. Results are memoized by content hash.
+    
     Args:
         code: Code string
+        language: Language of the code block
         
     Returns:
         Dictionary of metrics
     """
-    metrics = {
-        'lines': len(code.split('\n')),
-        'functions': len(re.findall(r'\bdef\s+\w+', code)),
-        'classes': len(re.findall(r'\bclass\s+\w+', code)),
-        'imports': len(re.findall(r'\bimport\s+\w+', code)),
-        'loops': len(re.findall(r'\b(for|while)\s+', code)),
-        'conditionals': len(re.findall(r'\b(if|elif)\s+', code))
-    }
+    language = (language or "").lower()
+    key = hashlib.sha1(f"{language}\0{code}".encode('utf-8')).hexdigest()
+
+    with _metrics_lock:
+        metrics = _metrics_cache.get(key)
+        if metrics is not None:
+            _metrics_cache.move_to_end(key)
+            return dict(metrics)
+
+    metrics = _compute_metrics(code, language)
+
+    with _metrics_lock:
+        _metrics_cache[key] = metrics
+        if len(_metrics_cache) > METRICS_CACHE_SIZE:
+            _metrics_cache.popitem(last=False)
+    return dict(metrics)
+
+
+def analyze_code_blocks(blocks: Iterable[CodeBlock]) -> List[Dict[str, int]]:
+    """
+    Metrics for a batch of code blocks (memoized per block content)
     
-    return metrics
+    Args:
+        blocks: CodeBlock objects
+        
+    Returns:
+        One metrics dictionary per block, in input order
+    """
+    return [analyze_code_complexity(block.code, block.language) for block in blocks]
+
+
+def summarize_code_metrics(blocks: Iterable[CodeBlock]) -> Dict[str, int]:
+    """Metrics summed over all blocks"""
+    totals = dict.fromkeys(METRIC_KEYS, 0)
+    for metrics in analyze_code_blocks(blocks):
+        for key in METRIC_KEYS:
+            totals[key] += metrics[key]
+    return totals
 
 
 if __name__ == "__main__":
@@ -105,5 +386,5 @@ if __name__ == "__main__":
         print(f"Lines: {block.line_count}")
         print(f"Code:\n{block.code[:200]}...")
         
-        metrics = analyze_code_complexity(block.code)
+        metrics = analyze_code_complexity(block.code, block.language)
         print(f"Metrics: {metrics}")
\ No newline at end of file
@@ -0,0 +1,166 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import re
+import numpy as np
+from collections import Counter
+from typing import List, Optional
+from tools.analysis.hypothesis_extractor import LINE_HYPHEN, SENTENCE_END, split_sections, chunk_paper
+from utils.config import Config
+
+
+# Sections whose sentences report findings
+FINDING_SECTIONS = re.compile(
+    r'results?|experiments?|evaluation|findings|discussion|conclusions?|summary', re.IGNORECASE
+)
+STOP_WORDS = frozenset("""
+a about above after again all also an and any are as at be been being between both but by can could
+did do does doing during each few for from further had has have having here how i if in into is it
+its itself just more most no nor not of on once only or other our ours out over own same she should
+so some such than that the their theirs them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you your
+""".split())
+
+MIN_SENTENCE_CHARS = 40
+MAX_SENTENCE_CHARS = 400
+MAX_SENTENCES = 300
+SECTION_CHARS = 20000
+
+
+def strip_running_headers(text: str, min_repeats: int = 3) -> str:
+    """Drop lines repeated on many pages (running titles, journal headers)"""
+    lines = text.split('\n')
+    counts = Counter(line.strip() for line in lines if len(line.strip()) > 15)
+    repeated = {line for line, count in counts.items() if count >= min_repeats}
+    if not repeated:
+        return text
+    return '\n'.join(line for line in lines if line.strip() not in repeated)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Prose sentences of PDF text (de-hyphenated, tables and formulas skipped)"""
+    text = " ".join(LINE_HYPHEN.sub("", text).split())
+    sentences = []
+    for sentence in SENTENCE_END.split(text):
+        if not MIN_SENTENCE_CHARS <= len(sentence) <= MAX_SENTENCE_CHARS:
+            continue
+        letters = sum(c.isalpha() or c == ' ' for c in sentence)
+        if letters >= 0.8 * len(sentence):
+            sentences.append(sentence)
+    return sentences
+
+
+def _words(sentence: str) -> set:
+    return {w for w in re.findall(r'[a-z][a-z0-9-]+', sentence.lower()) if w not in STOP_WORDS}
+
+
+def textrank(sentences: List[str], bias: Optional[np.ndarray] = None, damping: float = 0.85,
+             iterations: int = 100, tolerance: float = 1e-6) -> np.ndarray:
+    """
+    TextRank scores of sentences
+
+    Sentence similarity is word overlap normalized by the log sentence
+    lengths (Mihalcea & Tarau), computed as one matrix product over a
+    binary sentence-term matrix; scores come from power iteration.
+
+    Args:
+        sentences: Sentences to rank
+        bias: Optional teleport weights (e.g. to favour the abstract)
+        damping: PageRank damping factor
+
+    Returns:
+        Score per sentence (sums to 1)
+    """
+    n = len(sentences)
+    if n == 0:
+        return np.zeros(0)
+
+    vocabulary = {}
+    rows, cols = [], []
+    for i, sentence in enumerate(sentences):
+        for word in _words(sentence):
+            rows.append(i)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    terms = np.zeros((n, max(len(vocabulary), 1)), dtype=np.float32)
+    terms[rows, cols] = 1.0
+    overlap = terms @ terms.T
+
+    log_lengths = np.log1p(terms.sum(axis=1))
+    norm = log_lengths[:, None] + log_lengths[None, :]
+    similarity = np.divide(overlap, norm, out=np.zeros_like(overlap), where=norm > 0)
+    np.fill_diagonal(similarity, 0.0)
+
+    # Row-stochastic transitions; sentences without neighbours jump uniformly
+    out = similarity.sum(axis=1, keepdims=True)
+    transitions = np.divide(similarity, out, out=np.full_like(similarity, 1.0 / n), where=out > 0)
+
+    teleport = np.full(n, 1.0 / n) if bias is None else bias / bias.sum()
+    scores = teleport.copy()
+    for _ in range(iterations):
+        updated = (1 - damping) * teleport + damping * (transitions.T @ scores)
+        if np.abs(updated - scores).sum() < tolerance:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def findings_sentences(abstract: str, full_text: str = "") -> List[str]:
+    """
+    Candidate sentences: the abstract, then results/discussion/conclusion
+    sections (or the body without back matter if there are none)
+    """
+    sentences = split_sentences(abstract)
+    full_text = strip_running_headers(full_text)
+    body = "".join(
+        text[:SECTION_CHARS] for heading, text in split_sections(full_text)
+        if heading and FINDING_SECTIONS.search(heading)
+    )
+    if not body:
+        body = "".join(chunk_paper(full_text))[:2 * SECTION_CHARS]
+    seen = set(sentences)
+    sentences += [s for s in split_sentences(body) if s not in seen]
+    return sentences[:MAX_SENTENCES]
+
+
+def summarize_key_findings(abstract: str, full_text: str = "", num_sentences: int = None) -> str:
+    """
+    Extractive key findings without an LLM
+
+    Ranks the sentences of the abstract and the results sections with
+    TextRank (abstract sentences weighted twice) and returns the best
+    ones as bullet points in document order.
+
+    Args:
+        abstract: Paper abstract
+        full_text: Full paper text
+        num_sentences: Number of bullet points (defaults to KEY_FINDINGS_SENTENCES)
+
+    Returns:
+        Bullet point string
+    """
+    num_sentences = num_sentences or Config.KEY_FINDINGS_SENTENCES
+    abstract_count = len(split_sentences(abstract))
+    sentences = findings_sentences(abstract, full_text)
+    if not sentences:
+        text = " ".join((abstract or full_text[:1000]).split())
+        return f"- {text[:MAX_SENTENCE_CHARS]}" if text else "- No findings could be extracted"
+
+    bias = np.ones(len(sentences))
+    bias[:abstract_count] = 2.0
+    scores = textrank(sentences, bias)
+    best = sorted(np.argsort(-scores, kind='stable')[:num_sentences])
+    return "\n".join(f"- {sentences[i]}" for i in best)
+
+
+if __name__ == "__main__":
+    import time
+
+    files = sorted((Path(Config.STORAGE_DIR) / "extracted_text").glob("*.txt"))
+    for path in files[:3]:
+        text = path.read_text(encoding='utf-8', errors='replace')
+        start = time.perf_counter()
+        summary = summarize_key_findings("", text)
+        print(f"\n{path.name} ({(time.perf_counter() - start) * 1000:.0f} ms)\n{summary}")
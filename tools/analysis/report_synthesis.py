@@ -0,0 +1,163 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
+from tools.analysis.hypothesis_extractor import CHARS_PER_TOKEN, estimate_tokens
+from tools.analysis.extractive_summarizer import summarize_key_findings
+from utils.config import Config
+from utils.llm_client import get_llm, invoke_with_timeout
+from langchain_core.prompts import ChatPromptTemplate
+
+
+GROUP_PROMPT = """Below are the findings of {count} research papers on "{query}".
+Summarize what they show together in at most {words} words: the main results, the methods used,
+and where the papers agree or disagree. Name a paper only for a specific result.
+
+{texts}
+
+Summary:"""
+
+MERGE_PROMPT = """Below are {count} summaries, each covering a different group of research papers on "{query}".
+Merge them into one summary of at most {words} words that keeps the main results, the methods used,
+and where the groups agree or disagree.
+
+{texts}
+
+Merged summary:"""
+
+
+def analysis_digest(analysis: Dict, max_chars: int = None) -> str:
+    """Title, key findings, methodology and hypotheses of an analysis, truncated to max_chars"""
+    max_chars = max_chars or Config.SYNTHESIS_PAPER_CHARS
+    parts = [f"### {analysis.get('title', 'Untitled')}", analysis.get('key_findings', "")]
+    if analysis.get('methodology'):
+        parts.append(f"Methodology: {analysis['methodology']}")
+    parts.extend(f"Hypothesis: {h.statement}" for h in analysis.get('hypotheses', []))
+    return "\n".join(part for part in parts if part)[:max_chars]
+
+
+def order_by_topic(analyses: List[Dict], num_topics: int) -> List[Dict]:
+    """
+    Analyses grouped by topic cluster (largest cluster first), so papers
+    packed into the same summary call mostly share a topic
+    """
+    if not Config.SYNTHESIS_BY_TOPIC or num_topics < 2 or len(analyses) < Config.SYNTHESIS_TOPIC_MIN_PAPERS:
+        return analyses
+
+    from tools.langchain_tools.paper_clustering import cluster_papers
+    try:
+        clusters = cluster_papers(analyses, num_clusters=num_topics)
+    except Exception as e:
+        print(f"⚠️ Topic grouping failed ({e}), keeping paper order")
+        return analyses
+    return [a for cluster in sorted(clusters.values(), key=len, reverse=True) for a in cluster]
+
+
+def pack_groups(texts: List[str], max_tokens: int) -> List[List[str]]:
+    """
+    Split texts, in order, into groups of at most max_tokens tokens each
+
+    Every group but a lone last one holds at least two texts (texts are
+    capped at half the budget), so each round of summaries shrinks.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN // 2
+    groups, group, size = [], [], 0
+    for text in texts:
+        text = text[:max_chars]
+        tokens = estimate_tokens(text)
+        if group and size + tokens > max_tokens:
+            groups.append(group)
+            group, size = [], 0
+        group.append(text)
+        size += tokens
+    if group:
+        groups.append(group)
+    return groups
+
+
+def _summarize_group(llm, query: str, texts: List[str], prompt_template: str) -> str:
+    prompt = ChatPromptTemplate.from_template(prompt_template).format(
+        query=query, count=len(texts), words=Config.SYNTHESIS_SUMMARY_WORDS, texts="\n\n".join(texts)
+    )
+    try:
+        return invoke_with_timeout(llm, prompt).content.strip()
+    except Exception as e:
+        print(f"⚠️ Synthesis call failed ({e}), using extractive summary")
+        return summarize_key_findings("\n".join(texts), num_sentences=Config.KEY_FINDINGS_SENTENCES)
+
+
+def synthesize_analyses(query: str, analyses: List[Dict], llm=None, max_tokens: int = None) -> str:
+    """
+    Hierarchical map-reduce summary of all analyses
+
+    Paper digests (ordered by topic, one cluster per expected group) are packed into groups of at most
+    max_tokens tokens and each group is summarized by one LLM call, the
+    calls of a level running concurrently. The summaries are packed and
+    summarized again until everything fits in one call's budget. Each
+    level divides the number of texts by the group size, so LLM calls
+    grow about linearly with the number of papers and latency with the
+    number of levels (logarithmically). If all digests already fit,
+    no LLM call is made.
+
+    Args:
+        query: Research query
+        analyses: Results from the analysis agent
+        llm: Chat model (created if None)
+        max_tokens: Input token budget per call (defaults to SYNTHESIS_CALL_TOKENS)
+
+    Returns:
+        Text of at most about max_tokens tokens covering every paper
+    """
+    max_tokens = max_tokens or Config.SYNTHESIS_CALL_TOKENS
+    digests = {id(a): analysis_digest(a) for a in analyses}
+    num_groups = len(pack_groups(list(digests.values()), max_tokens))
+    texts = [digests[id(a)] for a in order_by_topic(analyses, num_groups)]
+    prompt_template = GROUP_PROMPT
+    level = 0
+
+    while sum(estimate_tokens(text) for text in texts) > max_tokens:
+        level += 1
+        groups = pack_groups(texts, max_tokens)
+        print(f"🧩 Synthesis level {level}: {len(texts)} texts -> {len(groups)} summaries")
+
+        llm = llm or get_llm(temperature=0.3)
+        with ThreadPoolExecutor(max_workers=max(1, Config.SYNTHESIS_WORKERS)) as executor:
+            # Each call runs in a copy of the caller's context (the run's token budget)
+            futures = [
+                executor.submit(contextvars.copy_context().run, _summarize_group, llm, query, group, prompt_template)
+                for group in groups
+            ]
+            texts = [future.result() for future in futures]
+        prompt_template = MERGE_PROMPT
+        if len(groups) == 1:
+            break
+
+    return "\n\n".join(texts)[:max_tokens * CHARS_PER_TOKEN]
+
+
+if __name__ == "__main__":
+    import time
+
+    class SleepyLLM:
+        """Stand-in model: half a second and ~250 tokens per call"""
+        def __init__(self):
+            self.calls = 0
+
+        def invoke(self, prompt):
+            self.calls += 1
+            time.sleep(0.5)
+            return type("Response", (), {'content': "summary " * 125})()
+
+    for count in (10, 50, 200):
+        analyses = [
+            {'title': f"Paper {i}", 'key_findings': f"- Finding {i}: " + "result " * 150, 'methodology': "experiments"}
+            for i in range(count)
+        ]
+        llm = SleepyLLM()
+        start = time.perf_counter()
+        synthesis = synthesize_analyses("example query", analyses, llm=llm)
+        print(f"{count} papers: {llm.calls} LLM calls, {time.perf_counter() - start:.1f}s, "
+              f"{estimate_tokens(synthesis)} tokens\n")
@@ -0,0 +1,290 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import json
+import math
+import threading
+import numpy as np
+from array import array
+from collections import Counter
+from typing import List, Dict, Iterable, Tuple
+from tools.search.local_index import STOPWORDS, TOKEN_PATTERN
+from utils.config import Config
+
+
+MAX_NGRAM = 3
+# Words common in any abstract: never a term on their own, only inside a phrase
+GENERIC_WORDS = frozenset("""
+approach approaches method methods model models result results work study studies task tasks problem
+problems performance data research framework analysis large small high low new novel state art first
+second key finding findings different various existing
+""".split())
+# Verbs and fillers that end a phrase like a stopword
+PHRASE_BREAKS = frozenset("""
+propose proposed proposes present presents presented provide provides improve improves improved
+improvement improvements achieve achieves achieved based significant significantly well across show
+demonstrate demonstrates enable enables
+""".split())
+
+
+def extract_terms(text: str, max_n: int = MAX_NGRAM) -> Counter:
+    """
+    Counts of the words and phrases (up to max_n words) of a text
+
+    Stopwords, numbers and common verbs split phrases, so n-grams never
+    span them; generic words ("models", "large") only count as part of
+    a phrase.
+    """
+    counts = Counter()
+    run = []
+    for token in TOKEN_PATTERN.findall(text.lower()) + [""]:
+        if len(token) > 1 and token not in STOPWORDS and token not in PHRASE_BREAKS and not token.isdigit():
+            run.append(token)
+            continue
+
+        for n in range(1, min(max_n, len(run)) + 1):
+            for i in range(len(run) - n + 1):
+                words = run[i:i + n]
+                if not all(word in GENERIC_WORDS for word in words):
+                    counts[" ".join(words)] += 1
+        run = []
+    return counts
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """Whether one term is a phrase within the other"""
+    return f" {a} " in f" {b} " or f" {b} " in f" {a} "
+
+
+class TermStatistics:
+    """
+    Incremental document and occurrence counts of terms over analyzed papers
+
+    Each term gets an id in lexicon order; document frequencies and
+    total counts are kept in two array('I') columns indexed by id. No
+    per-paper term lists are kept, but save() rewrites both columns,
+    the lexicon (every term ever seen, never pruned) and the paper keys,
+    each through a temporary file so a crash never leaves a torn file.
+    A store that cannot be loaded is started over empty.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = Path(path or Config.TERM_STATS_DIR)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._df = array('I')
+        self._counts = array('I')
+        self._keys = set()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        lexicon_path = self.path / "lexicon.json"
+        if not lexicon_path.exists():
+            return
+
+        try:
+            terms = json.loads(lexicon_path.read_text(encoding='utf-8'))
+            df, counts = array('I'), array('I')
+            for column, name in ((df, "df.u32"), (counts, "counts.u32")):
+                with open(self.path / name, 'rb') as f:
+                    column.fromfile(f, len(terms))
+            keys = set(json.loads((self.path / "papers.json").read_text(encoding='utf-8')))
+        except (OSError, EOFError, ValueError) as e:
+            print(f"⚠️ Term statistics in {self.path} unreadable ({e}), starting over")
+            return
+
+        self._ids = {term: i for i, term in enumerate(terms)}
+        self._df, self._counts, self._keys = df, counts, keys
+
+    def _replace(self, name: str, write):
+        tmp_path = self.path / f"{name}.tmp"
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        tmp_path.replace(self.path / name)
+
+    def save(self):
+        """Write the store (the lexicon last, so ids never point past the columns)"""
+        with self._lock:
+            terms = sorted(self._ids, key=self._ids.get)
+            self._replace("df.u32", self._df.tofile)
+            self._replace("counts.u32", self._counts.tofile)
+            self._replace("papers.json", lambda f: f.write(json.dumps(sorted(self._keys)).encode('utf-8')))
+            self._replace("lexicon.json", lambda f: f.write(json.dumps(terms).encode('utf-8')))
+
+    # ------------------------------------------------------------------
+    # Counting
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def add_document(self, key: str, terms: Counter) -> bool:
+        """
+        Count a paper's terms once
+
+        Returns:
+            True if the paper was added, False if already counted
+        """
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+
+            for term, count in terms.items():
+                term_id = self._ids.get(term)
+                if term_id is None:
+                    term_id = self._ids[term] = len(self._df)
+                    self._df.append(0)
+                    self._counts.append(0)
+                self._df[term_id] += 1
+                self._counts[term_id] += count
+            return True
+
+    def document_frequency(self, term: str) -> int:
+        term_id = self._ids.get(term)
+        return self._df[term_id] if term_id is not None else 0
+
+    # ------------------------------------------------------------------
+    # Query statistics
+    # ------------------------------------------------------------------
+
+    def analyze(self, documents: List[Tuple[str, str]], top_k: int = 15) -> Dict:
+        """
+        Term statistics of a query's papers against the stored corpus
+
+        - top_terms: terms in most of the papers, weighted by IDF over
+          the corpus plus these papers (generic terms rank low)
+        - emerging_terms: terms much more frequent in these papers than
+          in the rest of the corpus (needs TERM_STATS_MIN_CORPUS papers)
+        - co_occurrence: pairs of top terms sharing the most papers
+
+        Args:
+            documents: (key, text) of each paper
+            top_k: Number of terms per list
+
+        Returns:
+            Dictionary of the three lists and the corpus size
+        """
+        docs = [(key, extract_terms(text)) for key, text in documents]
+        n_docs = len(docs)
+        query_df = Counter()
+        stored_df = Counter()
+        for key, terms in docs:
+            query_df.update(terms.keys())
+            if key in self._keys:
+                stored_df.update(terms.keys())
+
+        with self._lock:
+            stored = sum(1 for key, _ in docs if key in self._keys)
+            other_docs = len(self._keys) - stored
+            other_df = {term: self.document_frequency(term) - stored_df[term] for term in query_df}
+
+        min_df = min(2, n_docs)
+        candidates = [term for term, df in query_df.items() if df >= min_df]
+        total = other_docs + n_docs
+
+        def tf_idf(term):
+            return query_df[term] / n_docs * (math.log((total + 1) / (other_df[term] + query_df[term] + 1)) + 1)
+
+        # Ties go to the longer phrase, whose words are then skipped
+        ranked = sorted(candidates, key=lambda t: (-tf_idf(t), -t.count(' '), t))
+        top_terms = self._distinct(ranked, query_df, top_k)
+
+        emerging = []
+        if other_docs >= Config.TERM_STATS_MIN_CORPUS:
+            def lift(term):
+                return ((query_df[term] + 0.5) / (n_docs + 1)) / ((other_df[term] + 0.5) / (other_docs + 1))
+            rising = sorted((t for t in candidates if lift(t) >= 2.0), key=lambda t: (-lift(t), -t.count(' '), t))
+            emerging = [
+                {'term': term, 'papers': query_df[term], 'corpus_papers': other_df[term],
+                 'lift': round(lift(term), 2)}
+                for term in self._distinct(rising, query_df, top_k)
+            ]
+
+        return {
+            'corpus_papers': other_docs,
+            'top_terms': [
+                {'term': term, 'papers': query_df[term], 'score': round(tf_idf(term), 3)}
+                for term in top_terms
+            ],
+            'emerging_terms': emerging,
+            'co_occurrence': self._co_occurrence([terms for _, terms in docs], top_terms, top_k)
+        }
+
+    @staticmethod
+    def _distinct(ranked: Iterable[str], query_df: Counter, k: int) -> List[str]:
+        """First k terms, skipping words of an already chosen phrase found in the same papers"""
+        chosen = []
+        for term in ranked:
+            if any(_overlaps(term, other) and query_df[term] <= query_df[other] for other in chosen):
+                continue
+            chosen.append(term)
+            if len(chosen) == k:
+                break
+        return chosen
+
+    @staticmethod
+    def _co_occurrence(docs: List[Counter], terms: List[str], k: int) -> List[Dict]:
+        if len(terms) < 2:
+            return []
+
+        presence = np.array([[term in doc for term in terms] for doc in docs], dtype=np.int32)
+        together = presence.T @ presence
+        df = np.diag(together)
+
+        pairs = []
+        for i in range(len(terms)):
+            for j in range(i + 1, len(terms)):
+                if together[i, j] >= 2 and not _overlaps(terms[i], terms[j]):
+                    jaccard = together[i, j] / (df[i] + df[j] - together[i, j])
+                    pairs.append((int(together[i, j]), float(jaccard), terms[i], terms[j]))
+
+        pairs.sort(key=lambda p: (-p[0], -p[1], p[2], p[3]))
+        return [
+            {'terms': [a, b], 'papers': count, 'jaccard': round(jaccard, 2)}
+            for count, jaccard, a, b in pairs[:k]
+        ]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_term_statistics() -> TermStatistics:
+    """Shared term statistics store, created on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TermStatistics()
+        return _store
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    store = TermStatistics(tempfile.mkdtemp())
+    background = [
+        "convolutional neural networks for image classification on imagenet",
+        "recurrent neural networks for speech recognition",
+        "graph neural networks for molecule property prediction",
+    ] * 10
+    for i, text in enumerate(background):
+        store.add_document(f"old{i}", extract_terms(text))
+
+    query_papers = [
+        ("new1", "diffusion models for image generation with classifier-free guidance"),
+        ("new2", "latent diffusion models enable high resolution image generation"),
+        ("new3", "score-based diffusion models and neural networks for audio generation"),
+    ]
+    stats = store.analyze(query_papers, top_k=5)
+    print(json.dumps(stats, indent=2))
@@ -1,20 +1,232 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
 
-def cluster_papers(papers, num_clusters):
-    abstracts = [p["summary"] for p in papers]
+import numpy as np
+from scipy import sparse
+from typing import List, Dict, Iterable, Iterator, Optional
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import normalize
+from utils.config import Config
 
-    vectorizer = TfidfVectorizer(
-        stop_words="english",
-        max_features=1000
-    )
-    X = vectorizer.fit_transform(abstracts)
 
-    kmeans = KMeans(n_clusters=num_clusters, random_state=42)
-    labels = kmeans.fit_predict(X)
+# Characters of full text used per paper (title and abstract carry most of the topic)
+TEXT_CHARS = 20000
+SILHOUETTE_SAMPLE = 1000
+
+
+def record_text(record) -> str:
+    """
+    Clustering text of a Paper, a scraped paper dictionary or an analysis
+
+    Uses title and abstract (or the legacy 'summary'), plus key findings,
+    methodology and hypothesis statements of analyses and the start of
+    the full text of scraped papers.
+    """
+    if isinstance(record, dict):
+        get = record.get
+    else:
+        get = lambda name, default=None: getattr(record, name, default)
+
+    parts = [get('title'), get('abstract') or get('summary'), get('key_findings'), get('methodology')]
+    parts.extend(getattr(h, 'statement', None) for h in get('hypotheses') or [])
+    parts.append((get('full_text') or "")[:TEXT_CHARS])
+    return " ".join(part for part in parts if part)
+
+
+def _batches(records: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class PaperClusterer:
+    """
+    Incremental topic clustering of papers
+
+    Texts are hashed into a fixed-size sparse vector space (no vocabulary
+    to fit or store), weighted by IDF from running document frequencies,
+    and clustered with MiniBatchKMeans. partial_fit() takes papers batch
+    by batch, so memory is bounded by the batch size, the document
+    frequency table and the cluster centers, however many papers arrive
+    (papers are held back only until the first model is fitted, at most
+    min_fit plus one batch of them).
+
+    Without n_clusters, the number of clusters is chosen by silhouette
+    score once min_fit papers have been seen (or on the first predict).
+    If no k separates the papers, a fit is retried only when new papers
+    arrive, and once min_fit papers are pending FALLBACK_CLUSTERS is used.
+    """
+
+    FALLBACK_CLUSTERS = 2
+
+    def __init__(self, n_clusters: int = None, max_clusters: int = None, n_features: int = None,
+                 batch_size: int = None, min_fit: int = None, random_state: int = 42):
+        self.n_clusters = n_clusters
+        self.max_clusters = max_clusters or Config.CLUSTER_MAX_K
+        self.batch_size = batch_size or Config.CLUSTER_BATCH_SIZE
+        self.min_fit = min_fit or Config.CLUSTER_MIN_FIT
+        self.random_state = random_state
+
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features or Config.CLUSTER_FEATURES, stop_words='english',
+            ngram_range=(1, 2), alternate_sign=False, norm=None
+        )
+        self._df = np.zeros(self.vectorizer.n_features, dtype=np.int64)
+        self._documents = 0
+        self._pending: List[sparse.csr_matrix] = []
+        self._pending_tried = 0  # pending papers at the last fit that found no model
+        self.model: Optional[MiniBatchKMeans] = None
+
+    def _counts(self, records: List) -> sparse.csr_matrix:
+        counts = self.vectorizer.transform([record_text(record) for record in records])
+        counts.data = np.log1p(counts.data)
+        return counts
+
+    def _weight(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        """TF-IDF from the running document frequencies, L2-normalized"""
+        idf = np.log((1 + self._documents) / (1 + self._df)) + 1.0
+        weighted = counts.tocsr(copy=True)
+        weighted.data *= idf[weighted.indices]
+        return normalize(weighted)
+
+    def _new_model(self, k: int) -> MiniBatchKMeans:
+        return MiniBatchKMeans(n_clusters=k, batch_size=self.batch_size, n_init=3,
+                               random_state=self.random_state)
+
+    def _choose_model(self, X: sparse.csr_matrix) -> Optional[MiniBatchKMeans]:
+        """Model with the best silhouette score for k in 2..max_clusters"""
+        if self.n_clusters:
+            k = min(self.n_clusters, X.shape[0])
+            return self._new_model(k).fit(X) if k > 1 else None
+
+        best, best_score = None, -1.0
+        sample = min(X.shape[0], SILHOUETTE_SAMPLE)
+        for k in range(2, min(self.max_clusters, X.shape[0] - 1) + 1):
+            model = self._new_model(k).fit(X)
+            if len(np.unique(model.labels_)) < 2:
+                continue
+            score = silhouette_score(X, model.labels_, sample_size=sample, random_state=self.random_state)
+            if score > best_score:
+                best, best_score = model, score
+
+        if best is not None:
+            print(f"🧭 Chose {best.n_clusters} clusters (silhouette {best_score:.2f}) from {X.shape[0]} papers")
+        return best
+
+    def _fit_pending(self):
+        pending = sum(m.shape[0] for m in self._pending)
+        # Nothing new since the last fit that found no model
+        if not pending or pending == self._pending_tried:
+            return
+        X = self._weight(sparse.vstack(self._pending, format='csr'))
+        self.model = self._choose_model(X)
+        if self.model is None and pending >= max(self.min_fit, self.FALLBACK_CLUSTERS):
+            print(f"🧭 No k separates {pending} papers, using {self.FALLBACK_CLUSTERS} clusters")
+            self.model = self._new_model(self.FALLBACK_CLUSTERS).fit(X)
+
+        # Papers stay pending until a model has seen them
+        if self.model is None:
+            self._pending_tried = pending
+        else:
+            self._pending = []
+            self._pending_tried = 0
+
+    def partial_fit(self, records: Iterable) -> 'PaperClusterer':
+        """
+        Update the clustering with new papers
+
+        Args:
+            records: Paper objects, paper dictionaries or analyses
+
+        Returns:
+            self
+        """
+        for batch in _batches(records, self.batch_size):
+            counts = self._counts(batch)
+            np.add.at(self._df, counts.indices, 1)
+            self._documents += counts.shape[0]
+
+            if self.model is not None:
+                self.model.partial_fit(self._weight(counts))
+                continue
+
+            self._pending.append(counts)
+            if sum(m.shape[0] for m in self._pending) >= self.min_fit:
+                self._fit_pending()
+        return self
+
+    def predict(self, records: Iterable) -> np.ndarray:
+        """Cluster label of each record (0 for all if fewer than 3 papers were seen)"""
+        self._fit_pending()
+        labels = []
+        for batch in _batches(records, self.batch_size):
+            if self.model is None:
+                labels.append(np.zeros(len(batch), dtype=np.int32))
+            else:
+                labels.append(self.model.predict(self._weight(self._counts(batch))).astype(np.int32))
+        return np.concatenate(labels) if labels else np.zeros(0, dtype=np.int32)
+
+    @property
+    def num_clusters(self) -> int:
+        self._fit_pending()
+        return self.model.n_clusters if self.model is not None else 1
+
+
+def cluster_papers(papers, num_clusters: int = None) -> Dict[int, List]:
+    """
+    Group papers by topic
+
+    Args:
+        papers: Paper objects, paper dictionaries or analyses
+        num_clusters: Number of clusters (chosen automatically if None)
+
+    Returns:
+        Dictionary of cluster label -> papers
+    """
+    papers = list(papers)
+    clusterer = PaperClusterer(n_clusters=num_clusters).partial_fit(papers)
+    labels = clusterer.predict(papers)
 
     clusters = {}
-    for label, paper in zip(labels, papers):
+    for label, paper in zip(labels.tolist(), papers):
         clusters.setdefault(label, []).append(paper)
 
     return clusters
+
+
+if __name__ == "__main__":
+    import time
+    from tools.search.arxiv_tool import Paper
+
+    topics = {
+        "vision": "convolutional image segmentation detection pixels camera",
+        "language": "transformer language model tokens translation text",
+        "robotics": "robot control manipulation policy grasping actuator",
+        "biology": "protein gene expression cell sequencing genome",
+    }
+    rng = np.random.default_rng(0)
+
+    def make(i):
+        topic = list(topics)[i % len(topics)]
+        words = rng.choice(topics[topic].split(), 30).tolist() + rng.choice(
+            "we study method results paper approach data".split(), 10).tolist()
+        return Paper(title=f"{topic} paper {i}", authors=[], abstract=" ".join(words), pdf_url="",
+                     published="", categories=[], entry_id=str(i))
+
+    clusterer = PaperClusterer()
+    start = time.time()
+    for start_id in range(0, 5000, 500):
+        clusterer.partial_fit(make(i) for i in range(start_id, start_id + 500))
+    print(f"Fitted 5000 papers in {time.time() - start:.1f}s -> {clusterer.num_clusters} clusters")
+
+    sample = [make(i) for i in range(12)]
+    for paper, label in zip(sample, clusterer.predict(sample)):
+        print(f"  {label}: {paper.title}")
@@ -0,0 +1,278 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import os
+import atexit
+import queue
+import threading
+import time
+import multiprocessing
+from io import BytesIO
+from typing import Optional
+from pydantic import BaseModel
+from utils.config import Config
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Address space runs ahead of resident memory (shared libraries, thread
+# stacks, allocator arenas), so the hard cap sits above the RSS limit
+ADDRESS_SPACE_FACTOR = 2
+
+_limit_warned = False
+
+
+class ExtractionResult(BaseModel):
+    """Outcome of extracting text from one PDF"""
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.text is not None
+
+
+def extract_pdf_text(pdf_bytes: bytes) -> str:
+    """Extract text from PDF bytes with pdfplumber (raises on failure)"""
+    import pdfplumber
+
+    parts = []
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                parts.append(page_text + "\n")
+
+    return "".join(parts)
+
+
+def _limit_address_space(max_bytes: int) -> bool:
+    """Cap this process's address space; False if the platform can't"""
+    if resource is None or not hasattr(resource, "RLIMIT_AS"):
+        return False
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            max_bytes = min(max_bytes, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def _worker_main(conn, max_rss: Optional[int] = None):
+    """Worker loop: receive PDF bytes, send back ("ok", text) or ("error", reason)"""
+    # A hard cap catches allocation spikes between the parent's RSS polls
+    if max_rss and not _limit_address_space(max_rss * ADDRESS_SPACE_FACTOR):
+        print(f"⚠️ Extraction worker {os.getpid()} has no address-space limit")
+
+    while True:
+        try:
+            pdf_bytes = conn.recv()
+        except EOFError:
+            break
+
+        if pdf_bytes is None:
+            break
+
+        try:
+            conn.send(("ok", extract_pdf_text(pdf_bytes)))
+        except MemoryError:
+            conn.send(("error", "out of memory during extraction"))
+        except Exception as e:
+            conn.send(("error", f"extraction error: {e}"))
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size of a process (Linux only, None elsewhere)"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _memory_limit_enforceable() -> bool:
+    """Whether workers can be held to a memory limit on this platform"""
+    return (
+        _rss_bytes(os.getpid()) is not None
+        and resource is not None
+        and hasattr(resource, "RLIMIT_AS")
+    )
+
+
+class _Worker:
+    """A single extraction process and its pipe"""
+
+    def __init__(self, ctx, max_rss: Optional[int] = None):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, max_rss), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, force: bool = False):
+        if not force and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=1)
+            except (OSError, ValueError):
+                pass
+
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1)
+        self.conn.close()
+
+
+class ExtractionPool:
+    """
+    Pool of reusable worker processes for PDF text extraction
+
+    Each document gets a wall-clock timeout and an RSS limit. A worker
+    that exceeds either (or crashes) is killed and replaced, and the
+    document comes back as a failed ExtractionResult. RSS is polled from
+    /proc, so each worker also gets a hard address-space limit
+    (RLIMIT_AS, ADDRESS_SPACE_FACTOR times the RSS limit) that stops a
+    spike between polls. Where neither is available (non-Linux) the
+    limit is not enforced and a warning is printed once.
+    """
+
+    def __init__(self, workers: int = None, timeout: float = None, max_rss_mb: int = None):
+        self.workers = workers or Config.EXTRACTION_WORKERS
+        self.timeout = timeout or Config.EXTRACTION_TIMEOUT
+        max_rss_mb = max_rss_mb if max_rss_mb is not None else Config.EXTRACTION_MAX_RSS_MB
+        self.max_rss = max_rss_mb * 1024 * 1024 if max_rss_mb else None
+
+        global _limit_warned
+        if self.max_rss and not _limit_warned and not _memory_limit_enforceable():
+            _limit_warned = True
+            print("⚠️ Extraction memory limit cannot be fully enforced here (needs /proc and RLIMIT_AS)")
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = 0
+        self._closed = False
+
+    def _acquire(self) -> _Worker:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Extraction pool is closed")
+            if self._idle.empty() and self._started < self.workers:
+                self._started += 1
+                return _Worker(self._ctx, self.max_rss)
+
+        # Poll so callers waiting for a busy worker notice close()
+        while True:
+            try:
+                return self._idle.get(timeout=0.2)
+            except queue.Empty:
+                if self._closed:
+                    raise RuntimeError("Extraction pool is closed")
+
+    def _release(self, worker: _Worker):
+        # A worker that was busy when close() ran is stopped, not re-queued
+        with self._lock:
+            if not self._closed:
+                self._idle.put(worker)
+                return
+            self._started -= 1
+        worker.stop()
+
+    def _recycle(self, worker: _Worker) -> None:
+        worker.stop(force=True)
+        with self._lock:
+            if self._closed:
+                self._started -= 1
+                return
+        self._release(_Worker(self._ctx, self.max_rss))
+
+    def extract(self, pdf_bytes: bytes) -> ExtractionResult:
+        """
+        Extract text in a worker process
+
+        Args:
+            pdf_bytes: PDF file as bytes
+
+        Returns:
+            ExtractionResult with text, or error reason on failure
+        """
+        worker = self._acquire()
+
+        try:
+            worker.conn.send(pdf_bytes)
+        except (OSError, ValueError) as e:
+            self._recycle(worker)
+            return ExtractionResult(error=f"worker unavailable: {e}")
+
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            if worker.conn.poll(0.2):
+                try:
+                    status, payload = worker.conn.recv()
+                except (EOFError, OSError):
+                    self._recycle(worker)
+                    return ExtractionResult(error="worker crashed during extraction")
+
+                # Workers that grew past the limit are replaced before reuse
+                rss = _rss_bytes(worker.process.pid)
+                if self.max_rss and rss and rss > self.max_rss:
+                    self._recycle(worker)
+                else:
+                    self._release(worker)
+
+                if status == "ok":
+                    return ExtractionResult(text=payload)
+                return ExtractionResult(error=payload)
+
+            if not worker.process.is_alive():
+                code = worker.process.exitcode
+                self._recycle(worker)
+                return ExtractionResult(error=f"worker crashed (exit code {code})")
+
+            rss = _rss_bytes(worker.process.pid)
+            if self.max_rss and rss and rss > self.max_rss:
+                self._recycle(worker)
+                return ExtractionResult(
+                    error=f"memory limit exceeded ({rss // (1024 * 1024)} MB)"
+                )
+
+            if time.monotonic() > deadline:
+                self._recycle(worker)
+                return ExtractionResult(error=f"timed out after {self.timeout:g}s")
+
+    def close(self):
+        """Stop idle workers now; busy workers stop when their document finishes"""
+        with self._lock:
+            self._closed = True
+
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Shared extraction pool, created on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExtractionPool()
+            atexit.register(_pool.close)
+        return _pool
+
+
+if __name__ == "__main__":
+    pool = ExtractionPool(workers=1, timeout=10)
+    result = pool.extract(b"not a pdf")
+    print(f"OK: {result.ok}, error: {result.error}")
+    pool.close()
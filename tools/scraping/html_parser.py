@@ -0,0 +1,225 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+TEXT_LIMIT = 5000
+LINK_LIMIT = 20
+
+HtmlSource = Union[str, bytes, Iterable[Union[str, bytes]]]
+
+
+def _chunks(source: HtmlSource) -> Iterator[Union[str, bytes]]:
+    if isinstance(source, (str, bytes)):
+        yield source
+    else:
+        yield from source
+
+
+def _join(chunks: List[Union[str, bytes]]) -> Union[str, bytes]:
+    if chunks and isinstance(chunks[0], bytes):
+        return b"".join(chunks)
+    return "".join(chunks)
+
+
+def _pull(chunks: Iterator, seen: List, events: Tuple[str, ...], tags: Tuple[str, ...],
+          encoding: Optional[str]) -> Iterator[Tuple[str, object]]:
+    """
+    Incrementally parse chunks with lxml, yielding (event, element) only
+    for the given tags; stopping the iteration stops parsing (and reading)
+    """
+    parser = etree.HTMLPullParser(events=events, tag=tags, encoding=encoding)
+    for chunk in chunks:
+        seen.append(chunk)
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def _text(element, strip: bool = False) -> str:
+    if strip:
+        return "".join(part.strip() for part in element.itertext())
+    return "".join(element.itertext())
+
+
+def _classes(element) -> List[str]:
+    return (element.get('class') or "").split()
+
+
+# ----------------------------------------------------------------------
+# Web pages: <title>, <p> text and <a href> links
+# ----------------------------------------------------------------------
+
+def _parse_page_lxml(chunks: Iterator, seen: List, text_limit: int, link_limit: int,
+                     encoding: Optional[str]) -> Dict:
+    title = None
+    title_done = False
+    parts = []
+    length = 0
+    links = []
+
+    for event, element in _pull(chunks, seen, ('start', 'end'), ('title', 'body', 'p', 'a'), encoding):
+        tag = element.tag
+        if event == 'start':
+            if tag == 'a' and len(links) < link_limit and element.get('href') is not None:
+                links.append(element.get('href'))
+            elif tag == 'body':
+                title_done = True
+            continue
+
+        if tag == 'title' and title is None:
+            title = _text(element)
+            title_done = True
+        elif tag == 'p' and length < text_limit:
+            text = _text(element)
+            parts.append(text)
+            length += len(text) + 1
+            element.clear(keep_tail=True)
+
+        if title_done and length >= text_limit and len(links) >= link_limit:
+            break
+
+    return {
+        'title': title if title is not None else "No title",
+        'text': " ".join(parts),
+        'links': links
+    }
+
+
+def _parse_page_soup(html: Union[str, bytes], link_limit: int) -> Dict:
+    soup = BeautifulSoup(html, 'html.parser')
+
+    title = soup.find('title')
+    return {
+        'title': title.get_text() if title else "No title",
+        'text': " ".join(p.get_text() for p in soup.find_all('p')),
+        'links': [a['href'] for a in soup.find_all('a', href=True)][:link_limit]
+    }
+
+
+def parse_page(source: HtmlSource, text_limit: int = TEXT_LIMIT, link_limit: int = LINK_LIMIT,
+               encoding: Optional[str] = None) -> Dict:
+    """
+    Extract title, paragraph text and links from a web page
+
+    With lxml, the page is parsed incrementally and parsing (and reading
+    a streamed response) stops once text_limit characters and link_limit
+    links were found. Falls back to BeautifulSoup otherwise.
+
+    Args:
+        source: HTML as str/bytes, or an iterable of chunks
+        text_limit: Characters of paragraph text to collect
+        link_limit: Links to collect
+        encoding: Encoding of byte chunks (detected if None)
+
+    Returns:
+        Dictionary with title, text (up to text_limit characters), links
+    """
+    chunks = _chunks(source)
+    seen = []
+
+    if etree is not None:
+        try:
+            page = _parse_page_lxml(chunks, seen, text_limit, link_limit, encoding)
+            page['text'] = page['text'][:text_limit]
+            return page
+        except (etree.LxmlError, ValueError) as e:
+            print(f"⚠️ Fast HTML parser failed ({e}), using BeautifulSoup")
+
+    page = _parse_page_soup(_join(seen + list(chunks)), link_limit)
+    page['text'] = page['text'][:text_limit]
+    return page
+
+
+# ----------------------------------------------------------------------
+# DuckDuckGo HTML results: div.result > a.result__a, a.result__snippet
+# ----------------------------------------------------------------------
+
+def _parse_results_lxml(chunks: Iterator, seen: List, max_results: int,
+                        encoding: Optional[str]) -> List[Dict]:
+    results = []
+
+    for _, element in _pull(chunks, seen, ('end',), ('div',), encoding):
+        if 'result' not in _classes(element):
+            continue
+
+        title = snippet = None
+        for link in element.iter('a'):
+            classes = _classes(link)
+            if title is None and 'result__a' in classes:
+                title = link
+            elif snippet is None and 'result__snippet' in classes:
+                snippet = link
+
+        if title is not None:
+            results.append({
+                'title': _text(title, strip=True),
+                'url': title.get('href', ''),
+                'snippet': _text(snippet, strip=True) if snippet is not None else ""
+            })
+        element.clear(keep_tail=True)
+
+        if len(results) >= max_results:
+            break
+
+    return results
+
+
+def _parse_results_soup(html: Union[str, bytes], max_results: int) -> List[Dict]:
+    soup = BeautifulSoup(html, 'html.parser')
+    results = []
+
+    for div in soup.find_all('div', class_='result')[:max_results]:
+        title = div.find('a', class_='result__a')
+        snippet = div.find('a', class_='result__snippet')
+        if title:
+            results.append({
+                'title': title.get_text(strip=True),
+                'url': title.get('href', ''),
+                'snippet': snippet.get_text(strip=True) if snippet else ""
+            })
+
+    return results
+
+
+def parse_search_results(source: HtmlSource, max_results: int = 10,
+                         encoding: Optional[str] = None) -> List[Dict]:
+    """
+    Extract DuckDuckGo results (title, url, snippet) from its HTML page
+
+    With lxml, parsing stops after max_results result blocks. Falls
+    back to BeautifulSoup otherwise.
+
+    Args:
+        source: HTML as str/bytes, or an iterable of chunks
+        max_results: Number of results
+        encoding: Encoding of byte chunks (detected if None)
+
+    Returns:
+        List of result dictionaries
+    """
+    chunks = _chunks(source)
+    seen = []
+
+    if etree is not None:
+        try:
+            return _parse_results_lxml(chunks, seen, max_results, encoding)
+        except (etree.LxmlError, ValueError) as e:
+            print(f"⚠️ Fast HTML parser failed ({e}), using BeautifulSoup")
+
+    return _parse_results_soup(_join(seen + list(chunks)), max_results)
+
+
+def response_chunks(response, chunk_size: int = 16 * 1024) -> Tuple[Iterator[bytes], Optional[str]]:
+    """Byte chunks of a streamed requests response and its declared charset"""
+    declared = 'charset' in response.headers.get('Content-Type', '').lower()
+    return response.iter_content(chunk_size=chunk_size), response.encoding if declared else None
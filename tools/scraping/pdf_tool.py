@@ -4,50 +4,150 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 import requests
 import pdfplumber
+import threading
 from io import BytesIO
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, List
 import time
+from utils.config import Config
+from utils.arxiv_utils import extract_arxiv_id, arxiv_pdf_url
+from tools.scraping.extraction_pool import ExtractionResult, get_extraction_pool
+from utils.storage_manager import get_storage_manager
 
 
-def download_pdf_tool(pdf_url: str) -> Optional[bytes]:
+def _hedge_urls(pdf_url: str, max_hedges: int) -> List[str]:
+    """Primary URL followed by the URLs to use for hedged requests"""
+    alternates = []
+    arxiv_id = extract_arxiv_id(pdf_url)
+    if arxiv_id:
+        alternates = [arxiv_pdf_url(arxiv_id, host) for host in Config.PDF_MIRRORS]
+        alternates = [url for url in alternates if url != pdf_url]
+
+    # Without a mirror, hedge against the same URL (new connection)
+    while len(alternates) < max_hedges:
+        alternates.append(pdf_url)
+
+    return [pdf_url] + alternates[:max_hedges]
+
+
+def _fetch_pdf(url: str, first_byte: threading.Event, cancel: threading.Event,
+               responses: list, abort: Optional[threading.Event] = None) -> Optional[bytes]:
+    """Stream a single PDF attempt, giving up as soon as cancel (or abort) is set"""
+    response = requests.get(url, stream=True, timeout=(10, Config.PDF_TIMEOUT))
+    responses.append(response)
+
+    with response:
+        if response.status_code != 200:
+            print(f"❌ Failed: Status {response.status_code} ({url[:60]})")
+            return None
+
+        chunks = []
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            if cancel.is_set() or (abort is not None and abort.is_set()):
+                return None
+            if chunk:
+                first_byte.set()
+                chunks.append(chunk)
+
+        return b"".join(chunks)
+
+
+# How often a download checks its caller's abort event while waiting
+ABORT_POLL_SECONDS = 0.5
+
+
+def download_pdf_tool(
+    pdf_url: str,
+    hedge_delay: Optional[float] = None,
+    abort: Optional[threading.Event] = None
+) -> Optional[bytes]:
     """
-    Download PDF from URL
+    Download PDF from URL, hedging slow requests
+    
+    If the first request has not produced any bytes within hedge_delay
+    seconds (or fails outright), a second request is sent to an arXiv
+    mirror (or the same URL). The first complete response wins and the
+    remaining requests are cancelled.
     
     Args:
         pdf_url: URL to PDF file
+        hedge_delay: Seconds to wait before hedging (defaults to config,
+            0 or less disables hedging)
+        abort: Event the caller sets to give up on the download
         
     Returns:
         PDF bytes or None
     """
     print(f"📥 Downloading PDF: {pdf_url[:60]}...")
     
+    if hedge_delay is None:
+        hedge_delay = Config.PDF_HEDGE_DELAY
+    max_hedges = Config.PDF_MAX_HEDGES if hedge_delay > 0 else 0
+    urls = _hedge_urls(pdf_url, max_hedges)
+    
+    first_byte = threading.Event()
+    cancel = threading.Event()
+    responses = []
+    executor = ThreadPoolExecutor(max_workers=len(urls))
+    pending = {}
+    next_url = 0
+    last_launch = 0.0
+    
+    def launch():
+        nonlocal next_url, last_launch
+        url = urls[next_url]
+        if next_url > 0:
+            print(f"   ⏱️ Hedging download via {url[:60]}...")
+        pending[executor.submit(_fetch_pdf, url, first_byte, cancel, responses, abort)] = url
+        next_url += 1
+        last_launch = time.monotonic()
+    
     try:
-        response = requests.get(pdf_url, timeout=30)
+        launch()
         
-        if response.status_code == 200:
-            print(f"✅ Downloaded {len(response.content)} bytes")
-            return response.content
-        else:
-            print(f"❌ Failed: Status {response.status_code}")
-            return None
+        while pending:
+            can_hedge = next_url < len(urls) and not first_byte.is_set()
+            timeout = max(0.0, last_launch + hedge_delay - time.monotonic()) if can_hedge else None
+            if abort is not None:
+                timeout = ABORT_POLL_SECONDS if timeout is None else min(timeout, ABORT_POLL_SECONDS)
             
-    except Exception as e:
-        print(f"❌ Download error: {e}")
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            if abort is not None and abort.is_set():
+                print(f"   ✋ Download cancelled ({pdf_url[:60]})")
+                return None
+            
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    content = future.result()
+                except Exception as e:
+                    print(f"❌ Download error: {e} ({url[:60]})")
+                    continue
+                
+                if content:
+                    print(f"✅ Downloaded {len(content)} bytes")
+                    return content
+            
+            # Hedge when the current attempts are slow, fail over when they all failed
+            hedge_due = can_hedge and time.monotonic() - last_launch >= hedge_delay
+            if next_url < len(urls) and (not pending or hedge_due):
+                launch()
+        
         return None
+    
+    finally:
+        cancel.set()
+        for response in list(responses):
+            try:
+                response.close()
+            except Exception:
+                pass
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
-def extract_text_tool(pdf_bytes: bytes) -> Optional[str]:
-    """
-    Extract text from PDF bytes
-    
-    Args:
-        pdf_bytes: PDF file as bytes
-        
-    Returns:
-        Extracted text or None
-    """
-    print("📄 Extracting text from PDF...")
-    
+def _extract_in_process(pdf_bytes: bytes) -> ExtractionResult:
+    """Extract text in the current process (no timeout or memory cap)"""
     try:
         pdf_file = BytesIO(pdf_bytes)
         text = ""
@@ -64,12 +164,134 @@ def extract_text_tool(pdf_bytes: bytes) -> Optional[str]:
                 if i % 5 == 0:
                     print(f"  Processed {i}/{total_pages} pages...")
         
-        print(f"✅ Extracted {len(text)} characters")
-        return text
+        return ExtractionResult(text=text)
         
     except Exception as e:
-        print(f"❌ Extraction error: {e}")
+        return ExtractionResult(error=f"extraction error: {e}")
+
+
+def extract_text_result(pdf_bytes: bytes) -> ExtractionResult:
+    """
+    Extract text from PDF bytes, reporting why extraction failed
+    
+    Runs in the isolated worker pool unless EXTRACTION_WORKERS is 0.
+    
+    Args:
+        pdf_bytes: PDF file as bytes
+        
+    Returns:
+        ExtractionResult with text or error reason
+    """
+    print("📄 Extracting text from PDF...")
+    
+    if Config.EXTRACTION_WORKERS > 0:
+        result = get_extraction_pool().extract(pdf_bytes)
+    else:
+        result = _extract_in_process(pdf_bytes)
+    
+    if result.ok:
+        print(f"✅ Extracted {len(result.text)} characters")
+    else:
+        print(f"❌ Extraction failed: {result.error}")
+    
+    return result
+
+
+def extract_text_tool(pdf_bytes: bytes) -> Optional[str]:
+    """
+    Extract text from PDF bytes
+    
+    Args:
+        pdf_bytes: PDF file as bytes
+        
+    Returns:
+        Extracted text or None
+    """
+    return extract_text_result(pdf_bytes).text
+
+
+def _stored_paper_id(pdf_url: str) -> Optional[str]:
+    return extract_arxiv_id(pdf_url) if Config.STORAGE_ENABLED else None
+
+
+def load_stored_text(pdf_url: str) -> Optional[str]:
+    """Extracted text for an arXiv paper already in local storage"""
+    arxiv_id = _stored_paper_id(pdf_url)
+    if not arxiv_id:
         return None
+    
+    text = get_storage_manager().load_text(arxiv_id)
+    if text:
+        print(f"💾 Loaded {len(text)} characters from storage ({arxiv_id})")
+    return text
+
+
+def fetch_pdf_bytes(pdf_url: str, abort: Optional[threading.Event] = None) -> Optional[bytes]:
+    """
+    I/O stage: stored PDF if available, otherwise download (and store) it
+    
+    Args:
+        pdf_url: URL to PDF
+        abort: Event the caller sets to give up on the download
+        
+    Returns:
+        PDF bytes or None
+    """
+    arxiv_id = _stored_paper_id(pdf_url)
+    storage = get_storage_manager() if arxiv_id else None
+    
+    pdf_bytes = storage.load_pdf(arxiv_id) if storage else None
+    if pdf_bytes:
+        return pdf_bytes
+    
+    pdf_bytes = download_pdf_tool(pdf_url, abort=abort)
+    if pdf_bytes and storage and Config.STORAGE_KEEP_PDFS:
+        storage.save_pdf(arxiv_id, pdf_bytes)
+    return pdf_bytes
+
+
+def extract_and_store(pdf_url: str, pdf_bytes: bytes) -> ExtractionResult:
+    """
+    CPU stage: extract text and keep it in local storage
+    
+    Args:
+        pdf_url: URL the PDF came from (used for the storage key)
+        pdf_bytes: PDF file as bytes
+        
+    Returns:
+        ExtractionResult with text or error reason
+    """
+    result = extract_text_result(pdf_bytes)
+    
+    arxiv_id = _stored_paper_id(pdf_url)
+    if arxiv_id and result.ok:
+        get_storage_manager().save_text(arxiv_id, result.text)
+    
+    return result
+
+
+def process_pdf_url_result(pdf_url: str) -> ExtractionResult:
+    """
+    Complete pipeline: download + extract, keeping the failure reason
+    
+    arXiv papers already in local storage are served from there; newly
+    downloaded PDFs and extracted text are stored for later runs.
+    
+    Args:
+        pdf_url: URL to PDF
+        
+    Returns:
+        ExtractionResult with text or error reason
+    """
+    text = load_stored_text(pdf_url)
+    if text:
+        return ExtractionResult(text=text)
+    
+    pdf_bytes = fetch_pdf_bytes(pdf_url)
+    if not pdf_bytes:
+        return ExtractionResult(error="download failed")
+    
+    return extract_and_store(pdf_url, pdf_bytes)
 
 
 def process_pdf_url(pdf_url: str) -> Optional[str]:
@@ -82,10 +304,7 @@ def process_pdf_url(pdf_url: str) -> Optional[str]:
     Returns:
         Extracted text
     """
-    pdf_bytes = download_pdf_tool(pdf_url)
-    if pdf_bytes:
-        return extract_text_tool(pdf_bytes)
-    return None
+    return process_pdf_url_result(pdf_url).text
 
 
 if __name__ == "__main__":
@@ -3,10 +3,13 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 import requests
-from bs4 import BeautifulSoup
 from typing import Optional, Dict
+from utils.config import Config
+from utils.cache import cached
+from tools.scraping.html_parser import parse_page, response_chunks
 
 
+@cached("web", ttl=Config.CACHE_TTL_WEB, normalize=False)
 def scrape_webpage(url: str) -> Optional[Dict[str, str]]:
     """
     Scrape webpage content
@@ -24,25 +27,19 @@ def scrape_webpage(url: str) -> Optional[Dict[str, str]]:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=15)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        title = soup.find('title')
-        title_text = title.get_text() if title else "No title"
-        
-        paragraphs = soup.find_all('p')
-        text = ' '.join([p.get_text() for p in paragraphs])
-        
-        links = [a['href'] for a in soup.find_all('a', href=True)][:20]
+        # Streamed so the download stops once enough text and links were parsed
+        with requests.get(url, headers=headers, timeout=15, stream=True) as response:
+            chunks, encoding = response_chunks(response)
+            page = parse_page(chunks, encoding=encoding)
         
         result = {
-            'title': title_text,
-            'text': text[:5000],
-            'links': links,
+            'title': page['title'],
+            'text': page['text'],
+            'links': page['links'],
             'url': url
         }
         
-        print(f"✅ Scraped {len(text)} characters")
+        print(f"✅ Scraped {len(result['text'])} characters")
         return result
         
     except Exception as e:
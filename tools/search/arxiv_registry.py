@@ -0,0 +1,555 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import gzip
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Iterator, Iterable, Optional
+from tools.search.arxiv_tool import Paper
+from utils.config import Config
+from utils.arxiv_utils import arxiv_pdf_url, normalize_title, split_arxiv_version
+
+
+BATCH_SIZE = 5000
+AUTHOR_SEPARATOR = "\x1f"
+
+
+def _open_dump(path: Path):
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def _published_date(value: str) -> str:
+    """ISO date from an RFC 2822 ('Mon, 2 Apr 2007 ...') or ISO timestamp"""
+    if not value:
+        return ""
+    try:
+        return parsedate_to_datetime(value).date().isoformat()
+    except (TypeError, ValueError):
+        return value[:10]
+
+
+def _split_authors(authors: str) -> List[str]:
+    authors = re.sub(r'\s+', ' ', authors.replace('\n', ' '))
+    return [a.strip() for a in re.split(r',\s*|\s+and\s+', authors) if a.strip()]
+
+
+def parse_json_lines(path: Path) -> Iterator[Dict]:
+    """
+    Records from an arXiv metadata snapshot in JSON lines format
+    (one object per line with id, title, authors, categories, abstract, versions)
+    """
+    with _open_dump(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            record = json.loads(line)
+            versions = record.get('versions') or []
+
+            if record.get('authors_parsed'):
+                authors = [
+                    " ".join(part for part in (parts[1], parts[0]) if part).strip()
+                    for parts in record['authors_parsed'] if parts
+                ]
+            else:
+                authors = _split_authors(record.get('authors', ''))
+
+            yield {
+                'arxiv_id': record['id'],
+                'version': versions[-1]['version'] if versions else "",
+                'title': " ".join(record.get('title', '').split()),
+                'authors': authors,
+                'categories': record.get('categories', '').split(),
+                'published': _published_date(versions[0].get('created', '')) if versions
+                else record.get('update_date', ''),
+                'abstract': " ".join(record.get('abstract', '').split())
+            }
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _record_from_xml(record: ET.Element) -> Optional[Dict]:
+    """Fields from an OAI-PMH record in arXiv, arXivRaw or oai_dc format"""
+    fields = {'authors': [], 'categories': [], 'versions': []}
+
+    for elem in record.iter():
+        tag = _local(elem.tag)
+        text = " ".join((elem.text or "").split())
+
+        if tag == 'identifier' and text.startswith('oai:arXiv.org:'):
+            fields.setdefault('arxiv_id', text.split(':', 2)[-1])
+        elif tag == 'id' and text:
+            fields['arxiv_id'] = text
+        elif tag == 'title' and text:
+            fields['title'] = text
+        elif tag in ('abstract', 'description') and text:
+            fields.setdefault('abstract', text)
+        elif tag == 'created' and text:
+            fields.setdefault('published', text)
+        elif tag == 'date' and text:
+            fields.setdefault('published', text)
+        elif tag == 'categories' and text:
+            fields['categories'] = text.split()
+        elif tag == 'setSpec' and text and not fields['categories']:
+            fields.setdefault('sets', []).append(text)
+        elif tag == 'version' and elem.get('version'):
+            fields['versions'].append(elem.get('version'))
+            if not fields.get('published'):
+                fields['published'] = elem.findtext('{*}date') or ""
+        elif tag == 'author':
+            keyname = elem.findtext('{*}keyname') or ""
+            forenames = elem.findtext('{*}forenames') or ""
+            name = " ".join(f"{forenames} {keyname}".split())
+            if name:
+                fields['authors'].append(name)
+        elif tag == 'creator' and text:
+            # oai_dc uses "Last, First"
+            last, _, first = text.partition(', ')
+            fields['authors'].append(f"{first} {last}".strip())
+        elif tag == 'authors' and text and not len(elem):
+            fields['authors'].extend(_split_authors(text))
+
+    if not fields.get('arxiv_id') or not fields.get('title'):
+        return None
+
+    return {
+        'arxiv_id': fields['arxiv_id'],
+        'version': fields['versions'][-1] if fields['versions'] else "",
+        'title': fields['title'],
+        'authors': fields['authors'],
+        'categories': fields['categories'] or fields.get('sets', []),
+        'published': _published_date(fields.get('published', '')),
+        'abstract': fields.get('abstract', '')
+    }
+
+
+def parse_oai_xml(path: Path) -> Iterator[Dict]:
+    """Records from an OAI-PMH XML response/dump, parsed incrementally"""
+    with _open_dump(path) as f:
+        # Open elements; a record's parent (<ListRecords>) is the one below it
+        open_elems = []
+
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                open_elems.append(elem)
+                continue
+            open_elems.pop()
+            if _local(elem.tag) != 'record':
+                continue
+
+            record = _record_from_xml(elem)
+            if record:
+                yield record
+
+            # Detach finished records so memory stays bounded on multi-GB dumps
+            if open_elems:
+                open_elems[-1].remove(elem)
+            else:
+                elem.clear()
+
+
+def parse_dump(path: Path) -> Iterator[Dict]:
+    """Pick the parser from the file name (.jsonl/.json or .xml, optionally .gz)"""
+    name = path.name.lower().removesuffix('.gz')
+    if name.endswith('.xml'):
+        return parse_oai_xml(path)
+    return parse_json_lines(path)
+
+
+def _version_number(version: str) -> int:
+    return int(version[1:]) if version[1:].isdigit() else 0
+
+
+def _normalize_author(name: str) -> str:
+    return normalize_title(name)
+
+
+class ArxivRegistry:
+    """
+    Local registry of arXiv paper metadata
+
+    Stores one row per paper (latest version) in SQLite with abstracts
+    zlib-compressed, indexed by arXiv id, normalized title, author and
+    category. A contentless FTS5 table answers free-text queries without
+    storing the text twice.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = Path(path or Config.ARXIV_REGISTRY_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS papers (
+                id INTEGER PRIMARY KEY,
+                arxiv_id TEXT NOT NULL UNIQUE,
+                version TEXT NOT NULL,
+                title TEXT NOT NULL,
+                norm_title TEXT NOT NULL,
+                authors TEXT NOT NULL,
+                categories TEXT NOT NULL,
+                published TEXT NOT NULL,
+                abstract BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS papers_norm_title ON papers (norm_title);
+            CREATE TABLE IF NOT EXISTS paper_authors (
+                name TEXT NOT NULL,
+                paper_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS paper_authors_name ON paper_authors (name, paper_id);
+            CREATE INDEX IF NOT EXISTS paper_authors_paper ON paper_authors (paper_id);
+            CREATE TABLE IF NOT EXISTS paper_categories (
+                category TEXT NOT NULL,
+                paper_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS paper_categories_category ON paper_categories (category, paper_id);
+            CREATE INDEX IF NOT EXISTS paper_categories_paper ON paper_categories (paper_id);
+        """)
+
+        try:
+            self._db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(title, abstract, content='')"
+            )
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        self._db.commit()
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def ingest(self, records: Iterable[Dict], batch_size: int = BATCH_SIZE) -> int:
+        """
+        Insert or update records in batches (memory stays bounded)
+
+        Returns:
+            Number of records ingested
+        """
+        count = 0
+        batch = []
+
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                count += self._ingest_batch(batch)
+                batch = []
+                print(f"  📥 Ingested {count} records...")
+
+        if batch:
+            count += self._ingest_batch(batch)
+
+        return count
+
+    def ingest_file(self, path: str) -> int:
+        print(f"📂 Ingesting {path}")
+        start = time.time()
+        count = self.ingest(parse_dump(Path(path)))
+        print(f"✅ Ingested {count} records in {time.time() - start:.1f}s")
+        return count
+
+    def _ingest_batch(self, batch: List[Dict]) -> int:
+        with self._lock:
+            db = self._db
+            ids = [split_arxiv_version(r['arxiv_id'])[0] for r in batch]
+            existing = {}
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = db.execute(
+                    f"SELECT arxiv_id, id, version, title, abstract FROM papers "
+                    f"WHERE arxiv_id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                existing.update({row[0]: row[1:] for row in rows})
+
+            for arxiv_id, record in zip(ids, batch):
+                _, id_version = split_arxiv_version(record['arxiv_id'])
+                version = record['version'] or (f"v{id_version}" if id_version else "")
+                abstract = zlib.compress(record['abstract'].encode('utf-8'))
+                values = (
+                    version, record['title'], normalize_title(record['title']),
+                    AUTHOR_SEPARATOR.join(record['authors']), " ".join(record['categories']),
+                    record['published'], abstract
+                )
+
+                old = existing.get(arxiv_id)
+                if old:
+                    paper_id, old_version, old_title, old_abstract = old
+                    if _version_number(old_version) > _version_number(version):
+                        continue
+                    db.execute(
+                        "UPDATE papers SET version = ?, title = ?, norm_title = ?, authors = ?, "
+                        "categories = ?, published = ?, abstract = ? WHERE id = ?",
+                        values + (paper_id,)
+                    )
+                    db.execute("DELETE FROM paper_authors WHERE paper_id = ?", (paper_id,))
+                    db.execute("DELETE FROM paper_categories WHERE paper_id = ?", (paper_id,))
+                    if self.has_fts:
+                        db.execute(
+                            "INSERT INTO papers_fts (papers_fts, rowid, title, abstract) "
+                            "VALUES ('delete', ?, ?, ?)",
+                            (paper_id, old_title, zlib.decompress(old_abstract).decode('utf-8'))
+                        )
+                else:
+                    paper_id = db.execute(
+                        "INSERT INTO papers (arxiv_id, version, title, norm_title, authors, "
+                        "categories, published, abstract) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (arxiv_id,) + values
+                    ).lastrowid
+                existing[arxiv_id] = (paper_id, version, record['title'], abstract)
+
+                # Full name and surname, so "hinton" and "geoffrey hinton" both match
+                names = set()
+                for author in record['authors']:
+                    name = _normalize_author(author)
+                    if name:
+                        names.add(name)
+                        names.add(name.split()[-1])
+                db.executemany(
+                    "INSERT INTO paper_authors VALUES (?, ?)", [(n, paper_id) for n in names]
+                )
+                db.executemany(
+                    "INSERT INTO paper_categories VALUES (?, ?)",
+                    [(c, paper_id) for c in set(record['categories'])]
+                )
+                if self.has_fts:
+                    db.execute(
+                        "INSERT INTO papers_fts (rowid, title, abstract) VALUES (?, ?, ?)",
+                        (paper_id, record['title'], record['abstract'])
+                    )
+
+            db.commit()
+
+        return len(batch)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    _COLUMNS = "p.arxiv_id, p.version, p.title, p.authors, p.categories, p.published, p.abstract"
+
+    def _to_paper(self, row) -> Paper:
+        arxiv_id, version, title, authors, categories, published, abstract = row
+        versioned_id = f"{arxiv_id}{version}"
+        return Paper(
+            title=title,
+            authors=authors.split(AUTHOR_SEPARATOR) if authors else [],
+            abstract=zlib.decompress(abstract).decode('utf-8'),
+            pdf_url=arxiv_pdf_url(versioned_id),
+            published=published,
+            categories=categories.split(),
+            entry_id=f"http://arxiv.org/abs/{versioned_id}"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def get(self, arxiv_id: str) -> Optional[Paper]:
+        """Look up a paper by arXiv id (any version)"""
+        base_id, _ = split_arxiv_version(arxiv_id)
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {self._COLUMNS} FROM papers p WHERE p.arxiv_id = ?", (base_id,)
+            ).fetchone()
+        return self._to_paper(row) if row else None
+
+    def search(
+        self,
+        title_prefix: str = None,
+        author: str = None,
+        category: str = None,
+        limit: int = 50
+    ) -> List[Paper]:
+        """
+        Filter papers by title prefix, author (full name or surname prefix)
+        and category (exact, or prefix when ending in "." or "*")
+
+        Returns:
+            List of Paper objects, newest first
+        """
+        joins, where, params = [], [], []
+
+        if title_prefix:
+            prefix = normalize_title(title_prefix)
+            where.append("p.norm_title >= ? AND p.norm_title < ?")
+            params += [prefix, prefix + "\uffff"]
+
+        if author:
+            name = _normalize_author(author)
+            joins.append("JOIN paper_authors a ON a.paper_id = p.id")
+            where.append("a.name >= ? AND a.name < ?")
+            params += [name, name + "\uffff"]
+
+        if category:
+            joins.append("JOIN paper_categories c ON c.paper_id = p.id")
+            if category.endswith(('.', '*')):
+                prefix = category.rstrip('*')
+                where.append("c.category >= ? AND c.category < ?")
+                params += [prefix, prefix + "\uffff"]
+            else:
+                where.append("c.category = ?")
+                params.append(category)
+
+        sql = f"SELECT DISTINCT {self._COLUMNS} FROM papers p {' '.join(joins)}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY p.published DESC LIMIT ?"
+
+        with self._lock:
+            rows = self._db.execute(sql, params + [limit]).fetchall()
+        return [self._to_paper(row) for row in rows]
+
+    def search_text(self, query: str, max_results: int = 50, category: str = None) -> List[Paper]:
+        """
+        Free-text search over titles and abstracts, best match first
+
+        All query terms must match; if nothing does, any term may match.
+        Without FTS5 in this SQLite build, terms are matched as whole words
+        of the titles only (abstracts are compressed), newest first, with a
+        scan of the papers table.
+        """
+        terms = re.findall(r'\w+', query.lower())
+        if not terms:
+            return []
+
+        if not self.has_fts:
+            return self._search_title_words(normalize_title(query).split(), max_results, category)
+
+        category_filter = ""
+        params_tail = []
+        if category:
+            category_filter = "AND p.id IN (SELECT paper_id FROM paper_categories WHERE category = ?)"
+            params_tail = [category]
+
+        for operator in (" AND ", " OR "):
+            match = operator.join(f'"{term}"' for term in terms)
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT {self._COLUMNS} FROM papers_fts f JOIN papers p ON p.id = f.rowid "
+                    f"WHERE papers_fts MATCH ? {category_filter} ORDER BY f.rank LIMIT ?",
+                    [match] + params_tail + [max_results]
+                ).fetchall()
+            if rows:
+                return [self._to_paper(row) for row in rows]
+
+        return []
+
+    def _search_title_words(self, words: List[str], max_results: int, category: str = None) -> List[Paper]:
+        """Papers whose normalized title contains all (else any) of the words"""
+        if not words:
+            return []
+
+        category_filter = ""
+        params_tail = []
+        if category:
+            category_filter = "AND p.id IN (SELECT paper_id FROM paper_categories WHERE category = ?)"
+            params_tail = [category]
+
+        # Normalized titles are lowercase words joined by single spaces
+        condition = "(' ' || p.norm_title || ' ') LIKE ?"
+        patterns = [f"% {word} %" for word in words]
+        for operator in (" AND ", " OR "):
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT {self._COLUMNS} FROM papers p "
+                    f"WHERE ({operator.join([condition] * len(words))}) {category_filter} "
+                    f"ORDER BY p.published DESC LIMIT ?",
+                    patterns + params_tail + [max_results]
+                ).fetchall()
+            if rows:
+                return [self._to_paper(row) for row in rows]
+
+        return []
+
+    def close(self):
+        self._db.close()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_arxiv_registry() -> Optional[ArxivRegistry]:
+    """Shared registry, or None if nothing has been ingested yet"""
+    global _registry
+    with _registry_lock:
+        if _registry is None and Path(Config.ARXIV_REGISTRY_PATH).exists():
+            _registry = ArxivRegistry()
+        return _registry
+
+
+def registry_search(query: str, max_results: int = 50) -> List[Paper]:
+    """
+    Answer an arxiv_search-style query from the local registry
+
+    Args:
+        query: Search query
+        max_results: Maximum number of papers to return
+
+    Returns:
+        List of Paper objects (empty if no registry has been ingested)
+    """
+    registry = get_arxiv_registry()
+    if registry is None:
+        return []
+
+    print(f"🗂️ Searching local arXiv registry: '{query}'")
+    papers = registry.search_text(query, max_results=max_results)
+    print(f"✅ Found {len(papers)} registry papers")
+    return papers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local arXiv metadata registry")
+    parser.add_argument("--db", help="Registry database (default: storage/registry/arxiv.sqlite3)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser("ingest", help="Ingest JSON lines or OAI XML dumps")
+    ingest_parser.add_argument("files", nargs="+")
+    commands.add_parser("stats", help="Show registry size")
+    search_parser = commands.add_parser("search", help="Search the registry")
+    search_parser.add_argument("query", nargs="?", default="")
+    search_parser.add_argument("--title")
+    search_parser.add_argument("--author")
+    search_parser.add_argument("--category")
+    search_parser.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args(argv)
+    registry = ArxivRegistry(args.db)
+
+    if args.command == "ingest":
+        for path in args.files:
+            registry.ingest_file(path)
+
+    elif args.command == "search":
+        start = time.time()
+        if args.query:
+            papers = registry.search_text(args.query, args.limit, category=args.category)
+        else:
+            papers = registry.search(args.title, args.author, args.category, args.limit)
+        print(f"Found {len(papers)} papers in {(time.time() - start) * 1000:.1f} ms")
+        for paper in papers:
+            print(f"- [{paper.entry_id.rsplit('/', 1)[-1]}] {paper.title[:80]} ({paper.published})")
+
+    print(f"🗂️ Registry: {len(registry)} papers ({registry.path})")
+    registry.close()
+
+
+if __name__ == "__main__":
+    main()
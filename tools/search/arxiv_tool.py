@@ -3,12 +3,17 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 import arxiv
-from typing import List
-from pydantic import BaseModel, Field
+import queue
+import threading
+from typing import List, Iterator, Iterable, Optional
+from dataclasses import dataclass, field
+from utils.config import Config
+from utils.cache import get_discovery_cache, normalize_query
 
 
-class Paper(BaseModel):
-    """Research paper metadata"""
+@dataclass(slots=True)
+class Paper:
+    """Research paper metadata (validated as PaperSchema on export)"""
     title: str
     authors: List[str]
     abstract: str
@@ -16,51 +21,174 @@ class Paper(BaseModel):
     published: str
     categories: List[str]
     entry_id: str
+    sources: List[str] = field(default_factory=list)
 
 
-def arxiv_search(query: str, max_results: int = 50) -> List[Paper]:
+def _to_paper(result: arxiv.Result) -> Paper:
+    return Paper(
+        title=result.title,
+        authors=[str(author) for author in result.authors],
+        abstract=result.summary,
+        pdf_url=result.pdf_url,
+        published=str(result.published.date()),
+        categories=result.categories,
+        entry_id=result.entry_id
+    )
+
+
+def arxiv_search_iter(
+    query: str,
+    max_results: int = 50,
+    page_size: Optional[int] = None,
+    delay_seconds: Optional[float] = None
+) -> Iterator[Paper]:
     """
-    Search ArXiv for research papers
+    Search ArXiv, yielding papers as each result page is parsed
     
     Args:
         query: Search query (e.g., "machine learning healthcare")
         max_results: Maximum number of papers to return
+        page_size: Results per API page (defaults to config)
+        delay_seconds: Delay between API pages (defaults to config)
         
-    Returns:
-        List of Paper objects with metadata
+    Yields:
+        Paper objects with metadata
     """
     print(f"🔍 Searching ArXiv for: '{query}'")
     print(f"📊 Max results: {max_results}")
     
-    try:
-        search = arxiv.Search(
-            query=query,
-            max_results=max_results,
-            sort_by=arxiv.SortCriterion.Relevance
+    # Shares cache entries with arxiv_search
+    cache = get_discovery_cache() if Config.CACHE_ENABLED else None
+    key = None
+    if cache:
+        key = cache.make_key("arxiv", normalize_query(query), {'max_results': max_results})
+        papers = cache.lookup(
+            key, "arxiv", Config.CACHE_TTL_ARXIV,
+            lambda: list(_arxiv_results(query, max_results, page_size, delay_seconds)),
+            label=query
         )
-        
-        papers = []
-        for i, result in enumerate(search.results(), 1):
-            paper = Paper(
-                title=result.title,
-                authors=[str(author) for author in result.authors],
-                abstract=result.summary,
-                pdf_url=result.pdf_url,
-                published=str(result.published.date()),
-                categories=result.categories,
-                entry_id=result.entry_id
-            )
+        if papers is not None:
+            yield from papers
+            return
+    
+    papers = []
+    try:
+        for i, paper in enumerate(_arxiv_results(query, max_results, page_size, delay_seconds), 1):
             papers.append(paper)
+            yield paper
             
             if i % 10 == 0:
                 print(f"  📄 Found {i} papers...")
         
-        print(f"✅ Found {len(papers)} papers total")
-        return papers
-        
     except Exception as e:
         print(f"❌ ArXiv search error: {e}")
-        return []
+        return
+    
+    print(f"✅ Found {len(papers)} papers total")
+    if cache and papers:
+        cache.set(key, "arxiv", papers)
+
+
+def _arxiv_results(query: str, max_results: int, page_size: Optional[int],
+                   delay_seconds: Optional[float]) -> Iterator[Paper]:
+    client = arxiv.Client(
+        page_size=min(page_size or Config.ARXIV_PAGE_SIZE, max_results),
+        delay_seconds=Config.ARXIV_DELAY_SECONDS if delay_seconds is None else delay_seconds
+    )
+    search = arxiv.Search(
+        query=query,
+        max_results=max_results,
+        sort_by=arxiv.SortCriterion.Relevance
+    )
+    
+    for result in client.results(search):
+        yield _to_paper(result)
+
+
+def arxiv_search(query: str, max_results: int = 50) -> List[Paper]:
+    """
+    Search ArXiv for research papers
+    
+    Args:
+        query: Search query (e.g., "machine learning healthcare")
+        max_results: Maximum number of papers to return
+        
+    Returns:
+        List of Paper objects with metadata
+    """
+    return list(arxiv_search_iter(query, max_results=max_results))
+
+
+class PaperStream:
+    """
+    Papers from a search iterator, prefetched in a background thread
+    
+    Later result pages keep loading while consumers work through the
+    first papers, at most `prefetch` papers (one result page by default)
+    ahead of the furthest consumer. The stream can be iterated more than
+    once; papers received so far are replayed before waiting for new
+    ones. stop() ends the search early, e.g. once enough papers were
+    scraped, so pages nobody reached are never requested.
+    """
+    
+    _DONE = object()
+    
+    def __init__(self, papers: Iterable[Paper], prefetch: Optional[int] = None):
+        self._papers = []
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._stopped = threading.Event()
+        self._slots = threading.Semaphore(prefetch or Config.ARXIV_PAGE_SIZE)
+        self._thread = threading.Thread(target=self._produce, args=(iter(papers),), daemon=True)
+        self._thread.start()
+    
+    def _produce(self, papers: Iterator[Paper]):
+        try:
+            while True:
+                # Fetching the next paper may request the next page
+                self._slots.acquire()
+                if self._stopped.is_set():
+                    break
+                paper = next(papers, self._DONE)
+                if paper is self._DONE:
+                    break
+                self._queue.put(paper)
+        finally:
+            self._queue.put(self._DONE)
+    
+    def _pull(self) -> bool:
+        """Move the next paper from the producer into the buffer"""
+        item = self._queue.get()
+        if item is self._DONE:
+            self._finished.set()
+            self._queue.put(self._DONE)
+            return False
+        self._papers.append(item)
+        self._slots.release()
+        return True
+    
+    def __iter__(self) -> Iterator[Paper]:
+        index = 0
+        while True:
+            with self._lock:
+                if index >= len(self._papers):
+                    if self._finished.is_set() or not self._pull():
+                        return
+                paper = self._papers[index]
+            index += 1
+            yield paper
+    
+    def stop(self):
+        """Request no further papers; ones already fetched are kept"""
+        self._stopped.set()
+        self._slots.release()
+    
+    def wait(self) -> List[Paper]:
+        """Block until the search finishes (or stops) and return all papers"""
+        for _ in self:
+            pass
+        return list(self._papers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import hashlib
+from dataclasses import replace
+from urllib.parse import unquote
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+from tools.search.arxiv_tool import Paper
+from utils.arxiv_utils import extract_arxiv_id, split_arxiv_version, normalize_title
+
+
+# Titles shorter than this are too generic to merge on ("Introduction")
+MIN_TITLE_TOKENS = 3
+
+
+def title_key(title: str) -> Optional[str]:
+    """Hash of the normalized title, or None for very short titles"""
+    normalized = normalize_title(title or "")
+    if len(normalized.split()) < MIN_TITLE_TOKENS:
+        return None
+    return "title:" + hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def arxiv_key(*urls: str) -> Tuple[Optional[str], int]:
+    """("arxiv:<id without version>", version) from the first URL with an arXiv id"""
+    for url in urls:
+        arxiv_id = extract_arxiv_id(url or "")
+        if arxiv_id:
+            base, version = split_arxiv_version(arxiv_id)
+            return f"arxiv:{base}", version
+    return None, 0
+
+
+class _Group:
+    __slots__ = ('paper', 'version', 'emitted')
+
+    def __init__(self, paper: Paper, version: int):
+        self.paper = paper
+        self.version = version
+        self.emitted = False
+
+
+class PaperMerger:
+    """
+    Incrementally groups papers that refer to the same work
+
+    Papers match on arXiv id (ignoring the version) or on a hash of the
+    normalized title. Each group keeps the latest arXiv version's
+    metadata and the union of sources and categories.
+    """
+
+    def __init__(self):
+        self._groups: List[_Group] = []
+        self._aliases: Dict[str, _Group] = {}
+        self.seen = 0
+
+    def _keys(self, paper: Paper) -> Tuple[Optional[str], int, Optional[str]]:
+        id_key, version = arxiv_key(paper.entry_id, paper.pdf_url)
+        return id_key, version, title_key(paper.title)
+
+    def add(self, paper: Paper, source: str) -> _Group:
+        """Add a paper, returning the group it was merged into"""
+        self.seen += 1
+        id_key, version, t_key = self._keys(paper)
+        sources = list(dict.fromkeys(paper.sources + [source]))
+
+        group = self._aliases.get(id_key) if id_key else None
+        if group is None and t_key:
+            group = self._aliases.get(t_key)
+
+        if group is None:
+            group = _Group(replace(paper, sources=sources), version)
+            self._groups.append(group)
+        else:
+            self._merge(group, paper, version, sources)
+
+        for key in (id_key, t_key):
+            if key:
+                self._aliases.setdefault(key, group)
+        return group
+
+    def _merge(self, group: _Group, paper: Paper, version: int, sources: List[str]):
+        current = group.paper
+        update = {
+            'sources': list(dict.fromkeys(current.sources + sources)),
+            'categories': list(dict.fromkeys(current.categories + paper.categories))
+        }
+
+        # A newer version replaces the record, unless it is already being scraped
+        if version > group.version and not group.emitted:
+            group.version = version
+            update.update(
+                title=paper.title,
+                abstract=paper.abstract or current.abstract,
+                pdf_url=paper.pdf_url or current.pdf_url,
+                published=paper.published or current.published,
+                entry_id=paper.entry_id or current.entry_id,
+                authors=paper.authors or current.authors
+            )
+        else:
+            if not current.abstract and paper.abstract:
+                update['abstract'] = paper.abstract
+            if not current.authors and paper.authors:
+                update['authors'] = paper.authors
+
+        if group.emitted:
+            # Already handed to consumers: update provenance in place
+            current.sources = update['sources']
+            current.categories = update['categories']
+        else:
+            group.paper = replace(current, **update)
+
+    def groups(self) -> List[_Group]:
+        return list(self._groups)
+
+
+def deduplicate_papers(
+    primary: Iterable[Paper],
+    extra: Optional[Dict[str, Iterable[Paper]]] = None,
+    primary_source: str = "arxiv"
+) -> Iterator[Paper]:
+    """
+    Merge papers from several sources into one duplicate-free stream
+
+    Papers from `extra` (e.g. local index, registry) are grouped first;
+    primary papers are yielded as they arrive, merged with any matching
+    extra papers, and remaining extra papers are yielded at the end.
+
+    Args:
+        primary: Papers from the main source (may be a lazy stream)
+        extra: Other sources' papers by source name
+        primary_source: Source name recorded for primary papers
+
+    Yields:
+        Unique papers with provenance in `sources`
+    """
+    merger = PaperMerger()
+    for source, papers in (extra or {}).items():
+        for paper in papers:
+            merger.add(paper, source)
+
+    unique = 0
+    for paper in primary:
+        group = merger.add(paper, primary_source)
+        if not group.emitted:
+            group.emitted = True
+            unique += 1
+            yield group.paper
+
+    for group in merger.groups():
+        if not group.emitted:
+            group.emitted = True
+            unique += 1
+            yield group.paper
+
+    if merger.seen > unique:
+        print(f"🧹 Merged {merger.seen - unique} duplicate results ({unique} unique papers)")
+
+
+def attach_mentions(papers: List[Paper], results: List, source: str) -> List:
+    """
+    Record non-scrapable results (Scholar, web) that refer to known papers
+
+    Matching results are added to the paper's provenance and dropped.
+
+    Args:
+        papers: Deduplicated papers
+        results: ScholarPaper / SearchResult objects (with title and url)
+        source: Source name, e.g. "scholar"
+
+    Returns:
+        Results that did not match any paper
+    """
+    aliases = {}
+    for paper in papers:
+        id_key, _ = arxiv_key(paper.entry_id, paper.pdf_url)
+        for key in (id_key, title_key(paper.title)):
+            if key:
+                aliases.setdefault(key, paper)
+
+    remaining = []
+    for result in results:
+        # DuckDuckGo wraps target URLs in an encoded redirect
+        id_key, _ = arxiv_key(unquote(getattr(result, 'url', '')))
+        paper = aliases.get(id_key) or aliases.get(title_key(result.title))
+        if paper is None:
+            remaining.append(result)
+        elif source not in paper.sources:
+            paper.sources.append(source)
+
+    return remaining
+
+
+if __name__ == "__main__":
+    def make(title, entry_id, abstract=""):
+        return Paper(title=title, authors=["A. Author"], abstract=abstract, pdf_url=entry_id.replace("abs", "pdf"),
+                     published="2024-01-01", categories=["cs.LG"], entry_id=entry_id)
+
+    arxiv_papers = [
+        make("Attention Is All You Need", "http://arxiv.org/abs/1706.03762v7", "Transformers."),
+        make("Attention is all you need!", "http://arxiv.org/abs/1706.03762v7"),
+        make("Graph Neural Networks: A Review", "http://arxiv.org/abs/1812.08434v4"),
+    ]
+    local_papers = [make("Attention Is All You Need", "http://arxiv.org/abs/1706.03762v5")]
+    registry_papers = [make("Deep Residual Learning for Image Recognition", "http://arxiv.org/abs/1512.03385v1")]
+
+    for paper in deduplicate_papers(arxiv_papers, {'local': local_papers, 'registry': registry_papers}):
+        print(f"{paper.entry_id:45s} {paper.sources}  {paper.title}")
@@ -3,18 +3,22 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 import requests
-from bs4 import BeautifulSoup
+from dataclasses import dataclass
 from typing import List
-from pydantic import BaseModel
+from utils.config import Config
+from utils.cache import cached
+from tools.scraping.html_parser import parse_search_results, response_chunks
 
 
-class SearchResult(BaseModel):
-    """DuckDuckGo search result"""
+@dataclass(slots=True)
+class SearchResult:
+    """DuckDuckGo search result (validated as SearchResultSchema on export)"""
     title: str
     url: str
     snippet: str
 
 
+@cached("duckduckgo", ttl=Config.CACHE_TTL_DUCKDUCKGO)
 def duckduckgo_search(query: str, max_results: int = 10) -> List[SearchResult]:
     """
     Search using DuckDuckGo
@@ -36,28 +40,12 @@ def duckduckgo_search(query: str, max_results: int = 10) -> List[SearchResult]:
     
     try:
         url = f"https://html.duckduckgo.com/html/?q={requests.utils.quote(query)}"
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        result_divs = soup.find_all('div', class_='result')[:max_results]
-        
-        for div in result_divs:
-            try:
-                title_elem = div.find('a', class_='result__a')
-                snippet_elem = div.find('a', class_='result__snippet')
-                
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem.get('href', '')
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-                    
-                    results.append(SearchResult(
-                        title=title,
-                        url=url,
-                        snippet=snippet
-                    ))
-            except:
-                continue
+        with requests.get(url, headers=headers, timeout=10, stream=True) as response:
+            chunks, encoding = response_chunks(response)
+            results = [
+                SearchResult(**result)
+                for result in parse_search_results(chunks, max_results, encoding)
+            ]
         
         print(f"✅ Found {len(results)} results")
         
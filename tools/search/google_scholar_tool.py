@@ -4,12 +4,13 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 import requests
 from bs4 import BeautifulSoup
+from dataclasses import dataclass
 from typing import List
-from pydantic import BaseModel
 
 
-class ScholarPaper(BaseModel):
-    """Google Scholar paper result"""
+@dataclass(slots=True)
+class ScholarPaper:
+    """Google Scholar paper result (validated as ScholarPaperSchema on export)"""
     title: str
     authors: str
     snippet: str
@@ -0,0 +1,403 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import heapq
+import json
+import math
+import mmap
+import re
+import threading
+from array import array
+from collections import Counter
+from dataclasses import asdict
+from typing import List, Dict, Iterator, Tuple, Optional
+from tools.search.arxiv_tool import Paper
+from utils.config import Config
+from utils.arxiv_utils import extract_arxiv_id
+
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been
+before being below between both but by can could did do does doing down during each
+few for from further had has have having he her here hers herself him himself his how
+i if in into is it its itself just me more most my myself no nor not now of off on
+once only or other our ours ourselves out over own same she should so some such than
+that the their theirs them themselves then there these they this those through to too
+under until up very was we were what when where which while who whom why will with
+would you your yours yourself yourselves et al fig figure table eq section use used
+using via paper show shows shown however thus may one two three
+""".split())
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords or single characters"""
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def _encode_postings(postings: List[Tuple[int, int]], last_doc: int) -> bytes:
+    """Varint-encode (doc id delta, term frequency) pairs"""
+    out = bytearray()
+    for doc_id, tf in postings:
+        for value in (doc_id - last_doc, tf):
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        last_doc = doc_id
+    return bytes(out)
+
+
+def _decode_postings(data, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    doc_id = 0
+    pos = start
+    while pos < end:
+        values = []
+        for _ in range(2):
+            value = shift = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            values.append(value)
+        doc_id += values[0]
+        yield doc_id, values[1]
+
+
+class _Segment:
+    """One immutable postings file and its term dictionary"""
+
+    def __init__(self, path: Path, name: str, docs: int):
+        self.name = name
+        self.docs = docs
+        # term -> (offset, length, df, last doc id)
+        self.terms = json.loads((path / f"{name}.json").read_text(encoding='utf-8'))
+        self._file = open(path / f"{name}.bin", 'rb')
+        size = self._file.seek(0, 2)
+        self._blob = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def chunk(self, term: str) -> bytes:
+        start, length = self.terms[term][:2]
+        return bytes(self._blob[start:start + length])
+
+    def postings(self, term: str) -> Iterator[Tuple[int, int]]:
+        entry = self.terms.get(term)
+        if entry:
+            yield from _decode_postings(self._blob, entry[0], entry[0] + entry[1])
+
+    def close(self):
+        if isinstance(self._blob, mmap.mmap):
+            self._blob.close()
+        self._file.close()
+
+    @staticmethod
+    def write(path: Path, name: str, docs: int, chunks: Iterator[Tuple[str, bytes, int, int]]) -> "_Segment":
+        """Write (term, encoded postings, df, last doc id) in term order as a segment"""
+        terms = {}
+        offset = 0
+        with open(path / f"{name}.bin", 'wb') as out:
+            for term, chunk, df, last_doc in chunks:
+                out.write(chunk)
+                terms[term] = (offset, len(chunk), df, last_doc)
+                offset += len(chunk)
+        (path / f"{name}.json").write_text(json.dumps(terms), encoding='utf-8')
+        return _Segment(path, name, docs)
+
+
+class BM25Index:
+    """
+    Incremental BM25 index over extracted paper text
+
+    Postings are stored as varint-encoded (doc id delta, tf) pairs in
+    immutable segments, each a memory-mapped postings file with its own
+    term dictionary; a search reads a term's postings from every segment.
+    New documents are kept in memory until save(), which appends their
+    metadata to docs.jsonl and writes them as a new segment, so a save
+    costs time in the new documents only. Adjacent segments are merged
+    once the older one is no more than MERGE_RATIO times the newer one,
+    which keeps the number of segments logarithmic in the index size and
+    rewrites each posting a logarithmic number of times. segments.json
+    is replaced last and lists the segments and the number of valid
+    docs.jsonl lines, so a crash during save leaves the previous index
+    intact; files it does not list are removed on the next load.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    MERGE_RATIO = 2
+
+    def __init__(self, path: str = None):
+        self.path = Path(path or Config.LOCAL_INDEX_DIR)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._docs = []
+        self._keys = {}
+        self._doc_lengths = array('I')
+        self._segments: List[_Segment] = []
+        self._pending = {}
+        self._generation = 0
+        self._saved_docs = 0
+        self._saved_bytes = 0
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        manifest_path = self.path / "segments.json"
+        manifest = {'generation': 0, 'docs': 0, 'segments': []}
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        self._generation = manifest['generation']
+
+        # Left over from a save that never committed
+        live = {segment['name'] for segment in manifest['segments']}
+        for leftover in self.path.glob("segment-*"):
+            if leftover.name.split('.')[0] not in live:
+                leftover.unlink(missing_ok=True)
+
+        self._segments = [_Segment(self.path, segment['name'], segment['docs']) for segment in manifest['segments']]
+
+        docs_path = self.path / "docs.jsonl"
+        if not docs_path.exists():
+            return
+        valid_bytes = 0
+        with open(docs_path, 'rb') as f:
+            for line in f:
+                if len(self._docs) == manifest['docs']:
+                    break
+                doc = json.loads(line)
+                self._keys[doc['key']] = len(self._docs)
+                self._doc_lengths.append(doc.pop('length'))
+                self._docs.append(doc)
+                valid_bytes += len(line)
+
+        self._saved_docs = len(self._docs)
+        self._saved_bytes = valid_bytes
+
+    def _new_segment_name(self) -> str:
+        self._generation += 1
+        return f"segment-{self._generation}"
+
+    def _merge(self, older: _Segment, newer: _Segment) -> _Segment:
+        """One segment with the postings of two adjacent ones (newer has the later doc ids)"""
+        def chunks():
+            for term in sorted(set(older.terms) | set(newer.terms)):
+                chunk, df, last_doc = b"", 0, 0
+                if term in older.terms:
+                    chunk, (df, last_doc) = older.chunk(term), older.terms[term][2:]
+                if term in newer.terms:
+                    postings = list(newer.postings(term))
+                    chunk += _encode_postings(postings, last_doc)
+                    df += len(postings)
+                    last_doc = postings[-1][0]
+                yield term, chunk, df, last_doc
+
+        return _Segment.write(self.path, self._new_segment_name(), older.docs + newer.docs, chunks())
+
+    def save(self):
+        """Write pending documents: append docs, write a segment (merging some), then commit"""
+        with self._lock:
+            if len(self._docs) == self._saved_docs:
+                return
+
+            generation = self._generation
+            new_docs = len(self._docs) - self._saved_docs
+            segments = list(self._segments)
+            written = []
+            try:
+                segments.append(_Segment.write(self.path, self._new_segment_name(), new_docs, (
+                    (term, _encode_postings(postings, 0), len(postings), postings[-1][0])
+                    for term, postings in sorted(self._pending.items())
+                )))
+                written.append(segments[-1])
+                while len(segments) > 1 and segments[-2].docs <= segments[-1].docs * self.MERGE_RATIO:
+                    segments[-2:] = [self._merge(segments[-2], segments[-1])]
+                    written.append(segments[-1])
+
+                # Lines after the committed ones are left over from a save that never finished
+                new_lines = b"".join(
+                    (json.dumps(dict(doc, length=length)) + "\n").encode('utf-8')
+                    for doc, length in zip(self._docs[self._saved_docs:], self._doc_lengths[self._saved_docs:])
+                )
+                with open(self.path / "docs.jsonl", 'ab') as f:
+                    f.truncate(self._saved_bytes)
+                    f.write(new_lines)
+
+                tmp_path = self.path / "segments.json.tmp"
+                tmp_path.write_text(json.dumps({
+                    'generation': self._generation, 'docs': len(self._docs),
+                    'segments': [{'name': segment.name, 'docs': segment.docs} for segment in segments]
+                }), encoding='utf-8')
+                tmp_path.replace(self.path / "segments.json")
+            except Exception:
+                # Nothing was committed: drop this save's segments, keep the documents pending
+                for segment in written:
+                    self._remove_segment(segment)
+                self._generation = generation
+                raise
+
+            # Segments merged away (including ones written by this save) are no longer listed
+            for segment in self._segments + written:
+                if segment not in segments:
+                    self._remove_segment(segment)
+
+            self._segments = segments
+            self._pending = {}
+            self._saved_docs = len(self._docs)
+            self._saved_bytes += len(new_lines)
+
+    def _remove_segment(self, segment: _Segment):
+        segment.close()
+        for suffix in (".bin", ".json"):
+            (self.path / f"{segment.name}{suffix}").unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def add_paper(self, paper: Dict, text: str = "") -> bool:
+        """
+        Index a paper (title weighted twice, abstract and full text)
+
+        Args:
+            paper: Paper or scraped paper dictionary
+            text: Full text (defaults to paper['full_text'])
+
+        Returns:
+            True if the paper was added, False if already indexed
+        """
+        if not isinstance(paper, dict):
+            paper = asdict(paper)
+
+        key = paper.get('entry_id') or extract_arxiv_id(paper.get('pdf_url', '')) or paper['title']
+        text = text or paper.get('full_text', '')
+        counts = Counter(tokenize(f"{paper['title']} {paper['title']} {paper.get('abstract', '')} {text}"))
+
+        with self._lock:
+            if key in self._keys:
+                return False
+
+            doc_id = len(self._docs)
+            self._keys[key] = doc_id
+            self._docs.append({
+                'key': key,
+                'title': paper['title'],
+                'authors': list(paper.get('authors', [])),
+                'abstract': paper.get('abstract', ''),
+                'pdf_url': paper.get('pdf_url', ''),
+                'published': paper.get('published', ''),
+                'categories': list(paper.get('categories', [])),
+                'entry_id': paper.get('entry_id', '')
+            })
+            self._doc_lengths.append(sum(counts.values()))
+
+            for term, tf in counts.items():
+                self._pending.setdefault(term, []).append((doc_id, tf))
+
+        return True
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _postings(self, term: str) -> Iterator[Tuple[int, int]]:
+        for segment in self._segments:
+            yield from segment.postings(term)
+        yield from self._pending.get(term, [])
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[float, Dict]]:
+        """
+        Rank indexed papers against a query with BM25
+
+        Returns:
+            List of (score, paper metadata) tuples, best first
+        """
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs:
+                return []
+
+            avg_length = sum(self._doc_lengths) / n_docs
+            scores = {}
+
+            for term in set(tokenize(query)):
+                postings = list(self._postings(term))
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings:
+                    norm = self.K1 * (1 - self.B + self.B * self._doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(score, self._docs[doc_id]) for doc_id, score in best]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_local_index() -> BM25Index:
+    """Shared local index, created on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = BM25Index()
+        return _index
+
+
+def local_search(query: str, max_results: int = 10) -> List[Paper]:
+    """
+    Search the local corpus of previously scraped papers
+
+    Args:
+        query: Search query
+        max_results: Maximum number of papers to return
+
+    Returns:
+        List of Paper objects, best match first
+    """
+    print(f"📚 Searching local index: '{query}'")
+
+    papers = []
+    for score, doc in get_local_index().search(query, k=max_results):
+        papers.append(Paper(
+            title=doc['title'],
+            authors=doc['authors'],
+            abstract=doc['abstract'],
+            pdf_url=doc['pdf_url'],
+            published=doc['published'],
+            categories=doc['categories'],
+            entry_id=doc['entry_id'] or doc['key']
+        ))
+
+    print(f"✅ Found {len(papers)} local papers")
+    return papers
+
+
+if __name__ == "__main__":
+    query = " ".join(sys.argv[1:]) or "large language models"
+    index = get_local_index()
+    print(f"Indexed papers: {len(index)}")
+
+    for score, doc in index.search(query, k=5):
+        print(f"{score:6.2f}  {doc['title'][:80]}")
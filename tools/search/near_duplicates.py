@@ -0,0 +1,274 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import hashlib
+import pickle
+import re
+import sqlite3
+import threading
+import time
+import zlib
+import numpy as np
+from typing import List, Dict, Optional, Tuple
+from utils.config import Config
+from utils.arxiv_utils import extract_arxiv_id
+
+
+# Smallest prime above 2**32: (a * x + b) stays below 2**64 for 32-bit a, b, x
+_PRIME = np.uint64(4294967311)
+_CHUNK = 4096
+
+
+def shingles(text: str, size: int = 5) -> np.ndarray:
+    """Unique crc32 hashes of overlapping word n-grams"""
+    words = re.findall(r'[a-z0-9]+', text.lower())
+    if len(words) < size:
+        return np.array([zlib.crc32(" ".join(words).encode('utf-8'))] if words else [], dtype=np.uint64)
+
+    hashes = {
+        zlib.crc32(" ".join(words[i:i + size]).encode('utf-8'))
+        for i in range(len(words) - size + 1)
+    }
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+class MinHasher:
+    """MinHash signatures over word shingles with universal hash permutations"""
+
+    def __init__(self, num_perm: int = None, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm or Config.MINHASH_PERMUTATIONS
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 32, self.num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, self.num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """uint32 signature of the text, or None if it has no words"""
+        hashes = shingles(text, self.shingle_size)
+        if not len(hashes):
+            return None
+
+        signature = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(hashes), _CHUNK):
+            chunk = hashes[start:start + _CHUNK]
+            values = (np.outer(self._a, chunk) + self._b[:, None]) % _PRIME
+            np.minimum(signature, values.min(axis=1), out=signature)
+
+        return (signature & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(a == b))
+
+
+def _paper_key(paper: Dict) -> str:
+    return extract_arxiv_id(paper.get('entry_id') or paper.get('pdf_url', '')) or paper['title']
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures, with stored analyses for reuse
+
+    Signatures are split into MINHASH_BANDS bands; papers sharing any
+    band bucket become candidates, so a lookup only touches the few
+    papers in matching buckets rather than the whole corpus.
+    """
+
+    def __init__(self, path: str = None, hasher: MinHasher = None, bands: int = None):
+        self.hasher = hasher or MinHasher()
+        self.bands = bands or Config.MINHASH_BANDS
+        if self.hasher.num_perm % self.bands:
+            raise ValueError(f"{self.hasher.num_perm} permutations do not split into {self.bands} bands")
+        self.rows = self.hasher.num_perm // self.bands
+
+        self.path = Path(path or Config.NEAR_DUP_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS papers (
+                key TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                analysis BLOB,
+                stored REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                hash INTEGER NOT NULL,
+                key TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, hash);
+            CREATE TABLE IF NOT EXISTS info (name TEXT PRIMARY KEY, value TEXT);
+            INSERT OR IGNORE INTO info VALUES ('layout', '{self.hasher.num_perm}x{self.bands}');
+        """)
+        layout = self._db.execute("SELECT value FROM info WHERE name = 'layout'").fetchone()[0]
+        if layout != f"{self.hasher.num_perm}x{self.bands}":
+            raise ValueError(f"Near-duplicate index at {self.path} uses layout {layout}")
+        self._db.commit()
+
+    def _band_hashes(self, signature: np.ndarray) -> List[Tuple[int, int]]:
+        return [
+            (band, int.from_bytes(
+                hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(),
+                                digest_size=8).digest(),
+                'little', signed=True
+            ))
+            for band in range(self.bands)
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def add(self, key: str, title: str, signature: np.ndarray):
+        """Insert or update a paper's signature (a stored analysis is kept)"""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO papers (key, title, signature, stored) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET title = excluded.title, signature = excluded.signature",
+                (key, title, signature.astype(np.uint32).tobytes(), time.time())
+            )
+            self._db.execute("DELETE FROM buckets WHERE key = ?", (key,))
+            self._db.executemany(
+                "INSERT INTO buckets VALUES (?, ?, ?)",
+                [(band, value, key) for band, value in self._band_hashes(signature)]
+            )
+            self._db.commit()
+
+    def add_paper(self, paper: Dict) -> Optional[np.ndarray]:
+        """
+        Compute a scraped paper's signature and index it
+
+        The signature is also kept on the paper record as 'minhash'.
+
+        Args:
+            paper: Paper dictionary with full_text
+
+        Returns:
+            Signature, or None if the paper has no text
+        """
+        signature = self.hasher.signature(paper.get('full_text', ''))
+        if signature is None:
+            return None
+
+        self.add(_paper_key(paper), paper['title'], signature)
+        paper['minhash'] = signature.tolist()
+        return signature
+
+    def query(self, signature: np.ndarray, threshold: float = None, exclude: str = None,
+              with_analysis: bool = False) -> List[Tuple[float, str, str]]:
+        """
+        Indexed papers whose estimated similarity reaches the threshold
+
+        Returns:
+            List of (similarity, key, title), most similar first
+        """
+        threshold = Config.NEAR_DUP_THRESHOLD if threshold is None else threshold
+        signature = np.asarray(signature, dtype=np.uint32)
+
+        with self._lock:
+            candidates = set()
+            for band, value in self._band_hashes(signature):
+                candidates.update(
+                    row[0] for row in self._db.execute(
+                        "SELECT key FROM buckets WHERE band = ? AND hash = ?", (band, value)
+                    )
+                )
+            candidates.discard(exclude)
+
+            matches = []
+            for key in candidates:
+                row = self._db.execute(
+                    "SELECT title, signature, analysis IS NOT NULL FROM papers WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or (with_analysis and not row[2]):
+                    continue
+                similarity = estimate_similarity(signature, np.frombuffer(row[1], dtype=np.uint32))
+                if similarity >= threshold:
+                    matches.append((similarity, key, row[0]))
+
+        return sorted(matches, reverse=True)
+
+    def store_analysis(self, paper: Dict, analysis: Dict):
+        """Keep a paper's analysis for reuse by its near-duplicates (degraded ones are not kept)"""
+        if analysis.get('degraded'):
+            return
+        blob = pickle.dumps(analysis, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._db.execute("UPDATE papers SET analysis = ? WHERE key = ?", (blob, _paper_key(paper)))
+            self._db.commit()
+
+    def load_analysis(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute("SELECT analysis FROM papers WHERE key = ?", (key,)).fetchone()
+
+        if row is None or row[0] is None:
+            return None
+
+        try:
+            return pickle.loads(row[0])
+        except Exception:
+            return None
+
+    def find_duplicate(self, paper: Dict, threshold: float = None) -> Optional[Tuple[float, str, Dict]]:
+        """
+        Most similar other paper that already has an analysis
+
+        Args:
+            paper: Scraped paper dictionary (indexed if not yet)
+            threshold: Minimum estimated Jaccard similarity
+
+        Returns:
+            (similarity, title, analysis) or None
+        """
+        signature = paper.get('minhash')
+        if signature is None:
+            signature = self.add_paper(paper)
+            if signature is None:
+                return None
+
+        for similarity, key, title in self.query(signature, threshold, exclude=_paper_key(paper),
+                                                 with_analysis=True):
+            analysis = self.load_analysis(key)
+            if analysis is not None and not analysis.get('degraded'):
+                return similarity, title, analysis
+
+        return None
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    """Shared near-duplicate index, created on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = NearDuplicateIndex()
+        return _index
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    vocabulary = [f"w{i}" for i in range(5000)]
+    base = " ".join(rng.choice(vocabulary, 3000))
+    edited = base.replace("w1 ", "w2 ", 20)
+
+    index = NearDuplicateIndex(str(Path(tempfile.mkdtemp()) / "minhash.sqlite3"))
+
+    start = time.time()
+    for i in range(500):
+        index.add(f"doc{i}", f"Paper {i}", index.hasher.signature(" ".join(rng.choice(vocabulary, 300))))
+    index.add("base", "Original paper", index.hasher.signature(base))
+    print(f"Indexed {len(index)} papers in {time.time() - start:.2f}s")
+
+    start = time.time()
+    matches = index.query(index.hasher.signature(edited))
+    print(f"Query: {(time.time() - start) * 1000:.1f} ms -> {matches}")
@@ -0,0 +1,152 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import math
+from collections import Counter
+from itertools import islice
+from typing import List, Tuple, Iterable, Iterator
+from tools.search.arxiv_tool import Paper
+from tools.search.local_index import tokenize, BM25Index
+from utils.config import Config
+
+
+def score_papers(query: str, papers: Iterable[Paper]) -> List[Tuple[float, Paper]]:
+    """
+    BM25 relevance of each paper's title (weighted twice), abstract and
+    categories to the query, computed over the candidate set itself
+
+    Returns:
+        List of (score, paper) in input order
+    """
+    papers = list(papers)
+    terms = set(tokenize(query))
+    if not papers or not terms:
+        return [(0.0, paper) for paper in papers]
+
+    docs = [
+        Counter(tokenize(f"{p.title} {p.title} {p.abstract} {' '.join(p.categories)}"))
+        for p in papers
+    ]
+    lengths = [sum(doc.values()) for doc in docs]
+    avg_length = sum(lengths) / len(docs) or 1.0
+    k1, b = BM25Index.K1, BM25Index.B
+
+    idf = {}
+    for term in terms:
+        df = sum(1 for doc in docs if term in doc)
+        idf[term] = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+
+    scored = []
+    for paper, doc, length in zip(papers, docs, lengths):
+        norm = k1 * (1 - b + b * length / avg_length)
+        score = sum(
+            idf[term] * doc[term] * (k1 + 1) / (doc[term] + norm)
+            for term in terms if term in doc
+        )
+        scored.append((score, paper))
+
+    return scored
+
+
+def rerank_papers(query: str, papers: Iterable[Paper], min_relative_score: float = None) -> List[Paper]:
+    """
+    Order candidates by relevance and drop off-topic ones before scraping
+
+    Papers scoring zero, or below min_relative_score times the best
+    score, are dropped. Ties keep their original (API) order.
+
+    Args:
+        query: Research query
+        papers: Discovered candidates
+        min_relative_score: Cutoff as a fraction of the best score
+            (defaults to RERANK_MIN_RELATIVE_SCORE)
+
+    Returns:
+        Remaining papers, most relevant first
+    """
+    cutoff_ratio = Config.RERANK_MIN_RELATIVE_SCORE if min_relative_score is None else min_relative_score
+    scored = score_papers(query, papers)
+    if not scored:
+        return []
+
+    best = max(score for score, _ in scored)
+    if best <= 0:
+        print("⚠️ No candidate matches the query terms, keeping API order")
+        return [paper for _, paper in scored]
+
+    ranked = sorted(enumerate(scored), key=lambda item: (-item[1][0], item[0]))
+    kept = [paper for _, (score, paper) in ranked if score > 0 and score >= best * cutoff_ratio]
+
+    print(f"🎯 Reranked {len(scored)} candidates: kept {len(kept)}, "
+          f"dropped {len(scored) - len(kept)} below the relevance cutoff")
+    return kept
+
+
+def rerank_stream(query: str, papers: Iterable[Paper], window: int = None,
+                  min_relative_score: float = None) -> Iterator[Paper]:
+    """
+    Rerank candidates window by window as they arrive
+
+    Each window (one arXiv result page by default) is scored on its own
+    and yielded best first, so scraping starts on the first page instead
+    of after the whole search. Papers scoring zero, or below
+    min_relative_score times the best score seen so far, are dropped.
+    Ordering is exact within a window only. If no candidate matches the
+    query terms at all, all of them are yielded in API order at the end.
+
+    Args:
+        query: Research query
+        papers: Discovered candidates, e.g. a PaperStream
+        window: Papers per window (defaults to ARXIV_PAGE_SIZE)
+        min_relative_score: Cutoff as a fraction of the best score
+            (defaults to RERANK_MIN_RELATIVE_SCORE)
+
+    Yields:
+        Remaining papers, most relevant first within each window
+    """
+    window = window or Config.ARXIV_PAGE_SIZE
+    cutoff_ratio = Config.RERANK_MIN_RELATIVE_SCORE if min_relative_score is None else min_relative_score
+    papers = iter(papers)
+    best = 0.0
+    unmatched = []
+
+    while True:
+        scored = score_papers(query, islice(papers, window))
+        if not scored:
+            break
+
+        best = max([best] + [score for score, _ in scored])
+        if best <= 0:
+            unmatched.extend(paper for _, paper in scored)
+            continue
+
+        ranked = sorted(enumerate(scored), key=lambda item: (-item[1][0], item[0]))
+        kept = [paper for _, (score, paper) in ranked if score > 0 and score >= best * cutoff_ratio]
+        print(f"🎯 Reranked {len(scored)} candidates: kept {len(kept)}, "
+              f"dropped {len(scored) - len(kept)} below the relevance cutoff")
+        yield from kept
+
+    if unmatched and best <= 0:
+        print("⚠️ No candidate matches the query terms, keeping API order")
+        yield from unmatched
+
+
+if __name__ == "__main__":
+    def make(title, abstract, categories):
+        return Paper(title=title, authors=[], abstract=abstract, pdf_url="", published="",
+                     categories=categories, entry_id=title)
+
+    candidates = [
+        make("A survey of reinforcement learning", "We review policy gradient methods.", ["cs.LG"]),
+        make("Deep learning for medical image segmentation", "A U-Net for CT scans.", ["eess.IV"]),
+        make("Medical imaging with transformers", "Vision transformers for X-ray diagnosis.", ["cs.CV"]),
+        make("Quantum error correction codes", "Surface codes and thresholds.", ["quant-ph"]),
+    ]
+
+    for paper in rerank_papers("deep learning medical imaging", candidates):
+        print(f"  - {paper.title}")
+
+    print("\nTwo papers per window:")
+    for paper in rerank_stream("deep learning medical imaging", candidates, window=2):
+        print(f"  - {paper.title}")
@@ -0,0 +1,292 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import heapq
+import json
+import threading
+import zlib
+import numpy as np
+from dataclasses import asdict
+from typing import List, Dict, Tuple, Iterable, Optional
+from tools.search.arxiv_tool import Paper
+from tools.search.local_index import tokenize
+from utils.config import Config
+from utils.arxiv_utils import extract_arxiv_id
+
+
+class HashingVectorizer:
+    """
+    Stateless text vectorizer: unigrams and bigrams hashed into a fixed
+    number of signed buckets, sublinear tf, L2-normalized float32 rows
+
+    Any object with `name`, `dim` and `transform(texts) -> ndarray` can
+    be used in its place (e.g. a wrapper around a local embedding model).
+    """
+
+    def __init__(self, dim: int = None):
+        self.dim = dim or Config.VECTOR_DIM
+        self.name = f"hashing-{self.dim}"
+
+    def transform(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                h = zlib.crc32(feature.encode('utf-8'))
+                matrix[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).astype(np.float32)
+
+
+def _paper_dict(paper) -> Dict:
+    if isinstance(paper, dict):
+        return paper
+    return asdict(paper)
+
+
+def _paper_key(paper: Dict) -> str:
+    return extract_arxiv_id(paper.get('entry_id') or paper.get('pdf_url', '')) or paper['title']
+
+
+class VectorIndex:
+    """
+    Append-only matrix of abstract vectors for related-paper lookup
+
+    Vectors are stored as raw float32 rows in vectors.f32 and opened as
+    a read-only memory map, so the index can be much larger than the
+    memory used to search it. New papers are appended without a rebuild:
+    vectors first, then their meta.jsonl lines. Row i of vectors.f32
+    belongs to line i of meta.jsonl, so anything past the last complete
+    meta line (left by a crash or failed write) is cut off before the
+    index is read or appended to.
+    """
+
+    BATCH_ROWS = 8192
+
+    def __init__(self, path: str = None, vectorizer=None):
+        self.path = Path(path or Config.VECTOR_INDEX_DIR)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.vectorizer = vectorizer or HashingVectorizer()
+
+        info_path = self.path / "info.json"
+        info = {'vectorizer': self.vectorizer.name, 'dim': self.vectorizer.dim}
+        if info_path.exists():
+            stored = json.loads(info_path.read_text())
+            if stored != info:
+                raise ValueError(
+                    f"Vector index at {self.path} was built with {stored}, not {info}"
+                )
+        else:
+            info_path.write_text(json.dumps(info))
+
+        self._lock = threading.Lock()
+        self._meta = []
+        self._keys = {}
+        self._meta_bytes = 0
+        meta_path = self.path / "meta.jsonl"
+        if meta_path.exists():
+            with open(meta_path, 'rb') as f:
+                for line in f:
+                    try:
+                        meta = json.loads(line)
+                    except ValueError:
+                        break
+                    if not line.endswith(b"\n"):
+                        break
+                    self._keys[meta['key']] = len(self._meta)
+                    self._meta.append(meta)
+                    self._meta_bytes += len(line)
+
+        self._vectors = None
+        self._truncate()
+        self._remap()
+
+    def _truncate(self):
+        """Cut both files to the committed rows (meta lines with a complete vector)"""
+        row_bytes = self.vectorizer.dim * np.dtype(np.float32).itemsize
+        vectors_path = self.path / "vectors.f32"
+        vector_rows = vectors_path.stat().st_size // row_bytes if vectors_path.exists() else 0
+
+        if vector_rows < len(self._meta):
+            for meta in self._meta[vector_rows:]:
+                del self._keys[meta['key']]
+            self._meta_bytes -= sum(len(json.dumps(meta)) + 1 for meta in self._meta[vector_rows:])
+            del self._meta[vector_rows:]
+
+        for path, size in ((vectors_path, len(self._meta) * row_bytes),
+                           (self.path / "meta.jsonl", self._meta_bytes)):
+            if path.exists() and path.stat().st_size != size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+
+    def _remap(self):
+        vectors_path = self.path / "vectors.f32"
+        rows = len(self._meta)
+        if rows and vectors_path.exists():
+            self._vectors = np.memmap(
+                vectors_path, dtype=np.float32, mode='r', shape=(rows, self.vectorizer.dim)
+            )
+        else:
+            self._vectors = np.zeros((0, self.vectorizer.dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def add_papers(self, papers: Iterable) -> int:
+        """
+        Vectorize and append papers not yet in the index
+
+        Args:
+            papers: Paper objects or paper dictionaries
+
+        Returns:
+            Number of papers added
+        """
+        with self._lock:
+            new, seen = [], set()
+            for paper in papers:
+                paper = _paper_dict(paper)
+                key = _paper_key(paper)
+                if key not in self._keys and key not in seen:
+                    seen.add(key)
+                    new.append((key, paper))
+
+            if not new:
+                return 0
+
+            vectors = self.vectorizer.transform(
+                f"{paper['title']} {paper.get('abstract', '')}" for _, paper in new
+            )
+            metas = [
+                {
+                    'key': key,
+                    'title': paper['title'],
+                    'authors': list(paper.get('authors', [])),
+                    'abstract': paper.get('abstract', ''),
+                    'pdf_url': paper.get('pdf_url', ''),
+                    'published': paper.get('published', ''),
+                    'categories': list(paper.get('categories', [])),
+                    'entry_id': paper.get('entry_id', '')
+                }
+                for key, paper in new
+            ]
+            lines = "".join(json.dumps(meta) + "\n" for meta in metas).encode('utf-8')
+
+            # Drop whatever an earlier failed append left behind
+            self._truncate()
+            with open(self.path / "vectors.f32", 'ab') as f:
+                f.write(vectors.tobytes())
+            with open(self.path / "meta.jsonl", 'ab') as f:
+                f.write(lines)
+
+            for meta in metas:
+                self._keys[meta['key']] = len(self._meta)
+                self._meta.append(meta)
+            self._meta_bytes += len(lines)
+            self._remap()
+            return len(new)
+
+    def search_vector(self, query: np.ndarray, k: int = 10, exclude: int = None) -> List[Tuple[float, Dict]]:
+        """
+        Top-k cosine similarity, scanning the matrix in batches
+
+        Returns:
+            List of (similarity, paper metadata), most similar first
+        """
+        with self._lock:
+            vectors = self._vectors
+            meta = self._meta
+
+        best = []
+        for start in range(0, len(vectors), self.BATCH_ROWS):
+            scores = np.asarray(vectors[start:start + self.BATCH_ROWS]) @ query
+            if exclude is not None and start <= exclude < start + len(scores):
+                scores[exclude - start] = -np.inf
+
+            top = min(k, len(scores))
+            candidates = np.argpartition(-scores, top - 1)[:top]
+            best = heapq.nlargest(
+                k, best + [(float(scores[i]), start + int(i)) for i in candidates]
+            )
+
+        return [(score, meta[row]) for score, row in best if score > -np.inf]
+
+    def search_text(self, text: str, k: int = 10) -> List[Tuple[float, Dict]]:
+        """Papers whose abstracts are most similar to a piece of text"""
+        return self.search_vector(self.vectorizer.transform([text])[0], k)
+
+    def related(self, paper, k: int = 10) -> List[Tuple[float, Dict]]:
+        """
+        Papers most similar to the given paper
+
+        Uses the stored vector when the paper is indexed, otherwise
+        vectorizes its title and abstract.
+        """
+        paper = _paper_dict(paper)
+        row = self._keys.get(_paper_key(paper))
+
+        if row is None:
+            query = self.vectorizer.transform([f"{paper['title']} {paper.get('abstract', '')}"])[0]
+        else:
+            query = np.asarray(self._vectors[row])
+
+        return self.search_vector(query, k, exclude=row)
+
+
+def meta_to_paper(meta: Dict) -> Paper:
+    """Paper object from stored index metadata"""
+    return Paper(
+        title=meta['title'],
+        authors=meta['authors'],
+        abstract=meta['abstract'],
+        pdf_url=meta['pdf_url'],
+        published=meta['published'],
+        categories=meta['categories'],
+        entry_id=meta['entry_id'] or meta['key']
+    )
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_vector_index() -> VectorIndex:
+    """Shared vector index, created on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = VectorIndex()
+        return _index
+
+
+if __name__ == "__main__":
+    import time
+    import tempfile
+
+    index = VectorIndex(tempfile.mkdtemp())
+    rng = np.random.default_rng(0)
+    words = "graph neural network transformer attention diffusion robot vision medical imaging".split()
+    papers = [
+        {'title': f"Paper {i}", 'abstract': " ".join(rng.choice(words, 40)), 'entry_id': f"id{i}"}
+        for i in range(20000)
+    ]
+
+    start = time.time()
+    index.add_papers(papers)
+    print(f"Indexed {len(index)} abstracts in {time.time() - start:.2f}s")
+
+    start = time.time()
+    results = index.related(papers[0], k=5)
+    print(f"Related lookup: {(time.time() - start) * 1000:.1f} ms")
+    for score, meta in results:
+        print(f"  {score:.3f}  {meta['title']}")
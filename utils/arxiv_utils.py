@@ -0,0 +1,59 @@
+import re
+import unicodedata
+from typing import Optional, Tuple
+
+
+# New-style ids (2301.00001v2) and old-style ids (hep-th/9901001v1)
+ARXIV_ID_PATTERN = re.compile(
+    r'arxiv\.org/(?:abs|pdf|html)/'
+    r'(\d{4}\.\d{4,5}(?:v\d+)?|[a-z\-]+(?:\.[A-Z]{2})?/\d{7}(?:v\d+)?)',
+    re.IGNORECASE
+)
+
+
+def extract_arxiv_id(url: str) -> Optional[str]:
+    """
+    Extract the arXiv id (including version, if present) from a URL
+
+    Args:
+        url: arXiv abs/pdf URL or entry_id
+
+    Returns:
+        arXiv id such as "2301.00001v2", or None
+    """
+    if not url:
+        return None
+
+    match = ARXIV_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+def split_arxiv_version(arxiv_id: str) -> Tuple[str, int]:
+    """Split "2301.00001v2" into ("2301.00001", 2); unversioned ids get 0"""
+    match = re.match(r'^(.*?)v(\d+)$', arxiv_id)
+    if match:
+        return match.group(1), int(match.group(2))
+    return arxiv_id, 0
+
+
+def normalize_title(title: str) -> str:
+    """Accent-, case- and punctuation-insensitive form of a title"""
+    title = unicodedata.normalize('NFKD', title)
+    title = "".join(ch for ch in title if not unicodedata.combining(ch))
+    return " ".join(re.findall(r'[a-z0-9]+', title.lower()))
+
+
+def arxiv_pdf_url(arxiv_id: str, host: str = "https://arxiv.org") -> str:
+    """Build the PDF URL for an arXiv id on the given host"""
+    return f"{host.rstrip('/')}/pdf/{arxiv_id}"
+
+
+if __name__ == "__main__":
+    for url in [
+        "http://arxiv.org/abs/2601.05963v1",
+        "https://arxiv.org/pdf/2301.00001.pdf",
+        "https://arxiv.org/abs/hep-th/9901001v2",
+        "https://example.com/paper.pdf"
+    ]:
+        arxiv_id = extract_arxiv_id(url)
+        print(f"{url} -> {arxiv_id} {split_arxiv_version(arxiv_id) if arxiv_id else ''}")
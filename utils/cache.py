@@ -0,0 +1,211 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import functools
+import hashlib
+import inspect
+import json
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from utils.config import Config
+
+
+# Bump when the pickled result types change shape
+CACHE_VERSION = 3
+
+
+# Field prefixes (ti:, abs:, au:), boolean operators, quotes and brackets make word order and case matter
+STRUCTURED_QUERY = re.compile(r'\b\w+:|\b(?:AND|OR|NOT|ANDNOT)\b|["()]')
+
+
+def normalize_query(query: str) -> str:
+    """
+    Cache form of a search query
+
+    Whitespace is collapsed and punctuation kept ("C++" stays distinct
+    from "C"). Plain keyword queries are also made case- and
+    word-order-insensitive; structured queries keep their case and order.
+    """
+    tokens = query.split()
+    if STRUCTURED_QUERY.search(query):
+        return " ".join(tokens)
+    return " ".join(sorted(token.lower() for token in tokens))
+
+
+class DiscoveryCache:
+    """
+    Disk-backed TTL cache for discovery results
+
+    Entries are keyed by source, normalized query and parameters and
+    stored pickled in SQLite. Expired entries can still be served (up to
+    CACHE_MAX_STALE seconds) while a background refresh runs.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = Path(path or Config.CACHE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                stored REAL NOT NULL,
+                value BLOB NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    @staticmethod
+    def make_key(source: str, query: str, params: Dict) -> str:
+        payload = json.dumps([CACHE_VERSION, source, query, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, age in seconds) or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT stored, value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            return pickle.loads(row[1]), time.time() - row[0]
+        except Exception:
+            return None
+
+    def lookup(self, key: str, source: str, ttl: float, loader: Callable[[], Any],
+               label: str = "") -> Optional[Any]:
+        """
+        Cached value if still fresh, or stale (refreshed in the background
+        with loader) when stale-while-revalidate allows it; None otherwise
+        """
+        hit = self.get(key)
+        if hit is None:
+            return None
+
+        value, age = hit
+        if age <= ttl:
+            print(f"⚡ Cache hit ({source}): '{label[:60]}'")
+            return value
+
+        if Config.CACHE_STALE_WHILE_REVALIDATE and age <= Config.CACHE_MAX_STALE:
+            print(f"⚡ Serving stale cache ({source}), refreshing in background")
+            self.refresh_in_background(key, source, loader)
+            return value
+
+        return None
+
+    def set(self, key: str, source: str, value: Any):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, source, time.time(), blob)
+            )
+            self._db.commit()
+
+    def refresh_in_background(self, key: str, source: str, loader: Callable[[], Any]):
+        """Reload an entry in a daemon thread (at most one refresh per key)"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = loader()
+                if value:
+                    self.set(key, source, value)
+            except Exception as e:
+                print(f"⚠️ Cache refresh failed ({source}): {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def purge(self, max_age: float = None) -> int:
+        """Delete entries older than max_age seconds (default CACHE_MAX_STALE)"""
+        cutoff = time.time() - (max_age if max_age is not None else Config.CACHE_MAX_STALE)
+        with self._lock:
+            deleted = self._db.execute("DELETE FROM entries WHERE stored < ?", (cutoff,)).rowcount
+            self._db.commit()
+        return deleted
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_discovery_cache() -> DiscoveryCache:
+    """Shared discovery cache, created on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiscoveryCache()
+        return _cache
+
+
+def cached(source: str, ttl: float, normalize: bool = True):
+    """
+    Cache a discovery function's results on disk
+
+    The first argument is the query (normalized unless normalize=False),
+    the remaining arguments become part of the key. Empty results are
+    not cached so failed lookups are retried.
+
+    Args:
+        source: Source name, e.g. "arxiv"
+        ttl: Seconds an entry stays fresh
+        normalize: Normalize the query with normalize_query
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not Config.CACHE_ENABLED:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            query = str(params.pop(next(iter(signature.parameters))))
+
+            cache = get_discovery_cache()
+            key = cache.make_key(source, normalize_query(query) if normalize else query.strip(), params)
+            value = cache.lookup(key, source, ttl, lambda: func(*args, **kwargs), label=query)
+            if value is not None:
+                return value
+
+            value = func(*args, **kwargs)
+            if value:
+                cache.set(key, source, value)
+            return value
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
+
+
+if __name__ == "__main__":
+    @cached("demo", ttl=60)
+    def slow_search(query: str, max_results: int = 5):
+        time.sleep(1)
+        return [f"{query} result {i}" for i in range(max_results)]
+
+    for q in ["Deep  Learning", "learning deep"]:
+        start = time.time()
+        slow_search(q)
+        print(f"{q!r}: {time.time() - start:.3f}s")
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,7 +12,7 @@ try:
     else:
         GROQ_API_KEY = os.getenv("GROQ_API_KEY")
         MODEL_NAME = os.getenv("MODEL_NAME", "llama-3.3-70b-versatile")
-except ImportError:
+except (ImportError, FileNotFoundError):
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
     MODEL_NAME = os.getenv("MODEL_NAME", "llama-3.3-70b-versatile")
 
@@ -20,6 +21,120 @@ class Config:
     MODEL_NAME = MODEL_NAME
     TEMPERATURE = 0.7
     MAX_TOKENS = 4000
+
+    # PDF downloads: send a hedged request if no bytes arrive within the delay
+    PDF_TIMEOUT = float(os.getenv("PDF_TIMEOUT", "30"))
+    PDF_HEDGE_DELAY = float(os.getenv("PDF_HEDGE_DELAY", "3.0"))
+    PDF_MAX_HEDGES = int(os.getenv("PDF_MAX_HEDGES", "1"))
+    PDF_MIRRORS = [
+        host.strip() for host in os.getenv("PDF_MIRRORS", "https://export.arxiv.org").split(",")
+        if host.strip()
+    ]
+
+    # PDF text extraction in isolated worker processes (0 workers = in-process)
+    EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "2"))
+    EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "120"))
+    EXTRACTION_MAX_RSS_MB = int(os.getenv("EXTRACTION_MAX_RSS_MB", "1024"))
+
+    # Concurrent scraping: separate limits for downloads and extraction
+    SCRAPE_IO_WORKERS = int(os.getenv("SCRAPE_IO_WORKERS", "4"))
+    SCRAPE_CPU_WORKERS = int(os.getenv("SCRAPE_CPU_WORKERS", str(max(EXTRACTION_WORKERS, 1))))
+    # Extra candidates scraped speculatively so failures are backfilled quickly
+    SCRAPE_SPARE_PAPERS = int(os.getenv("SCRAPE_SPARE_PAPERS", "2"))
+
+    # Local paper storage (storage/raw_papers/downloads, storage/extracted_text)
+    STORAGE_ENABLED = os.getenv("STORAGE_ENABLED", "true").lower() == "true"
+    STORAGE_DIR = os.getenv("STORAGE_DIR", str(Path(__file__).parent.parent / "storage"))
+    STORAGE_QUOTA_MB = int(os.getenv("STORAGE_QUOTA_MB", "2048"))
+    STORAGE_MAX_AGE_DAYS = float(os.getenv("STORAGE_MAX_AGE_DAYS", "0"))
+    STORAGE_KEEP_PDFS = os.getenv("STORAGE_KEEP_PDFS", "true").lower() == "true"
+
+    # Local BM25 index over scraped papers
+    LOCAL_INDEX_ENABLED = os.getenv("LOCAL_INDEX_ENABLED", "true").lower() == "true"
+    LOCAL_INDEX_DIR = os.getenv("LOCAL_INDEX_DIR", str(Path(STORAGE_DIR) / "index" / "bm25"))
+
+    # Vector index over abstracts for related-paper lookup
+    VECTOR_INDEX_ENABLED = os.getenv("VECTOR_INDEX_ENABLED", "true").lower() == "true"
+    VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", str(Path(STORAGE_DIR) / "index" / "vectors"))
+    VECTOR_DIM = int(os.getenv("VECTOR_DIM", "512"))
+
+    # MinHash/LSH near-duplicate detection over extracted text
+    NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "true").lower() == "true"
+    NEAR_DUP_PATH = os.getenv("NEAR_DUP_PATH", str(Path(STORAGE_DIR) / "index" / "minhash.sqlite3"))
+    NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+    MINHASH_PERMUTATIONS = int(os.getenv("MINHASH_PERMUTATIONS", "128"))
+    MINHASH_BANDS = int(os.getenv("MINHASH_BANDS", "16"))
+
+    # LLM call limits: per-call timeout (s) and token budget per workflow run (0 = unlimited)
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+    LLM_TOKEN_BUDGET = int(os.getenv("LLM_TOKEN_BUDGET", "0"))
+    # Concurrent calls through invoke_with_timeout (synthesis levels fan out up to this)
+    LLM_WORKERS = int(os.getenv("LLM_WORKERS", "8"))
+
+    # Key findings: "llm" (extractive summary as fallback) or "fast" (extractive only)
+    KEY_FINDINGS_MODE = os.getenv("KEY_FINDINGS_MODE", "llm").lower()
+    KEY_FINDINGS_SENTENCES = int(os.getenv("KEY_FINDINGS_SENTENCES", "4"))
+
+    # Report sections compiled concurrently
+    REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "4"))
+
+    # Map-reduce hypothesis extraction over the full text (~4 characters per token)
+    HYPOTHESIS_MAP_REDUCE = os.getenv("HYPOTHESIS_MAP_REDUCE", "true").lower() == "true"
+    HYPOTHESIS_CHUNK_TOKENS = int(os.getenv("HYPOTHESIS_CHUNK_TOKENS", "1500"))
+    HYPOTHESIS_MAX_CHUNKS = int(os.getenv("HYPOTHESIS_MAX_CHUNKS", "8"))
+    HYPOTHESIS_WORKERS = int(os.getenv("HYPOTHESIS_WORKERS", "4"))
+    HYPOTHESIS_MAP_TIMEOUT = float(os.getenv("HYPOTHESIS_MAP_TIMEOUT", "60"))
+
+    # Cue-phrase pre-filter (per chunk for map-reduce papers): below SKIP no LLM call,
+    # below FULL only candidate sentences are sent
+    HYPOTHESIS_PREFILTER_ENABLED = os.getenv("HYPOTHESIS_PREFILTER_ENABLED", "true").lower() == "true"
+    HYPOTHESIS_PREFILTER_HEAD_CHARS = int(os.getenv("HYPOTHESIS_PREFILTER_HEAD_CHARS", "6000"))
+    HYPOTHESIS_SKIP_SCORE = float(os.getenv("HYPOTHESIS_SKIP_SCORE", "2.0"))
+    HYPOTHESIS_FULL_SCORE = float(os.getenv("HYPOTHESIS_FULL_SCORE", "8.0"))
+    HYPOTHESIS_MAX_SENTENCES = int(os.getenv("HYPOTHESIS_MAX_SENTENCES", "8"))
+
+    # Incremental paper clustering (hashed TF-IDF + MiniBatchKMeans)
+    CLUSTER_FEATURES = int(os.getenv("CLUSTER_FEATURES", str(2 ** 16)))
+    CLUSTER_MAX_K = int(os.getenv("CLUSTER_MAX_K", "12"))
+    CLUSTER_BATCH_SIZE = int(os.getenv("CLUSTER_BATCH_SIZE", "256"))
+    CLUSTER_MIN_FIT = int(os.getenv("CLUSTER_MIN_FIT", "200"))
+
+    # Hierarchical synthesis of all analyses for the executive summary and conclusions
+    SYNTHESIS_CALL_TOKENS = int(os.getenv("SYNTHESIS_CALL_TOKENS", "3000"))
+    SYNTHESIS_SUMMARY_WORDS = int(os.getenv("SYNTHESIS_SUMMARY_WORDS", "200"))
+    SYNTHESIS_PAPER_CHARS = int(os.getenv("SYNTHESIS_PAPER_CHARS", "1200"))
+    SYNTHESIS_WORKERS = int(os.getenv("SYNTHESIS_WORKERS", "8"))
+    SYNTHESIS_BY_TOPIC = os.getenv("SYNTHESIS_BY_TOPIC", "true").lower() == "true"
+    SYNTHESIS_TOPIC_MIN_PAPERS = int(os.getenv("SYNTHESIS_TOPIC_MIN_PAPERS", "8"))
+
+    # Corpus term statistics for the report's trending topics (no LLM calls)
+    TERM_STATS_ENABLED = os.getenv("TERM_STATS_ENABLED", "true").lower() == "true"
+    TERM_STATS_DIR = os.getenv("TERM_STATS_DIR", str(Path(STORAGE_DIR) / "index" / "terms"))
+    TERM_STATS_MIN_CORPUS = int(os.getenv("TERM_STATS_MIN_CORPUS", "20"))
+
+    # Local arXiv metadata registry (filled with tools/search/arxiv_registry.py)
+    ARXIV_REGISTRY_PATH = os.getenv(
+        "ARXIV_REGISTRY_PATH", str(Path(STORAGE_DIR) / "registry" / "arxiv.sqlite3")
+    )
+
+    # Pre-scrape relevance reranking, page by page (discovery over-fetches up to
+    # FACTOR x max_papers; pages are requested only as the scraper reaches them)
+    RERANK_ENABLED = os.getenv("RERANK_ENABLED", "true").lower() == "true"
+    RERANK_CANDIDATE_FACTOR = int(os.getenv("RERANK_CANDIDATE_FACTOR", "3"))
+    RERANK_MIN_RELATIVE_SCORE = float(os.getenv("RERANK_MIN_RELATIVE_SCORE", "0.2"))
+
+    # ArXiv API paging
+    ARXIV_PAGE_SIZE = int(os.getenv("ARXIV_PAGE_SIZE", "25"))
+    ARXIV_DELAY_SECONDS = float(os.getenv("ARXIV_DELAY_SECONDS", "3.0"))
+
+    # Discovery cache (TTLs in seconds)
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_PATH = os.getenv("CACHE_PATH", str(Path(STORAGE_DIR) / "cache" / "discovery.sqlite3"))
+    CACHE_TTL_ARXIV = float(os.getenv("CACHE_TTL_ARXIV", str(24 * 3600)))
+    CACHE_TTL_DUCKDUCKGO = float(os.getenv("CACHE_TTL_DUCKDUCKGO", str(6 * 3600)))
+    CACHE_TTL_WEB = float(os.getenv("CACHE_TTL_WEB", str(24 * 3600)))
+    CACHE_STALE_WHILE_REVALIDATE = os.getenv("CACHE_STALE_WHILE_REVALIDATE", "true").lower() == "true"
+    CACHE_MAX_STALE = float(os.getenv("CACHE_MAX_STALE", str(7 * 24 * 3600)))
     
     @classmethod
     def validate(cls):
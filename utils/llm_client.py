@@ -1,3 +1,6 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from langchain_groq import ChatGroq
 from utils.config import Config
 
@@ -7,10 +10,141 @@ def get_llm(temperature=None, model=None):
         groq_api_key=Config.GROQ_API_KEY,
         model_name=model or Config.MODEL_NAME,
         temperature=temperature or Config.TEMPERATURE,
-        max_tokens=Config.MAX_TOKENS
+        max_tokens=Config.MAX_TOKENS,
+        # Requests end on their own, so abandoned calls do not hold workers for long
+        timeout=Config.LLM_TIMEOUT
     )
 
+
+class TokenBudget:
+    """
+    Running count of LLM tokens spent in a workflow run
+
+    Uses the token usage reported with each response, or an estimate
+    (~4 characters per token) when there is none. A limit of 0 means
+    unlimited.
+    """
+
+    def __init__(self, limit: int = None):
+        self.limit = Config.LLM_TOKEN_BUDGET if limit is None else limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def reset(self, limit: int = None):
+        with self._lock:
+            self.limit = Config.LLM_TOKEN_BUDGET if limit is None else limit
+            self.used = 0
+
+    def allows(self, prompt: str) -> bool:
+        """Whether a call with this prompt is expected to fit the remaining budget"""
+        with self._lock:
+            return not self.limit or self.used + len(prompt) // 4 <= self.limit
+
+    def charge(self, prompt: str, response=None, already: int = 0) -> int:
+        """
+        Add a call's tokens (the prompt estimate if there is no response),
+        less the part already charged
+        """
+        usage = getattr(response, 'usage_metadata', None) or {}
+        tokens = usage.get('total_tokens') or (len(prompt) + len(getattr(response, 'content', ""))) // 4
+        tokens = max(tokens - already, 0)
+        with self._lock:
+            self.used += tokens
+        return tokens
+
+
+# Budget of the current workflow run; calls outside any run share the default
+_default_budget = TokenBudget()
+_run_budget = contextvars.ContextVar("llm_token_budget", default=None)
+_executor = ThreadPoolExecutor(max_workers=max(1, Config.LLM_WORKERS), thread_name_prefix="llm")
+
+
+def get_token_budget() -> TokenBudget:
+    """Token budget of the current workflow run (or the process-wide default outside a run)"""
+    return _run_budget.get() or _default_budget
+
+
+def start_token_budget(limit: int = None) -> TokenBudget:
+    """
+    Give the current context a fresh token budget, e.g. at the start of a
+    workflow run
+
+    Threads and tasks started from this context with a copy of it (as the
+    LLM executor, LangGraph and the agents' pools do) charge the same
+    budget; concurrent runs in other contexts keep their own.
+    """
+    budget = TokenBudget(limit)
+    _run_budget.set(budget)
+    return budget
+
+
+def _call(llm, prompt: str, on_chunk, started: threading.Event):
+    started.set()
+    if on_chunk is None:
+        return llm.invoke(prompt)
+
+    response = None
+    for chunk in llm.stream(prompt):
+        if chunk.content:
+            on_chunk(chunk.content)
+        response = chunk if response is None else response + chunk
+    return response
+
+
+def _charge_abandoned(budget: TokenBudget, prompt: str, future):
+    """Charge a timed-out call now (prompt estimate) and the rest if it still completes"""
+    charged = budget.charge(prompt)
+
+    def charge_rest(done):
+        if not done.cancelled() and done.exception() is None:
+            budget.charge(prompt, done.result(), already=charged)
+
+    future.add_done_callback(charge_rest)
+
+
+def invoke_with_timeout(llm, prompt: str, timeout: float = None, on_chunk=None):
+    """
+    Invoke the LLM, giving up after timeout seconds
+
+    Every LLM call of a run goes through here, so each prompt is checked
+    against and charged to the run's token budget. Waiting for a free
+    worker and the call itself each get up to timeout seconds; a call
+    that never started is cancelled. A call that times out is charged
+    its prompt estimate at once and the rest of its usage if it
+    completes later; failed calls are charged their prompt estimate.
+
+    Args:
+        llm: Chat model
+        prompt: Prompt text
+        timeout: Seconds to wait (defaults to LLM_TIMEOUT)
+        on_chunk: Optional callback(text) to stream the response through
+
+    Raises:
+        TimeoutError: If no response arrived in time
+        RuntimeError: If the token budget is exhausted
+    """
+    budget = get_token_budget()
+    if not budget.allows(prompt):
+        raise RuntimeError(f"LLM token budget exhausted ({budget.used}/{budget.limit} tokens)")
+
+    timeout = timeout or Config.LLM_TIMEOUT
+    started = threading.Event()
+    # The caller's context goes along (e.g. a LangGraph stream writer used by on_chunk)
+    future = _executor.submit(contextvars.copy_context().run, _call, llm, prompt, on_chunk, started)
+    if not started.wait(timeout) and future.cancel():
+        raise TimeoutError(f"No free LLM worker within {timeout:g}s")
+    try:
+        response = future.result(timeout=timeout)
+    except FutureTimeoutError:
+        _charge_abandoned(budget, prompt, future)
+        raise TimeoutError(f"No LLM response within {timeout:g}s") from None
+    except Exception:
+        budget.charge(prompt)
+        raise
+    budget.charge(prompt, response)
+    return response
+
 if __name__ == "__main__":
     llm = get_llm()
     response = llm.invoke("Say 'Hello from Research Paper Analyzer!'")
-    print(response.content)
\ No newline at end of file
+    print(response.content)
@@ -0,0 +1,138 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dataclasses import is_dataclass
+from typing import List, Any
+from pydantic import BaseModel, ConfigDict, Field
+from tools.analysis.code_analyzer import CodeBlock
+from tools.analysis.hypothesis_extractor import Hypothesis
+from tools.search.arxiv_tool import Paper
+from tools.search.duckduckgo_tool import SearchResult
+from tools.search.google_scholar_tool import ScholarPaper
+
+
+# Internally, records are plain slotted dataclasses (cheap to build and
+# hold for the whole run); these pydantic schemas validate them only where
+# data leaves the pipeline (UI, JSON export).
+
+class PaperSchema(BaseModel):
+    """Research paper metadata"""
+    model_config = ConfigDict(from_attributes=True)
+
+    title: str
+    authors: List[str]
+    abstract: str
+    pdf_url: str
+    published: str
+    categories: List[str]
+    entry_id: str
+    sources: List[str] = Field(default_factory=list)
+
+
+class CodeBlockSchema(BaseModel):
+    """Extracted code block"""
+    model_config = ConfigDict(from_attributes=True)
+
+    language: str
+    code: str
+    line_count: int
+    location: str
+
+
+class HypothesisSchema(BaseModel):
+    """Research hypothesis"""
+    model_config = ConfigDict(from_attributes=True)
+
+    statement: str
+    supporting_evidence: str
+    methodology: str
+    results: str
+
+
+class SearchResultSchema(BaseModel):
+    """DuckDuckGo search result"""
+    model_config = ConfigDict(from_attributes=True)
+
+    title: str
+    url: str
+    snippet: str
+
+
+class ScholarPaperSchema(BaseModel):
+    """Google Scholar paper result"""
+    model_config = ConfigDict(from_attributes=True)
+
+    title: str
+    authors: str
+    snippet: str
+    url: str
+    citations: str
+
+
+SCHEMAS = {
+    Paper: PaperSchema,
+    CodeBlock: CodeBlockSchema,
+    Hypothesis: HypothesisSchema,
+    SearchResult: SearchResultSchema,
+    ScholarPaper: ScholarPaperSchema,
+}
+
+
+def to_schema(record) -> BaseModel:
+    """
+    Validate an internal record against its pydantic schema
+
+    Args:
+        record: Paper, CodeBlock, Hypothesis, SearchResult or ScholarPaper
+
+    Returns:
+        Validated schema instance
+
+    Raises:
+        pydantic.ValidationError: If the record holds invalid data
+    """
+    schema = SCHEMAS.get(type(record))
+    if schema is None:
+        raise TypeError(f"No schema for {type(record).__name__}")
+    return schema.model_validate(record)
+
+
+def export_data(data: Any) -> Any:
+    """
+    JSON-ready copy of nested dicts/lists, with records validated and
+    converted to dictionaries
+
+    Args:
+        data: Report, analysis or workflow result
+
+    Returns:
+        Same structure with only JSON types left for records
+    """
+    if type(data) in SCHEMAS:
+        return to_schema(data).model_dump()
+    if isinstance(data, BaseModel):
+        return data.model_dump()
+    if is_dataclass(data) and not isinstance(data, type):
+        raise TypeError(f"No schema for {type(data).__name__}")
+    if isinstance(data, dict):
+        return {key: export_data(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [export_data(value) for value in data]
+    return data
+
+
+if __name__ == "__main__":
+    import json
+
+    analysis = {
+        'title': "Sample",
+        'hypotheses': [Hypothesis("AI improves diagnosis", "Test data", "CNN", "95% accuracy")],
+        'code_blocks': [CodeBlock("python", "model.fit(x, y)", 1, "markdown")],
+    }
+    print(json.dumps(export_data(analysis), indent=2))
+
+    try:
+        to_schema(CodeBlock("python", "x = 1", "one", "markdown"))
+    except Exception as e:
+        print(f"\nRejected invalid record: {type(e).__name__}")
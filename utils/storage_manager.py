@@ -0,0 +1,332 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import gzip
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, List, Tuple
+from utils.config import Config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Downloaded PDFs get their own folder: raw_papers/ holds sample PDFs tracked
+# in git, which the manifest (and so gc) must never own or overwrite
+KINDS = {
+    'pdf': 'raw_papers/downloads',
+    'text': 'extracted_text'
+}
+
+
+def storage_key(arxiv_id: str) -> str:
+    """File-safe key for an arXiv id (old-style ids contain '/')"""
+    return arxiv_id.replace('/', '_')
+
+
+def arxiv_id_from_key(key: str) -> str:
+    """Inverse of storage_key ('hep-th_9901001' -> 'hep-th/9901001'; arXiv ids have no '_')"""
+    return key.replace('_', '/', 1)
+
+
+def _compress(data: bytes) -> Tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data), '.zst'
+    return gzip.compress(data, compresslevel=6), '.gz'
+
+
+def _decompress(data: bytes, suffix: str) -> bytes:
+    if suffix == '.zst':
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst files")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if suffix == '.gz':
+        return gzip.decompress(data)
+    return data
+
+
+class StorageManager:
+    """
+    Size-bounded store for downloaded PDFs and extracted text
+
+    Files live under storage/raw_papers/downloads and
+    storage/extracted_text, keyed by arXiv id. Extracted text is compressed (zstd when available, gzip
+    otherwise). A SQLite manifest tracks sizes, hashes and last access
+    times for quota- and age-based garbage collection.
+    """
+
+    def __init__(self, root: str = None, quota_mb: int = None, max_age_days: float = None):
+        self.root = Path(root or Config.STORAGE_DIR)
+        self.quota = (quota_mb if quota_mb is not None else Config.STORAGE_QUOTA_MB) * 1024 * 1024
+        self.max_age_days = max_age_days if max_age_days is not None else Config.STORAGE_MAX_AGE_DAYS
+
+        for folder in KINDS.values():
+            (self.root / folder).mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.root / "manifest.sqlite3"), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                arxiv_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                raw_size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (arxiv_id, kind)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS files_access ON files (last_access)")
+        self._db.commit()
+
+    # ------------------------------------------------------------------
+    # Read / write
+    # ------------------------------------------------------------------
+
+    def save_text(self, arxiv_id: str, text: str) -> Path:
+        """Store extracted text compressed"""
+        raw = text.encode('utf-8')
+        data, suffix = _compress(raw)
+        return self._write(arxiv_id, 'text', f"{storage_key(arxiv_id)}.txt{suffix}", data, raw)
+
+    def load_text(self, arxiv_id: str) -> Optional[str]:
+        """Load extracted text, transparently decompressing it"""
+        path = self._locate(arxiv_id, 'text')
+        if path is None:
+            return None
+        return _decompress(path.read_bytes(), path.suffix).decode('utf-8')
+
+    def save_pdf(self, arxiv_id: str, pdf_bytes: bytes) -> Path:
+        """Store a downloaded PDF (PDFs are already compressed)"""
+        return self._write(arxiv_id, 'pdf', f"{storage_key(arxiv_id)}.pdf", pdf_bytes, pdf_bytes)
+
+    def load_pdf(self, arxiv_id: str) -> Optional[bytes]:
+        """Load a stored PDF"""
+        path = self._locate(arxiv_id, 'pdf')
+        return path.read_bytes() if path else None
+
+    def _write(self, arxiv_id: str, kind: str, filename: str, data: bytes, raw: bytes) -> Path:
+        path = self.root / KINDS[kind] / filename
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+        now = time.time()
+        with self._lock:
+            old = self._db.execute(
+                "SELECT path FROM files WHERE arxiv_id = ? AND kind = ?", (arxiv_id, kind)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (arxiv_id, kind, str(path.relative_to(self.root)), len(data), len(raw),
+                 hashlib.sha256(raw).hexdigest(), now, now)
+            )
+            self._db.commit()
+
+        # A previous copy in another format (e.g. legacy .txt) is superseded
+        if old and old[0] != str(path.relative_to(self.root)):
+            (self.root / old[0]).unlink(missing_ok=True)
+
+        return path
+
+    def _locate(self, arxiv_id: str, kind: str) -> Optional[Path]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT path FROM files WHERE arxiv_id = ? AND kind = ?", (arxiv_id, kind)
+            ).fetchone()
+            if row:
+                path = self.root / row[0]
+                if path.exists():
+                    self._db.execute(
+                        "UPDATE files SET last_access = ? WHERE arxiv_id = ? AND kind = ?",
+                        (time.time(), arxiv_id, kind)
+                    )
+                    self._db.commit()
+                    return path
+                self._db.execute(
+                    "DELETE FROM files WHERE arxiv_id = ? AND kind = ?", (arxiv_id, kind)
+                )
+                self._db.commit()
+        return None
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def scan(self, compress: bool = False) -> int:
+        """
+        Register files on disk that are missing from the manifest
+
+        Files are matched to manifest rows by path, so a file saved under
+        an old-style id ('hep-th/9901001' as hep-th_9901001.txt.zst) is not
+        registered twice. Plain .txt files are registered in place unless
+        compress is set.
+
+        Args:
+            compress: Re-store plain .txt files compressed and delete the
+                originals (including the sample texts tracked in git)
+
+        Returns:
+            Number of files registered
+        """
+        registered = 0
+
+        for kind, folder in KINDS.items():
+            for path in sorted((self.root / folder).iterdir()):
+                if not path.is_file() or path.name.endswith(".tmp"):
+                    continue
+
+                if kind == 'pdf' and path.suffix != '.pdf':
+                    continue
+                key = path.name.split('.txt')[0] if kind == 'text' else path.name[:-len('.pdf')]
+                arxiv_id = arxiv_id_from_key(key)
+
+                with self._lock:
+                    known = self._db.execute(
+                        "SELECT 1 FROM files WHERE kind = ? AND path = ?",
+                        (kind, str(path.relative_to(self.root)))
+                    ).fetchone()
+                recompress = kind == 'text' and compress and path.suffix == '.txt'
+                if known and not recompress:
+                    continue
+
+                data = path.read_bytes()
+                if recompress:
+                    self.save_text(arxiv_id, data.decode('utf-8'))
+                    path.unlink(missing_ok=True)
+                else:
+                    raw = _decompress(data, path.suffix)
+                    self._write(arxiv_id, kind, path.name, data, raw)
+                registered += 1
+
+        return registered
+
+    def usage(self) -> Dict:
+        """Disk usage summary per kind"""
+        summary = {'quota_bytes': self.quota, 'total_bytes': 0, 'kinds': {}}
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT kind, COUNT(*), SUM(size), SUM(raw_size) FROM files GROUP BY kind"
+            ).fetchall()
+
+        for kind, count, size, raw_size in rows:
+            summary['kinds'][kind] = {'files': count, 'bytes': size, 'raw_bytes': raw_size}
+            summary['total_bytes'] += size
+
+        return summary
+
+    def gc(self, quota_mb: int = None, max_age_days: float = None, dry_run: bool = False) -> List[Dict]:
+        """
+        Evict entries older than max_age_days, then least recently used
+        entries until the store fits in the quota
+
+        Returns:
+            List of evicted manifest entries
+        """
+        quota = quota_mb * 1024 * 1024 if quota_mb is not None else self.quota
+        max_age_days = max_age_days if max_age_days is not None else self.max_age_days
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT arxiv_id, kind, path, size, last_access FROM files ORDER BY last_access"
+            ).fetchall()
+
+        total = sum(row[3] for row in rows)
+        cutoff = time.time() - max_age_days * 86400 if max_age_days else None
+        evicted = []
+
+        for arxiv_id, kind, path, size, last_access in rows:
+            expired = cutoff is not None and last_access < cutoff
+            if not expired and (not quota or total <= quota):
+                continue
+
+            evicted.append({'arxiv_id': arxiv_id, 'kind': kind, 'path': path, 'size': size})
+            total -= size
+
+            if not dry_run:
+                (self.root / path).unlink(missing_ok=True)
+                with self._lock:
+                    self._db.execute(
+                        "DELETE FROM files WHERE arxiv_id = ? AND kind = ?", (arxiv_id, kind)
+                    )
+
+        if not dry_run:
+            with self._lock:
+                self._db.commit()
+
+        return evicted
+
+    def close(self):
+        self._db.close()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_storage_manager() -> StorageManager:
+    """Shared storage manager, created on first use"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = StorageManager()
+        return _manager
+
+
+def _format_mb(size: int) -> str:
+    return f"{(size or 0) / (1024 * 1024):.1f} MB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the local paper storage")
+    parser.add_argument("--root", help="Storage directory (default: storage/)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("usage", help="Report disk usage")
+    scan_parser = commands.add_parser(
+        "scan", help="Register files missing from the manifest (plain .txt files are left in place)"
+    )
+    scan_parser.add_argument(
+        "--compress", action="store_true",
+        help="Replace plain .txt files, including the git-tracked samples, with compressed copies "
+             "(compressed files are gitignored)"
+    )
+    gc_parser = commands.add_parser("gc", help="Evict old / least recently used files")
+    gc_parser.add_argument("--quota-mb", type=int)
+    gc_parser.add_argument("--max-age-days", type=float)
+    gc_parser.add_argument("--dry-run", action="store_true")
+
+    args = parser.parse_args(argv)
+    manager = StorageManager(root=args.root)
+
+    if args.command == "scan":
+        count = manager.scan(compress=args.compress)
+        print(f"✅ Registered {count} files")
+
+    elif args.command == "gc":
+        evicted = manager.gc(args.quota_mb, args.max_age_days, dry_run=args.dry_run)
+        action = "Would evict" if args.dry_run else "Evicted"
+        print(f"🧹 {action} {len(evicted)} files ({_format_mb(sum(e['size'] for e in evicted))})")
+        for entry in evicted:
+            print(f"   - {entry['path']} ({_format_mb(entry['size'])})")
+
+    summary = manager.usage()
+    print(f"💾 Storage: {_format_mb(summary['total_bytes'])} / {_format_mb(summary['quota_bytes'])}")
+    for kind, stats in summary['kinds'].items():
+        print(f"   {kind}: {stats['files']} files, {_format_mb(stats['bytes'])} "
+              f"(uncompressed {_format_mb(stats['raw_bytes'])})")
+
+    manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,16 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from typing import TypedDict, List, Dict, Any
+from typing import TypedDict, List, Dict, Any, Iterator, Tuple
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, END
 from agents.discovery_agent import PaperDiscoveryAgent
 from agents.scraping_agent import ScrapingAgent
 from agents.analysis_agent import AnalysisAgent
 from agents.report_agent import ReportAgent
+from tools.search.arxiv_tool import PaperStream
+from utils.config import Config
+from utils.llm_client import start_token_budget
 
 
 class ResearchState(TypedDict):
@@ -16,6 +20,7 @@ class ResearchState(TypedDict):
     max_papers: int
     discovery_results: Dict[str, Any]
     scraped_papers: List[Dict]
+    scrape_failures: List[Dict]
     analyses: List[Dict]
     final_report: Dict[str, Any]
     current_step: str
@@ -64,7 +69,8 @@ class ResearchPaperWorkflow:
         
         results = self.discovery_agent.discover_papers(
             state["query"],
-            max_papers=state["max_papers"]
+            max_papers=state["max_papers"],
+            stream=True
         )
         
         state["discovery_results"] = results
@@ -77,23 +83,34 @@ class ResearchPaperWorkflow:
         """Node 2: Scrape and extract paper content"""
         
         arxiv_papers = state["discovery_results"].get("arxiv_papers", [])
+        candidates = arxiv_papers
+        
+        # Streamed candidates are reranked page by page, so scraping
+        # still starts as the first result page arrives
+        if Config.RERANK_ENABLED:
+            candidates = self.discovery_agent.rank_candidates(state["query"], arxiv_papers)
+        
+        scraped = self.scraping_agent.scrape_papers(
+            candidates,
+            max_papers=state["max_papers"]
+        )
+        
+        if isinstance(arxiv_papers, PaperStream):
+            # Over-fetched pages the scraper never reached are not requested
+            arxiv_papers.stop()
+            state["discovery_results"]["arxiv_papers"] = arxiv_papers.wait()
+            self.discovery_agent.index_abstracts(state["discovery_results"]["arxiv_papers"])
+            self.discovery_agent.attach_mentions(state["discovery_results"])
         
-        if not arxiv_papers:
+        if not state["discovery_results"].get("arxiv_papers"):
             print("⚠️ No ArXiv papers found, skipping scraping...")
             state["scraped_papers"] = []
             state["current_step"] = "scraping_skipped"
             state["progress"] = 50
             return state
         
-        # Limit to max papers for scraping
-        max_to_scrape = min(len(arxiv_papers), state["max_papers"])
-        
-        scraped = self.scraping_agent.scrape_papers(
-            arxiv_papers,
-            max_papers=max_to_scrape
-        )
-        
         state["scraped_papers"] = scraped
+        state["scrape_failures"] = self.scraping_agent.failures
         state["current_step"] = "scraping_complete"
         state["progress"] = 50
         
@@ -129,10 +146,13 @@ class ResearchPaperWorkflow:
                 'message': "Please try a different query or increase max_papers."
             }
         else:
+            # Sections reach stream() callers as they are generated
+            writer = get_stream_writer()
             report = self.report_agent.compile_report(
                 state["query"],
                 state["discovery_results"],
-                state["analyses"]
+                state["analyses"],
+                on_event=lambda section, chunk: writer((section, chunk))
             )
             state["final_report"] = report
         
@@ -145,6 +165,19 @@ class ResearchPaperWorkflow:
         
         return state
     
+    def _initial_state(self, query: str, max_papers: int) -> ResearchState:
+        return ResearchState(
+            query=query,
+            max_papers=max_papers,
+            discovery_results={},
+            scraped_papers=[],
+            scrape_failures=[],
+            analyses=[],
+            final_report={},
+            current_step="started",
+            progress=0
+        )
+    
     def run(self, query: str, max_papers: int = 20) -> Dict[str, Any]:
         """
         Run the complete research workflow
@@ -158,21 +191,36 @@ class ResearchPaperWorkflow:
         """
         
         # Initialize state
-        initial_state = ResearchState(
-            query=query,
-            max_papers=max_papers,
-            discovery_results={},
-            scraped_papers=[],
-            analyses=[],
-            final_report={},
-            current_step="started",
-            progress=0
-        )
+        initial_state = self._initial_state(query, max_papers)
         
         # Run workflow
+        start_token_budget()
         final_state = self.workflow.invoke(initial_state)
         
         return final_state
+    
+    def stream(self, query: str, max_papers: int = 20) -> Iterator[Tuple[str, Any]]:
+        """
+        Run the workflow, yielding report sections as they are generated
+        
+        Yields (section, chunk) events from ReportAgent.compile_report
+        (LLM text chunks as the tokens arrive, other sections once done),
+        then ('state', final_state).
+        
+        Args:
+            query: Research query
+            max_papers: Maximum papers to analyze
+        """
+        start_token_budget()
+        final_state = None
+        for mode, data in self.workflow.stream(self._initial_state(query, max_papers),
+                                               stream_mode=["custom", "values"]):
+            if mode == "custom":
+                yield data
+            else:
+                final_state = data
+        
+        yield 'state', final_state
 
 
 # Test the workflow